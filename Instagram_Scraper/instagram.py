@@ -1,580 +1,1232 @@
-import time
-import random
-import json
-import logging
-import asyncio
-import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from fake_useragent import UserAgent
-from datetime import datetime
-
-
-class InstagramScraper:
-    def __init__(self, config_path="config.json"):
-        self.config = self._load_config(config_path)
-        self.logger = self._setup_logger()
-        self.driver = None
-        self.session_start_time = None
-
-    def _load_config(self, config_path):
-        with open(config_path, "r") as f:
-            return json.load(f)
-
-    def _setup_logger(self):
-        # Enhanced logging configuration
-        logging.basicConfig(
-            level=logging.DEBUG,  # Changed to DEBUG for more detailed logs
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.FileHandler("instagram_scraper_debug.log"),
-                logging.StreamHandler(),
-            ],
-        )
-        return logging.getLogger("InstagramScraper")
-
-    def _get_random_delay(self):
-        base_delay = random.uniform(2, 4)  # Increased base delay
-        # Add random micro-delays
-        micro_delay = random.uniform(0.1, 0.5) * random.random()
-        return base_delay + micro_delay
-
-    def _setup_driver(self):
-        options = webdriver.ChromeOptions()
-
-        # Enhanced anti-detection measures
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--start-maximized")
-
-        # Random viewport size
-        viewport_width = random.randint(1024, 1920)
-        viewport_height = random.randint(768, 1080)
-        options.add_argument(f"--window-size={viewport_width},{viewport_height}")
-
-        # Randomized user agent
-        ua = UserAgent()
-        user_agent = ua.random
-        options.add_argument(f"user-agent={user_agent}")
-
-        # Additional ChromeOptions
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-
-        # Add random language and platform
-        languages = ["en-US", "en-GB", "en-CA", "en-AU"]
-        platforms = [
-            "Windows NT 10.0",
-            "Macintosh; Intel Mac OS X 10_15_7",
-            "X11; Linux x86_64",
-        ]
-        options.add_argument(f"--lang={random.choice(languages)}")
-        options.add_argument(f"--platform={random.choice(platforms)}")
-
-        self.driver = webdriver.Chrome(options=options)
-
-        # Additional JavaScript-based evasion
-        self._inject_evasion_scripts()
-        self.session_start_time = datetime.now()
-
-    def _inject_evasion_scripts(self):
-        evasion_scripts = [
-            # Mask webdriver presence
-            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})",
-            
-            # Add random plugins
-            """
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5].map(() => ({
-                    name: Math.random().toString(36),
-                    filename: Math.random().toString(36)
-                }))
-            })
-            """,
-            
-            # Randomize hardware concurrency
-            f"Object.defineProperty(navigator, 'hardwareConcurrency', {{get: () => {random.randint(2, 16)}}})",
-            
-            # Add random screen properties
-            f"""
-            Object.defineProperty(window, 'screen', {{
-                get: () => ({{
-                    width: {random.randint(1024, 1920)},
-                    height: {random.randint(768, 1080)},
-                    colorDepth: {random.choice([24, 32])},
-                    pixelDepth: {random.choice([24, 32])}
-                }})
-            }})
-            """
-        ]
-
-        for script in evasion_scripts:
-            self.driver.execute_script(script)
-
-    async def login(self):
-        try:
-            self._setup_driver()
-
-            # Random pre-login behavior
-            starter_urls = [
-                "https://www.instagram.com/explore/",
-                "https://www.instagram.com/about/us/",
-                "https://help.instagram.com/",
-            ]
-            self.driver.get(random.choice(starter_urls))
-            await asyncio.sleep(self._get_random_delay())
-
-            self.driver.get("https://www.instagram.com/accounts/login/")
-            await asyncio.sleep(self._get_random_delay())
-
-            # Handle cookie consent with multiple possible selectors
-            cookie_selectors = [
-                "//button[contains(text(), 'Accept')]",
-                "//button[contains(text(), 'Allow')]",
-                "//button[contains(@class, 'consent')]",
-            ]
-
-            for selector in cookie_selectors:
-                try:
-                    cookie_button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    cookie_button.click()
-                    break
-                except TimeoutException:
-                    continue
-
-            # Enhanced human-like typing
-            username_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "username"))
-            )
-            password_input = self.driver.find_element(By.NAME, "password")
-
-            await self._human_like_type(
-                username_input, self.config["credentials"]["Instagram"]["username"]
-            )
-            await asyncio.sleep(self._get_random_delay())
-            await self._human_like_type(
-                password_input, self.config["credentials"]["Instagram"]["password"]
-            )
-
-            # Random mouse movements before clicking login
-            self._simulate_mouse_movement()
-
-            login_button = self.driver.find_element(
-                By.XPATH, "//button[@type='submit']"
-            )
-            login_button.click()
-
-            # Handle various post-login popups
-            popup_selectors = [
-                "//button[contains(text(), 'Not Now')]",
-                "//button[contains(text(), 'Skip')]",
-                "//button[contains(text(), 'Maybe Later')]",
-            ]
-
-            await asyncio.sleep(self._get_random_delay() * 2)  # Longer wait after login
-
-            for selector in popup_selectors:
-                try:
-                    popup_button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    popup_button.click()
-                    await asyncio.sleep(self._get_random_delay())
-                except TimeoutException:
-                    continue
-
-            self.logger.info("Successfully logged in to Instagram")
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Login failed: {str(e)}")
-            return False
-
-    async def _human_like_type(self, element, text):
-        for char in text:
-            # Random typing speed
-            typing_speed = random.uniform(0.1, 0.3)
-            # Occasionally add a longer pause
-            if random.random() < 0.1:
-                typing_speed += random.uniform(0.1, 0.5)
-            element.send_keys(char)
-            await asyncio.sleep(typing_speed)
-
-        # Occasionally make and correct "typos"
-        if random.random() < 0.05:
-            element.send_keys(random.choice(text))
-            await asyncio.sleep(0.5)
-            element.send_keys("")
-            await asyncio.sleep(0.3)
-
-    def _simulate_mouse_movement(self):
-        try:
-            from selenium.webdriver.common.action_chains import ActionChains
-
-            actions = ActionChains(self.driver)
-
-            # Generate random points for mouse movement
-            points = [
-                (random.randint(0, 1000), random.randint(0, 1000)) for _ in range(5)
-            ]
-
-            for x, y in points:
-                actions.move_by_offset(x, y)
-                actions.pause(random.uniform(0.1, 0.3))
-
-            actions.perform()
-        except Exception as e:
-            self.logger.warning(f"Mouse movement simulation failed: {str(e)}")
-
-    def _randomize_scroll(self):
-        scroll_amount = random.randint(300, 700)
-        scroll_time = random.uniform(1, 3)
-        scroll_steps = random.randint(5, 10)
-
-        for _ in range(scroll_steps):
-            step = scroll_amount / scroll_steps
-            self.driver.execute_script(f"window.scrollBy(0, {step})")
-            time.sleep(scroll_time / scroll_steps)
-
-    async def scrape_profile(self, username):
-        try:
-            self.logger.debug(f"Starting to scrape profile: {username}")
-
-            # Log current URL before navigation
-            self.logger.debug(f"Current URL: {self.driver.current_url}")
-
-            self.driver.get(f"https://www.instagram.com/{username}/")
-            await asyncio.sleep(self._get_random_delay() * 1.5)
-
-            # Log page source for debugging
-            self.logger.debug(f"Page title after navigation: {self.driver.title}")
-
-            # Check if logged in
-            if "Login" in self.driver.title:
-                self.logger.error("Not logged in or session expired")
-                return []
-
-            # Try multiple selector variations for posts
-            post_selectors = [
-                "//a[contains(@href, '/p/')]",
-                "//article//a[contains(@href, '/p/')]",
-                "//div[contains(@class, 'v1Nh3')]//a",
-            ]
-
-            post_links = []
-            for selector in post_selectors:
-                try:
-                    self.logger.debug(f"Trying post selector: {selector}")
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    if elements:
-                        post_links = [link.get_attribute("href") for link in elements]
-                        self.logger.debug(
-                            f"Found {len(post_links)} posts with selector {selector}"
-                        )
-                        break
-                except Exception as e:
-                    self.logger.debug(f"Selector {selector} failed: {str(e)}")
-
-            if not post_links:
-                self.logger.error("No posts found on profile")
-                return []
-
-            posts_to_scrape = min(
-                self.config["socialMediaPlatforms"]["Instagram"]["postsPerProfile"],
-                random.randint(5, 15),
-            )
-
-            self.logger.debug(f"Attempting to scrape {posts_to_scrape} posts")
-
-            posts_data = []
-            for link in post_links[:posts_to_scrape]:
-                self.logger.debug(f"Scraping post: {link}")
-                post_data = await self._scrape_post(link, username)
-                if post_data:
-                    posts_data.append(post_data)
-                await asyncio.sleep(self._get_random_delay() * 2)
-
-            self.logger.info(
-                f"Successfully scraped {len(posts_data)} posts for {username}"
-            )
-            return posts_data
-
-        except Exception as e:
-            self.logger.error(
-                f"Error scraping profile {username}: {str(e)}", exc_info=True
-            )
-            return []
-
-    async def _scroll_profile_with_random_behavior(self, target_posts):
-        posts_loaded = 0
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-
-        while posts_loaded < target_posts:
-            # Random scroll behavior
-            self._randomize_scroll()
-
-            # Occasionally pause scrolling
-            if random.random() < 0.2:
-                await asyncio.sleep(random.uniform(1, 3))
-
-            # Sometimes move mouse while scrolling
-            if random.random() < 0.3:
-                self._simulate_mouse_movement()
-
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                # Try a few more times with different scroll amounts
-                for _ in range(3):
-                    self._randomize_scroll()
-                    await asyncio.sleep(self._get_random_delay())
-                    new_height = self.driver.execute_script(
-                        "return document.body.scrollHeight"
-                    )
-                    if new_height != last_height:
-                        break
-                else:
-                    break
-
-            last_height = new_height
-            posts_loaded = len(
-                self.driver.find_elements(By.XPATH, "//a[contains(@href, '/p/')]")
-            )
-
-    async def _scrape_post(self, post_url, username):
-        try:
-            self.logger.debug(f"Starting to scrape post: {post_url}")
-
-            self.driver.get(post_url)
-            await asyncio.sleep(self._get_random_delay())
-
-            # Get meta description content first
-            try:
-                content_data = (
-                    WebDriverWait(self.driver, 10)
-                    .until(
-                        EC.presence_of_element_located(
-                            (By.XPATH, '//meta[@name="description"]')
-                        )
-                    )
-                    .get_attribute("content")
-                )
-
-                self.logger.debug(f"Found meta description: {content_data}")
-
-                # Extract comments using regex patterns
-                comments = 0
-                comments_patterns = [
-                    r"([\d,\.]+[KkMm]?)\s*[Cc]omments",  # Matches "1.5K comments", "2M comments"
-                    r"([\d,]+)\s*[Cc]omments",  # Matches "1,234 comments"
-                    r"([0-9]+)\s*[Cc]omments",  # Matches "123 comments"
-                ]
-
-                for pattern in comments_patterns:
-                    comments_match = re.search(pattern, content_data)
-                    if comments_match:
-                        comments_str = comments_match.group(1).lower().replace(",", "")
-                        # Handle K/M suffixes
-                        if "k" in comments_str:
-                            comments = int(float(comments_str.replace("k", "")) * 1000)
-                        elif "m" in comments_str:
-                            comments = int(
-                                float(comments_str.replace("m", "")) * 1000000
-                            )
-                        else:
-                            comments = int(float(comments_str))
-                        break
-
-                self.logger.debug(f"Extracted comments count: {comments}")
-            except Exception as e:
-                self.logger.debug(f"Meta description extraction failed: {str(e)}")
-
-                # Fallback to traditional selectors if meta description fails
-                comments_selectors = [
-                    "//span[@class='_ae5q']",
-                    "//div[contains(@class, '_ae2s')]//span",
-                    "//span[contains(text(), 'comments')]",
-                ]
-
-                for selector in comments_selectors:
-                    try:
-                        element = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                        comments_text = element.text
-                        comments_text = (
-                            comments_text.lower()
-                            .replace(",", "")
-                            .replace("comments", "")
-                            .replace("k", "000")
-                            .strip()
-                        )
-                        comments = int(float(comments_text))
-                        if comments > 0:
-                            self.logger.debug(
-                                f"Found comments using fallback selector: {selector}"
-                            )
-                            break
-                    except Exception as selector_e:
-                        self.logger.debug(
-                            f"Comments selector {selector} failed: {str(selector_e)}"
-                        )
-
-            content_selectors = [
-                "//div[contains(@class, '_a9zs')]//h1",
-                "//div[contains(@class, '_a9zs')]//span",
-                "//div[contains(@class, 'C4VMK')]//span",
-            ]
-
-            content = ""
-            for selector in content_selectors:
-                try:
-                    element = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    content = element.text
-                    if content:
-                        break
-                except Exception as e:
-                    self.logger.debug(f"Content selector {selector} failed: {str(e)}")
-
-            # Extract timestamp
-            timestamp_selectors = [
-                "//time[@datetime]",
-                "//div[@class='_a9zr']//time",
-                "//time[@class='_aaqe']",
-            ]
-
-            timestamp = ""
-            for selector in timestamp_selectors:
-                try:
-                    element = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    timestamp = element.get_attribute("datetime")
-                    if timestamp:
-                        break
-                except Exception as e:
-                    self.logger.debug(f"Timestamp selector {selector} failed: {str(e)}")
-
-            # Extract likes from meta description if available
-            likes = 0
-            try:
-                likes_match = re.search(r"([\d,\.]+[KkMm]?)\s*[Ll]ikes", content_data)
-                if likes_match:
-                    likes_str = likes_match.group(1).lower().replace(",", "")
-                    if "k" in likes_str:
-                        likes = int(float(likes_str.replace("k", "")) * 1000)
-                    elif "m" in likes_str:
-                        likes = int(float(likes_str.replace("m", "")) * 1000000)
-                    else:
-                        likes = int(float(likes_str))
-            except Exception as e:
-                self.logger.debug(f"Likes extraction from meta failed: {str(e)}")
-                likes = 0
-
-            if likes == 0:
-                self.logger.debug("Attempting fallback methods for likes extraction")
-
-                # Method 1: Try the likes button with various selectors
-                likes_button_selectors = [
-                    "//button[contains(@class, '_abl-')]//span[contains(text(), 'like')]",
-                    "//button[contains(@class, '_abl-')]//span",
-                    "//section//div[contains(text(), 'likes')]",
-                    "//a[contains(@href, 'liked_by')]//span",
-                ]
-
-                for selector in likes_button_selectors:
-                    try:
-                        likes_element = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                        likes_text = likes_element.text.lower()
-                        if likes_text:
-                            # Remove non-numeric characters except '.' and 'k'/'m'
-                            likes_text = "".join(
-                                c for c in likes_text if c.isdigit() or c in ".,km"
-                            )
-                            if "k" in likes_text:
-                                likes = int(float(likes_text.replace("k", "")) * 1000)
-                            elif "m" in likes_text:
-                                likes = int(
-                                    float(likes_text.replace("m", "")) * 1000000
-                                )
-                            else:
-                                likes = int(float(likes_text))
-                            if likes > 0:
-                                self.logger.debug(
-                                    f"Found likes using button selector: {selector}"
-                                )
-                                break
-                    except Exception as e:
-                        self.logger.debug(
-                            f"Likes button selector {selector} failed: {str(e)}"
-                        )
-
-            post_data = {
-                "username": username,
-                "timestamp": timestamp,
-                "content": content,
-                "likes": likes,
-                "comments": comments,
-                "url": post_url
-            }
-
-            self.logger.info(f"Successfully scraped post data: {post_data}")
-            return post_data
-
-        except Exception as e:
-            self.logger.error(
-                f"Error scraping post {post_url}: {str(e)}", exc_info=True
-            )
-            return None
-
-    async def save_to_json(self, posts_data):
-        try:
-            output_file = (
-                f"instagram_posts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            )
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(posts_data, f, ensure_ascii=False, indent=4)
-            self.logger.info(f"Data saved to {output_file}")
-        except Exception as e:
-            self.logger.error(f"Error saving data to JSON: {str(e)}")
-
-    def cleanup(self):
-        if self.driver:
-            self.driver.quit()
-
-
-async def main():
-    scraper = InstagramScraper("config.json")
-    all_posts_data = []
-
-    try:
-        if await scraper.login():
-            # Randomize the order of accounts
-            accounts = scraper.config["socialMediaPlatforms"]["Instagram"]["accounts"]
-            random.shuffle(accounts)
-
-            for username in accounts:
-                scraper.logger.info(f"Scraping profile: {username}")
-                posts = await scraper.scrape_profile(username)
-                all_posts_data.extend(posts)
-                # Random delay between profiles
-                await asyncio.sleep(random.uniform(5, 10))
-
-            await scraper.save_to_json(all_posts_data)
-    finally:
-        scraper.cleanup()
-
-
-if __name__ == "__main__":
-    asyncio.run(main())
+import argparse
+import os
+import sys
+import time
+import random
+import json
+import logging
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from fake_useragent import UserAgent
+
+try:
+    import lxml.html
+except ImportError:  # Only needed to re-extract saved snapshots
+    lxml = None
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_common.browser_pool import BrowserPool
+from scraper_common.counts import count_before, parse_count
+from scraper_common.job_journal import JobJournal
+from scraper_common.network_capture import (
+    NetworkCapture,
+    drain_performance_log,
+    enable_performance_log,
+    find_objects,
+)
+from scraper_common.post_store import PINNED_POST_LIMIT, PostStore
+from scraper_common.rate_limiter import RateLimiter
+from scraper_common.readiness import PageReadiness
+from scraper_common.resource_policy import ResourcePolicy
+from scraper_common.retry import (
+    LOGGED_OUT,
+    UNAVAILABLE,
+    ContentUnavailableError,
+    LoggedOutError,
+    MissingSelectorError,
+    RetryPolicy,
+    classify_error,
+)
+from scraper_common.scroll_progress import STOP_CHECKPOINT, ScrollProgress
+from scraper_common.session_store import SessionStore
+from scraper_common.sinks import create_sink
+from scraper_common.snapshots import SnapshotStore
+
+
+class InstagramScraper:
+    # Buffers the href of every post link added to the feed, seeded with the
+    # ones already rendered. Each call drains the buffer, so one scroll step
+    # costs one round trip for just the new links instead of a DOM re-query.
+    POST_LINK_BUFFER_JS = """
+    if (!window.__postLinkBuffer) {
+        const buffer = window.__postLinkBuffer = [];
+        const seen = new Set();
+        const take = (node) => {
+            if (node.nodeType !== Node.ELEMENT_NODE) {
+                return;
+            }
+            const links = node.matches('a[href*="/p/"]') ? [node] : node.querySelectorAll('a[href*="/p/"]');
+            for (const link of links) {
+                if (!seen.has(link.href)) {
+                    seen.add(link.href);
+                    buffer.push(link.href);
+                }
+            }
+        };
+        take(document.body);
+        new MutationObserver((mutations) => {
+            for (const mutation of mutations) {
+                mutation.addedNodes.forEach(take);
+            }
+        }).observe(document.body, {childList: true, subtree: true});
+    }
+    return {links: window.__postLinkBuffer.splice(0), height: document.body.scrollHeight};
+    """
+
+    # Fallback selectors per field, tried in order by _query_post_fields
+    POST_FIELD_SELECTORS = {
+        "description": ['//meta[@name="description"]'],
+        "comments": [
+            "//span[@class='_ae5q']",
+            "//div[contains(@class, '_ae2s')]//span",
+            "//span[contains(text(), 'comments')]",
+        ],
+        "content": [
+            "//div[contains(@class, '_a9zs')]//h1",
+            "//div[contains(@class, '_a9zs')]//span",
+            "//div[contains(@class, 'C4VMK')]//span",
+        ],
+        "timestamp": [
+            "//time[@datetime]",
+            "//div[@class='_a9zr']//time",
+            "//time[@class='_aaqe']",
+        ],
+        "likes": [
+            "//button[contains(@class, '_abl-')]//span[contains(text(), 'like')]",
+            "//button[contains(@class, '_abl-')]//span",
+            "//section//div[contains(text(), 'likes')]",
+            "//a[contains(@href, 'liked_by')]//span",
+        ],
+    }
+
+    def __init__(self, config_path="config.json"):
+        self.config = self._load_config(config_path)
+        self.logger = self._setup_logger()
+        self.driver = None
+        self.session_start_time = None
+        self.snapshots = self._create_snapshot_store()
+        self.sink = None
+        self.store = self._create_post_store()
+        self.session_store = self._create_session_store()
+        self.resource_policy = self._create_resource_policy()
+        self.network_capture = self._create_network_capture()
+        self.readiness = self._create_readiness()
+        self.rate_limiter = self._create_rate_limiter()
+        self.retry_policy = self._create_retry_policy()
+        self.journal = None
+        self.failed_profiles = set()
+        # API media items captured from the network, keyed by shortcode
+        self.api_posts = {}
+        self.browser_pool = None
+        # One thread per session: WebDriver is not thread-safe, and keeping
+        # its blocking calls off the event loop lets sessions overlap
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def _load_config(self, config_path):
+        with open(config_path, "r") as f:
+            return json.load(f)
+
+    def _setup_logger(self):
+        # Enhanced logging configuration
+        logging.basicConfig(
+            level=logging.DEBUG,  # Changed to DEBUG for more detailed logs
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            handlers=[
+                logging.FileHandler("instagram_scraper_debug.log"),
+                logging.StreamHandler(),
+            ],
+        )
+        return logging.getLogger("InstagramScraper")
+
+    def _create_snapshot_store(self):
+        snapshot_config = self.config.get("snapshots", {})
+        if not snapshot_config.get("enabled", False):
+            return None
+        return SnapshotStore(snapshot_config.get("directory", "snapshots"), "Instagram")
+
+    def _create_post_store(self):
+        database_config = self.config.get("database", {})
+        if not database_config.get("enabled", False):
+            return None
+        return PostStore(database_config.get("path", "scraped_posts.db"))
+
+    def _create_session_store(self):
+        session_config = self.config.get("session", {})
+        if not session_config.get("enabled", False):
+            return None
+        return SessionStore(
+            session_config.get("path", "instagram_session.bin"),
+            key_file=session_config.get("keyFile", ".session.key"),
+            max_age_hours=session_config.get("maxAgeHours"),
+        )
+
+    def _create_resource_policy(self):
+        blocking_config = self.config.get("resourceBlocking", {})
+        if not blocking_config.get("enabled", False):
+            return None
+        return ResourcePolicy(
+            block=blocking_config.get("block", ["image", "media", "font"]),
+            block_trackers=blocking_config.get("blockTrackers", True),
+            extra_patterns=blocking_config.get("extraPatterns", []),
+            logger=self.logger,
+        )
+
+    def _create_network_capture(self):
+        if not self.config["scrapeSettings"].get("networkCapture", False):
+            return None
+        return NetworkCapture(
+            r"/api/v1/(media/\d+/info|feed/user)/|/graphql/query|/api/graphql", self.logger
+        )
+
+    def _create_readiness(self):
+        readiness_config = self.config["scrapeSettings"].get("readiness", {})
+        return PageReadiness(
+            quiet_ms=readiness_config.get("quietMs", 500),
+            timeout=readiness_config.get("timeout", 15),
+            logger=self.logger,
+        )
+
+    async def _wait_until_ready(self, selector=None, pace=0.0):
+        # Wait for the page itself, then only for the part of the pacing
+        # delay that was not already spent while it became ready
+        ready_at = await self._run_blocking(self.readiness.wait, self.driver, selector)
+        await asyncio.sleep(PageReadiness.remaining_delay(ready_at, pace))
+
+    def _configure_network(self, driver=None, discard_log=True):
+        # Only block and capture once logged in, so login challenges still render their images
+        driver = driver or self.driver
+        if self.resource_policy:
+            self.resource_policy.apply(driver, discard_log=discard_log)
+        if self.network_capture:
+            self.network_capture.start(driver)
+
+    def _post_key(self, url):
+        # The shortcode identifies a post whichever path prefix the link uses
+        match = re.search(r"/(?:p|reel)/([^/?#]+)", url or "")
+        return match.group(1) if match else url
+
+    def _get_random_delay(self):
+        action_delay = self.config["scrapeSettings"].get("actionDelay", {"min": 2, "max": 4})
+        base_delay = random.uniform(action_delay["min"], action_delay["max"])
+        # Add random micro-delays
+        micro_delay = random.uniform(0.1, 0.5) * random.random()
+        return base_delay + micro_delay
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        # Run a blocking Selenium call on this session's executor thread
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    def _current_page(self):
+        # URL and title of the loaded page; both are WebDriver round trips,
+        # so call this through _run_blocking
+        return self.driver.current_url, self.driver.title
+
+    def _create_rate_limiter(self):
+        # The account bucket always enforces maxPostsPerHour on post pages;
+        # rateLimits adds the global and platform buckets shared by every fetch
+        limits_config = self.config.get("rateLimits", {})
+        limits = {}
+        if limits_config.get("enabled", False):
+            for scope in ("global", "platform"):
+                if scope in limits_config:
+                    limits[self._rate_limit_bucket(scope)] = (
+                        limits_config[scope]["perHour"],
+                        limits_config[scope].get("burst", 1),
+                    )
+        account_config = limits_config.get("account", {})
+        posts_per_hour = account_config.get("perHour") or self.config[
+            "socialMediaPlatforms"
+        ]["Instagram"].get("maxPostsPerHour")
+        if posts_per_hour:
+            limits[self._rate_limit_bucket("account")] = (
+                posts_per_hour,
+                account_config.get("burst", 1),
+            )
+        if not limits:
+            return None
+        return RateLimiter(limits, path=limits_config.get("path"))
+
+    def _rate_limit_bucket(self, scope):
+        if scope == "account":
+            username = self.config["credentials"]["Instagram"]["username"]
+            return f"account:Instagram:{username}"
+        if scope == "platform":
+            return "platform:Instagram"
+        return "global"
+
+    async def _acquire_fetch_slot(self, post=False):
+        # Every page fetch takes a global and platform token; post pages
+        # also draw from the account's maxPostsPerHour budget
+        if not self.rate_limiter:
+            return
+        scopes = ("global", "platform", "account") if post else ("global", "platform")
+        waited = await self.rate_limiter.acquire_async(
+            self._rate_limit_bucket(scope) for scope in scopes
+        )
+        if waited > 0.5:
+            self.logger.debug(f"Rate limit: waited {waited:.1f}s for a fetch slot")
+
+    def _create_retry_policy(self):
+        error_config = self.config.get("errorHandling", {})
+        return RetryPolicy(
+            max_retries=error_config.get("maxRetries", 3),
+            retry_delay=error_config.get("retryDelay", 5),
+            exponential_backoff=error_config.get("exponentialBackoff", True),
+            logger=self.logger,
+        )
+
+    async def _recover_from_error(self, kind):
+        # An expired session is restored (or logged in again) on the same driver
+        if kind == LOGGED_OUT:
+            await self.login()
+
+    def _incremental_crawl(self):
+        # Only with scrapeSettings.incrementalCrawl do posts stored by an
+        # earlier run end a profile; otherwise every run outputs all posts
+        return bool(self.store) and self.config["scrapeSettings"].get("incrementalCrawl", False)
+
+    def _rate_limits_enabled(self):
+        return self.config.get("rateLimits", {}).get("enabled", False)
+
+    def _setup_driver(self):
+        self.driver = self._create_driver()
+        self.session_start_time = datetime.now()
+
+    def _create_driver(self):
+        options = webdriver.ChromeOptions()
+
+        # Enhanced anti-detection measures
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--start-maximized")
+
+        # Random viewport size
+        viewport_width = random.randint(1024, 1920)
+        viewport_height = random.randint(768, 1080)
+        options.add_argument(f"--window-size={viewport_width},{viewport_height}")
+
+        # Randomized user agent
+        ua = UserAgent()
+        user_agent = ua.random
+        options.add_argument(f"user-agent={user_agent}")
+
+        # Additional ChromeOptions
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+
+        # Add random language and platform
+        languages = ["en-US", "en-GB", "en-CA", "en-AU"]
+        platforms = [
+            "Windows NT 10.0",
+            "Macintosh; Intel Mac OS X 10_15_7",
+            "X11; Linux x86_64",
+        ]
+        options.add_argument(f"--lang={random.choice(languages)}")
+        options.add_argument(f"--platform={random.choice(platforms)}")
+
+        if self.resource_policy or self.network_capture:
+            enable_performance_log(options)
+
+        driver = webdriver.Chrome(options=options)
+
+        # Additional JavaScript-based evasion
+        self._inject_evasion_scripts(driver)
+        self.readiness.install(driver)
+        return driver
+
+    def _inject_evasion_scripts(self, driver):
+        evasion_scripts = [
+            # Mask webdriver presence
+            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})",
+            
+            # Add random plugins
+            """
+            Object.defineProperty(navigator, 'plugins', {
+                get: () => [1, 2, 3, 4, 5].map(() => ({
+                    name: Math.random().toString(36),
+                    filename: Math.random().toString(36)
+                }))
+            })
+            """,
+            
+            # Randomize hardware concurrency
+            f"Object.defineProperty(navigator, 'hardwareConcurrency', {{get: () => {random.randint(2, 16)}}})",
+            
+            # Add random screen properties
+            f"""
+            Object.defineProperty(window, 'screen', {{
+                get: () => ({{
+                    width: {random.randint(1024, 1920)},
+                    height: {random.randint(768, 1080)},
+                    colorDepth: {random.choice([24, 32])},
+                    pixelDepth: {random.choice([24, 32])}
+                }})
+            }})
+            """
+        ]
+
+        for script in evasion_scripts:
+            driver.execute_script(script)
+
+    async def create_browser_pool(self, size):
+        # Warm pool of logged-in drivers shared by all workers. This session logs
+        # in normally and saves the session, the other pooled drivers restore it
+        pool_config = self.config.get("browserPool", {})
+        if not pool_config.get("enabled", False):
+            return None
+        if not self.session_store:
+            self.logger.warning("Browser pool requires session persistence, running without it")
+            return None
+        if not await self.login():
+            return None
+
+        self.browser_pool = BrowserPool(
+            self._create_driver,
+            prepare_driver=self._prepare_pooled_driver,
+            size=size,
+            max_uses=pool_config.get("maxUses", 20),
+            max_memory_mb=pool_config.get("maxMemoryMb"),
+            logger=self.logger,
+        )
+        self.browser_pool.add(self.driver)
+        self.driver = None
+        await self._run_blocking(self.browser_pool.start)
+        return self.browser_pool
+
+    def _prepare_pooled_driver(self, driver):
+        if not self.session_store.restore(driver, "https://www.instagram.com/"):
+            raise RuntimeError("No saved session to restore")
+        if not self._is_logged_in(driver):
+            raise RuntimeError("Saved session was rejected")
+        # Runs on a warm-up thread while other drivers may be mid-page: drop only
+        # this driver's session-restore traffic, without resetting the shared page stats
+        self._configure_network(driver, discard_log=False)
+        if self.resource_policy or self.network_capture:
+            drain_performance_log(driver)
+
+    def _mark_driver_failed(self):
+        # Have the pool replace the leased driver once the failed job returns it
+        if self.browser_pool and self.driver:
+            self.browser_pool.mark_failed(self.driver)
+
+    @asynccontextmanager
+    async def leased_driver(self):
+        # Run the enclosed block on a warm pooled driver, or on our own session without a pool
+        if not self.browser_pool:
+            yield self.driver
+            return
+        self.driver = await self._run_blocking(self.browser_pool.acquire)
+        self.session_start_time = datetime.now()
+        healthy = True
+        try:
+            yield self.driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            driver, self.driver = self.driver, None
+            await self._run_blocking(self.browser_pool.release, driver, healthy)
+
+    async def login(self):
+        try:
+            if not self.driver:
+                await self._run_blocking(self._setup_driver)
+
+            if await self._run_blocking(self._restore_session):
+                self.logger.info("Restored saved Instagram session")
+                await self._run_blocking(self._configure_network)
+                return True
+
+            # Random pre-login behavior
+            starter_urls = [
+                "https://www.instagram.com/explore/",
+                "https://www.instagram.com/about/us/",
+                "https://help.instagram.com/",
+            ]
+            await self._run_blocking(self.driver.get, random.choice(starter_urls))
+            await self._wait_until_ready(pace=self._get_random_delay())
+
+            await self._run_blocking(
+                self.driver.get, "https://www.instagram.com/accounts/login/"
+            )
+            await self._wait_until_ready('input[name="username"]', self._get_random_delay())
+
+            # Handle cookie consent with multiple possible selectors
+            cookie_selectors = [
+                "//button[contains(text(), 'Accept')]",
+                "//button[contains(text(), 'Allow')]",
+                "//button[contains(@class, 'consent')]",
+            ]
+
+            for selector in cookie_selectors:
+                try:
+                    cookie_button = await self._run_blocking(
+                        WebDriverWait(self.driver, 3).until,
+                        EC.element_to_be_clickable((By.XPATH, selector)),
+                    )
+                    await self._run_blocking(cookie_button.click)
+                    break
+                except TimeoutException:
+                    continue
+
+            # Enhanced human-like typing
+            username_input = await self._run_blocking(
+                WebDriverWait(self.driver, 10).until,
+                EC.presence_of_element_located((By.NAME, "username")),
+            )
+            password_input = await self._run_blocking(
+                self.driver.find_element, By.NAME, "password"
+            )
+
+            await self._human_like_type(
+                username_input, self.config["credentials"]["Instagram"]["username"]
+            )
+            await asyncio.sleep(self._get_random_delay())
+            await self._human_like_type(
+                password_input, self.config["credentials"]["Instagram"]["password"]
+            )
+
+            # Random mouse movements before clicking login
+            await self._run_blocking(self._simulate_mouse_movement)
+
+            login_button = await self._run_blocking(
+                self.driver.find_element, By.XPATH, "//button[@type='submit']"
+            )
+            await self._run_blocking(login_button.click)
+
+            # Handle various post-login popups
+            popup_selectors = [
+                "//button[contains(text(), 'Not Now')]",
+                "//button[contains(text(), 'Skip')]",
+                "//button[contains(text(), 'Maybe Later')]",
+            ]
+
+            await asyncio.sleep(self._get_random_delay() * 2)  # Longer wait after login
+
+            for selector in popup_selectors:
+                try:
+                    popup_button = await self._run_blocking(
+                        WebDriverWait(self.driver, 3).until,
+                        EC.element_to_be_clickable((By.XPATH, selector)),
+                    )
+                    await self._run_blocking(popup_button.click)
+                    await asyncio.sleep(self._get_random_delay())
+                except TimeoutException:
+                    continue
+
+            self.logger.info("Successfully logged in to Instagram")
+            await self._run_blocking(self._save_session)
+            await self._run_blocking(self._configure_network)
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Login failed: {str(e)}")
+            return False
+
+    def _restore_session(self):
+        # Restore saved cookies and localStorage, returning whether they are still accepted
+        if not self.session_store:
+            return False
+        try:
+            if not self.session_store.restore(self.driver, "https://www.instagram.com/"):
+                return False
+            if self._is_logged_in():
+                return True
+            self.logger.info("Saved session rejected, logging in with credentials")
+            self.session_store.clear()
+        except Exception as e:
+            self.logger.warning(f"Failed to restore session: {str(e)}")
+        return False
+
+    def _is_logged_in(self, driver=None):
+        # Cheap validity probe: a session cookie and no redirect to the login form
+        driver = driver or self.driver
+        if "accounts/login" in driver.current_url:
+            return False
+        if not driver.get_cookie("sessionid"):
+            return False
+        return not driver.find_elements(By.NAME, "username")
+
+    def _save_session(self):
+        if not self.session_store:
+            return
+        try:
+            if self.driver.get_cookie("sessionid"):
+                self.session_store.save(self.driver)
+            else:
+                self.logger.warning("No session cookie after login, session not saved")
+        except Exception as e:
+            self.logger.warning(f"Failed to save session: {str(e)}")
+
+    async def _human_like_type(self, element, text):
+        for char in text:
+            # Random typing speed
+            typing_speed = random.uniform(0.1, 0.3)
+            # Occasionally add a longer pause
+            if random.random() < 0.1:
+                typing_speed += random.uniform(0.1, 0.5)
+            await self._run_blocking(element.send_keys, char)
+            await asyncio.sleep(typing_speed)
+
+        # Occasionally make and correct "typos"
+        if random.random() < 0.05:
+            await self._run_blocking(element.send_keys, random.choice(text))
+            await asyncio.sleep(0.5)
+            await self._run_blocking(element.send_keys, "")
+            await asyncio.sleep(0.3)
+
+    def _simulate_mouse_movement(self):
+        try:
+            from selenium.webdriver.common.action_chains import ActionChains
+
+            actions = ActionChains(self.driver)
+
+            # Generate random points for mouse movement
+            points = [
+                (random.randint(0, 1000), random.randint(0, 1000)) for _ in range(5)
+            ]
+
+            for x, y in points:
+                actions.move_by_offset(x, y)
+                actions.pause(random.uniform(0.1, 0.3))
+
+            actions.perform()
+        except Exception as e:
+            self.logger.warning(f"Mouse movement simulation failed: {str(e)}")
+
+    def _randomize_scroll(self):
+        scroll_amount = random.randint(300, 700)
+        scroll_time = random.uniform(1, 3)
+        scroll_steps = random.randint(5, 10)
+
+        for _ in range(scroll_steps):
+            step = scroll_amount / scroll_steps
+            self.driver.execute_script(f"window.scrollBy(0, {step})")
+            time.sleep(scroll_time / scroll_steps)
+
+    async def scrape_profile(self, username):
+        # Loading the profile is retried on its own; a failing post only
+        # costs that post
+        try:
+            posts_to_scrape = self.config["socialMediaPlatforms"]["Instagram"]["postsPerProfile"]
+            post_links = await self.retry_policy.call_async(
+                self._open_profile,
+                username,
+                posts_to_scrape,
+                label=f"Profile {username}",
+                recover=self._recover_from_error,
+            )
+        except Exception as e:
+            if classify_error(e) == UNAVAILABLE:
+                self.logger.info(f"Skipping profile {username}: {str(e)}")
+                return []
+            self.logger.error(f"Error scraping profile {username}: {str(e)}")
+            self._mark_driver_failed()
+            if not self.config.get("errorHandling", {}).get("skipFailedProfiles", True):
+                raise
+            self.failed_profiles.add(username)
+            return []
+
+        try:
+            self.logger.debug(f"Attempting to scrape {posts_to_scrape} posts")
+
+            posts_data = []
+            attempted = 0
+            known_streak = 0
+            for link in post_links:
+                if attempted >= posts_to_scrape:
+                    break
+
+                # Posts finished before an interrupted job was resumed are
+                # already in its output
+                if self.journal and self.journal.is_post_done(self._post_key(link)):
+                    attempted += 1
+                    continue
+
+                # Skip posts stored by an earlier run, and stop once past any pinned ones
+                if self._incremental_crawl() and self.store.has_post("Instagram", self._post_key(link)):
+                    known_streak += 1
+                    if known_streak > PINNED_POST_LIMIT:
+                        self.logger.info(f"Reached posts stored by an earlier run for {username}")
+                        break
+                    continue
+                known_streak = 0
+
+                attempted += 1
+                # Posts the profile feed already delivered as JSON need no page visit
+                post_data = self._api_post_data(link, username)
+                if not post_data:
+                    self.logger.debug(f"Scraping post: {link}")
+                    post_data = await self._scrape_post(link, username)
+                    if not self._rate_limits_enabled():
+                        await asyncio.sleep(self._get_random_delay() * 2)
+                if post_data:
+                    posts_data.append(post_data)
+                    await self._run_blocking(self._record_post, post_data, username, link)
+
+            self.logger.info(
+                f"Successfully scraped {len(posts_data)} posts for {username}"
+            )
+            return posts_data
+
+        except Exception as e:
+            self.logger.error(
+                f"Error scraping profile {username}: {str(e)}", exc_info=True
+            )
+            self._mark_driver_failed()
+            return []
+
+    async def _open_profile(self, username, target_posts):
+        self.logger.debug(f"Starting to scrape profile: {username}")
+
+        # Log current URL before navigation
+        current_url, _ = await self._run_blocking(self._current_page)
+        self.logger.debug(f"Current URL: {current_url}")
+
+        await self._acquire_fetch_slot()
+        await self._run_blocking(
+            self.driver.get, f"https://www.instagram.com/{username}/"
+        )
+        await self._wait_until_ready('a[href*="/p/"]', self._get_random_delay() * 1.5)
+
+        # Log page source for debugging
+        _, title = await self._run_blocking(self._current_page)
+        self.logger.debug(f"Page title after navigation: {title}")
+
+        # Check if logged in
+        if "Login" in title:
+            raise LoggedOutError("Not logged in or session expired")
+
+        post_links = await self._harvest_post_links(username, target_posts)
+        if self.network_capture:
+            await self._run_blocking(self._collect_api_posts)
+        if self.resource_policy:
+            await self._run_blocking(
+                self.resource_policy.log_page, self.driver, f"Profile {username}"
+            )
+
+        if not post_links:
+            # A rendered profile header means the account itself has no
+            # visible posts (private or empty); another attempt cannot help
+            if await self._run_blocking(self.driver.find_elements, By.CSS_SELECTOR, "header"):
+                raise ContentUnavailableError("Profile is private or has no posts")
+            raise MissingSelectorError("No posts found on profile")
+        return post_links
+
+    async def _harvest_post_links(self, username, target_posts):
+        # Scroll the feed until target_posts unique post links were seen,
+        # more scrolling stops paying off or, when crawling incrementally,
+        # the feed reaches posts stored by an earlier run; links are
+        # returned in feed order
+        scroll_timeout = self.config["scrapeSettings"].get("readiness", {}).get("scrollTimeout", 5)
+        progress = self._create_scroll_progress(target_posts)
+        incremental = self._incremental_crawl()
+        links = {}
+        known_streak = 0
+
+        while True:
+            batch = await self._run_blocking(
+                self.driver.execute_script, self.POST_LINK_BUFFER_JS
+            )
+            fresh_keys = []
+            for href in batch["links"]:
+                key = self._post_key(href)
+                if key not in links:
+                    links[key] = href
+                    fresh_keys.append(key)
+
+            # Same rule as scrape_profile: more known posts in a row than
+            # can be pinned means everything below is stored already
+            if incremental and fresh_keys:
+                stored = await self._run_blocking(self._stored_posts, fresh_keys)
+                reached_stored = False
+                for is_stored in stored:
+                    known_streak = known_streak + 1 if is_stored else 0
+                    reached_stored = reached_stored or known_streak > PINNED_POST_LIMIT
+                if reached_stored:
+                    progress.stop(STOP_CHECKPOINT)
+                    break
+
+            if not progress.update(batch["height"], len(links)):
+                break
+
+            # Random scroll behavior
+            await self._run_blocking(self._randomize_scroll)
+
+            # Sometimes move mouse while scrolling
+            if random.random() < 0.3:
+                await self._run_blocking(self._simulate_mouse_movement)
+
+            # Let the batch the scroll triggered render, occasionally lingering
+            await self._run_blocking(
+                self.readiness.wait, self.driver, None, scroll_timeout
+            )
+            if random.random() < 0.2:
+                await asyncio.sleep(random.uniform(1, 3))
+
+        self.logger.debug(
+            f"Stopped scrolling {username} after {progress.steps} steps and "
+            f"{progress.elapsed:.0f}s: {progress.stop_reason} ({len(links)} posts)"
+        )
+        return list(links.values())[:target_posts]
+
+    def _create_scroll_progress(self, target_posts):
+        # Scroll limits of one profile feed, from scrapeSettings.scrollLimits
+        limits = self.config["scrapeSettings"].get("scrollLimits", {})
+        return ScrollProgress(
+            target_posts,
+            max_stalled_steps=limits.get("maxStalledSteps", 3),
+            max_idle_steps=limits.get("maxIdleSteps", 6),
+            time_budget=limits.get("timeBudget"),
+        )
+
+    def _stored_posts(self, post_keys):
+        # Whether each post was stored by an earlier run, in the given order
+        return [self.store.has_post("Instagram", key) for key in post_keys]
+
+    async def _scrape_post(self, post_url, username):
+        try:
+            return await self.retry_policy.call_async(
+                self._load_post,
+                post_url,
+                username,
+                label=f"Post {post_url}",
+                recover=self._recover_from_error,
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error scraping post {post_url}: {str(e)}", exc_info=True
+            )
+            return None
+
+    async def _load_post(self, post_url, username):
+        self.logger.debug(f"Starting to scrape post: {post_url}")
+
+        await self._acquire_fetch_slot(post=True)
+        await self._run_blocking(self.driver.get, post_url)
+        await self._wait_until_ready("time[datetime]", self._get_random_delay())
+        current_url, _ = await self._run_blocking(self._current_page)
+        if "/accounts/login" in current_url:
+            raise LoggedOutError(f"Redirected to {current_url}")
+
+        return await self._run_blocking(self._extract_post_data, post_url, username)
+
+    def _query_post_fields(self):
+        # Evaluate every fallback selector in a single round trip. Each field
+        # maps to its non-empty hits in selector order, with the selector that
+        # produced them, so parsing can still fall through to the next one.
+        script = """
+        const fieldSelectors = arguments[0];
+        const attributes = {description: 'content', timestamp: 'datetime'};
+        const result = {};
+        for (const [field, selectors] of Object.entries(fieldSelectors)) {
+            result[field] = [];
+            for (const selector of selectors) {
+                const node = document.evaluate(
+                    selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+                if (!node) {
+                    continue;
+                }
+                const value = attributes[field]
+                    ? node.getAttribute(attributes[field])
+                    : (node.innerText || node.textContent || '').trim();
+                if (value) {
+                    result[field].push({selector: selector, value: value});
+                }
+            }
+        }
+        return result;
+        """
+        return self.driver.execute_script(script, self.POST_FIELD_SELECTORS)
+
+    def _query_post_fields_from_html(self, html):
+        # Offline counterpart of _query_post_fields: the same XPath fallbacks
+        # evaluated with lxml over a saved page instead of in the browser
+        if lxml is None:
+            raise ImportError("Re-extracting snapshots requires the lxml package")
+
+        attributes = {"description": "content", "timestamp": "datetime"}
+        tree = lxml.html.fromstring(html)
+        result = {}
+        for field, selectors in self.POST_FIELD_SELECTORS.items():
+            result[field] = []
+            for selector in selectors:
+                nodes = tree.xpath(selector)
+                if not nodes:
+                    continue
+                if field in attributes:
+                    value = nodes[0].get(attributes[field])
+                else:
+                    value = nodes[0].text_content().strip()
+                if value:
+                    result[field].append({"selector": selector, "value": value})
+        return result
+
+    def _wait_for_post_fields(self):
+        # One bounded wait for the whole batch instead of a timeout per selector
+        timeout = self.config["scrapeSettings"].get("postFieldsTimeout", 10)
+        deadline = time.monotonic() + timeout
+        while True:
+            fields = self._query_post_fields()
+            if (fields["description"] and fields["timestamp"]) or time.monotonic() >= deadline:
+                return fields
+            time.sleep(0.25)
+
+    def _first_count(self, hits, field):
+        for hit in hits:
+            count = parse_count(hit["value"], default=None)
+            if count is None:
+                self.logger.debug(
+                    f"{field} selector {hit['selector']} gave unparseable '{hit['value']}'"
+                )
+                continue
+            if count > 0:
+                return count, hit["selector"]
+        return 0, None
+
+    def _collect_api_posts(self):
+        # Index the media items of the API responses received since the last call
+        messages = drain_performance_log(self.driver)
+        if self.resource_policy:
+            self.resource_policy.observe(messages)
+        for url, payload in self.network_capture.collect(self.driver, messages):
+            for item in find_objects(payload, ("code", "like_count")):
+                self.api_posts[item["code"]] = item
+
+    def _wait_for_api_post(self, post_url):
+        # Give the post page a short while to fetch its media info
+        timeout = self.config["scrapeSettings"].get("networkCaptureTimeout", 3)
+        deadline = time.monotonic() + timeout
+        while True:
+            self._collect_api_posts()
+            if self._post_key(post_url) in self.api_posts or time.monotonic() >= deadline:
+                return
+            time.sleep(0.25)
+
+    def _api_post_data(self, post_url, username):
+        # Exact counts from the captured JSON, or None to fall back to the page
+        item = self.api_posts.pop(self._post_key(post_url), None)
+        if not item:
+            return None
+        taken_at = datetime.fromtimestamp(item.get("taken_at", 0), timezone.utc)
+        post_data = {
+            "username": username,
+            "timestamp": taken_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "content": (item.get("caption") or {}).get("text", ""),
+            "likes": item.get("like_count") or 0,
+            "comments": item.get("comment_count") or 0,
+            "url": post_url
+        }
+        self.logger.info(f"Captured post data from the API: {post_data}")
+        return post_data
+
+    def _extract_post_data(self, post_url, username):
+        if self.network_capture:
+            self._wait_for_api_post(post_url)
+            post_data = self._api_post_data(post_url, username)
+            if post_data:
+                if self.resource_policy:
+                    self.resource_policy.log_page(self.driver, post_url)
+                return post_data
+
+        fields = self._wait_for_post_fields()
+        if self.snapshots:
+            self.snapshots.save(
+                "post", self.driver.page_source, username=username, url=post_url
+            )
+        if self.resource_policy:
+            self.resource_policy.log_page(self.driver, post_url)
+        return self._build_post_data(post_url, username, fields)
+
+    def _build_post_data(self, post_url, username, fields):
+        matched_selectors = {}
+
+        content_data = ""
+        if fields["description"]:
+            content_data = fields["description"][0]["value"]
+            self.logger.debug(f"Found meta description: {content_data}")
+
+        # Extract comments and likes from the meta description, e.g.
+        # "1.5K likes, 23 comments - natgeo on ..."
+        comments = count_before(content_data, "comments")
+        if comments is not None:
+            matched_selectors["comments"] = "meta"
+        else:
+            comments = 0
+
+        likes = count_before(content_data, "likes")
+        if likes is not None:
+            matched_selectors["likes"] = "meta"
+        else:
+            likes = 0
+
+        # Fall back to on-page selectors when the meta description had nothing
+        if not content_data:
+            comments, matched_selectors["comments"] = self._first_count(
+                fields["comments"], "Comments"
+            )
+        if likes == 0:
+            likes, matched_selectors["likes"] = self._first_count(fields["likes"], "Likes")
+
+        content = fields["content"][0]["value"] if fields["content"] else ""
+        timestamp = fields["timestamp"][0]["value"] if fields["timestamp"] else ""
+        matched_selectors["content"] = (
+            fields["content"][0]["selector"] if fields["content"] else None
+        )
+        matched_selectors["timestamp"] = (
+            fields["timestamp"][0]["selector"] if fields["timestamp"] else None
+        )
+        self.logger.debug(f"Matched selectors for {post_url}: {matched_selectors}")
+
+        post_data = {
+            "username": username,
+            "timestamp": timestamp,
+            "content": content,
+            "likes": likes,
+            "comments": comments,
+            "url": post_url
+        }
+
+        self.logger.info(f"Successfully scraped post data: {post_data}")
+        return post_data
+
+    async def scrape_snapshots(self, directory=None):
+        # Re-run post extraction over saved post pages, without a browser
+        directory = directory or self.config.get("snapshots", {}).get(
+            "directory", "snapshots"
+        )
+        posts_data = []
+        for entry, html in SnapshotStore(directory, "Instagram").iter_snapshots("post"):
+            try:
+                fields = self._query_post_fields_from_html(html)
+                posts_data.append(
+                    self._build_post_data(entry["url"], entry["username"], fields)
+                )
+            except Exception as e:
+                self.logger.error(f"Error re-extracting snapshot {entry['file']}: {str(e)}")
+        if self.store:
+            self.store.upsert_posts(
+                "Instagram", posts_data, key=lambda record: self._post_key(record["url"])
+            )
+        return posts_data
+
+    def _record_post(self, post_data, username, link):
+        # Persist a finished post to the streaming sink, the post store and the
+        # job journal; these are file and SQLite writes, so call this through
+        # _run_blocking
+        if self.sink:
+            self.sink.write(post_data)
+        if self.store:
+            self.store.upsert_post(
+                "Instagram", post_data, key=lambda record: self._post_key(record["url"])
+            )
+        if self.journal:
+            self.journal.record_post(username, self._post_key(link), post_data)
+
+    def open_journal(self, resume=False):
+        # Checkpoint journal of one job; with resume, the progress of the
+        # run that was interrupted is replayed from it
+        path = self.config.get("jobJournal", {}).get("path", "instagram_job.journal")
+        journal = JobJournal(path, resume=resume)
+        if journal.resumed:
+            self.logger.info(
+                f"Resuming job: {len(journal.done_accounts)} profiles and "
+                f"{len(journal.records())} posts already done"
+            )
+        return journal
+
+    def open_output_sink(self):
+        # Stream posts as they are scraped when output.format is 'jsonl',
+        # 'parquet' or 'arrow'; 'json' keeps the end-of-run save_to_json
+        output_config = self.config.get("output", {})
+        self.sink = create_sink(
+            output_config.get("format", "json"),
+            f"instagram_posts_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            batch_size=output_config.get("batchSize", 50),
+            max_bytes=output_config.get("rotateMaxBytes") or None,
+            compression=output_config.get("compressionEnabled", True),
+        )
+        if self.sink:
+            self.logger.info(f"Streaming posts to {self.sink.path}")
+        return self.sink
+
+    async def save_to_json(self, posts_data):
+        try:
+            output_file = (
+                f"instagram_posts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(posts_data, f, ensure_ascii=False, indent=4)
+            self.logger.info(f"Data saved to {output_file}")
+        except Exception as e:
+            self.logger.error(f"Error saving data to JSON: {str(e)}")
+
+    def cleanup(self):
+        if self.resource_policy:
+            self.resource_policy.log_totals()
+        if self.sink:
+            self.sink.close()
+        if self.store:
+            self.store.close()
+        if self.rate_limiter:
+            self.rate_limiter.close()
+        if self.driver:
+            self.driver.quit()
+        self.executor.shutdown(wait=False)
+
+
+async def _profile_worker(scraper, queue, all_posts_data):
+    # Each worker owns one logged-in browser session and drains the shared queue
+    while True:
+        username = await queue.get()
+        try:
+            scraper.logger.info(f"Scraping profile: {username}")
+            # Each profile is a short job on a warm driver when pooling is enabled
+            async with scraper.leased_driver():
+                posts = await scraper.scrape_profile(username)
+            # Skipped profiles are not marked finished, so --resume retries them
+            # if this round is interrupted; a completed round deletes the journal
+            if username not in scraper.failed_profiles:
+                await scraper._run_blocking(scraper.journal.finish_account, username)
+            # With a sink the posts were already streamed as they were scraped
+            if not scraper.sink:
+                all_posts_data.extend(posts)
+            # Random delay between profiles, unless the rate limiter paces fetches
+            if not scraper._rate_limits_enabled():
+                await asyncio.sleep(random.uniform(5, 10))
+        finally:
+            queue.task_done()
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description="Instagram profile scraper")
+    arg_parser.add_argument(
+        "--from-snapshots",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="re-extract posts from saved snapshots instead of a live browser",
+    )
+    arg_parser.add_argument(
+        "--every",
+        type=float,
+        metavar="MINUTES",
+        help="repeat the scrape every MINUTES, keeping pooled browsers warm in between",
+    )
+    arg_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the job an interrupted run left in the checkpoint journal",
+    )
+    args = arg_parser.parse_args()
+
+    config_path = "config.json"
+    scraper = InstagramScraper(config_path)
+    sink = scraper.open_output_sink()
+    if args.from_snapshots is not None:
+        posts = await scraper.scrape_snapshots(args.from_snapshots or None)
+        if sink:
+            sink.write_many(posts)
+        else:
+            await scraper.save_to_json(posts)
+        scraper.cleanup()
+        return
+
+    # browserPool.size sets the number of parallel sessions, pooled or not
+    pool_size = max(1, scraper.config.get("browserPool", {}).get("size", 1))
+    scrapers = [scraper] + [InstagramScraper(config_path) for _ in range(pool_size - 1)]
+    for session in scrapers:
+        session.sink = sink
+        # All sessions log in as the same account, so they share its buckets
+        if session is not scraper and session.rate_limiter:
+            session.rate_limiter.close()
+            session.rate_limiter = scraper.rate_limiter
+    all_posts_data = []
+
+    browser_pool = None
+    try:
+        browser_pool = await scraper.create_browser_pool(pool_size)
+        if browser_pool:
+            # Workers lease warm drivers per profile instead of owning one
+            for session in scrapers:
+                session.browser_pool = browser_pool
+            sessions = scrapers
+        else:
+            login_results = await asyncio.gather(*(s.login() for s in scrapers))
+            sessions = [s for s, logged_in in zip(scrapers, login_results) if logged_in]
+            scraper.logger.info(f"{len(sessions)}/{pool_size} browser sessions logged in")
+
+        resume = args.resume
+        while sessions:
+            # Posts finished before a crash go into this job's output again,
+            # unless the sink file already held them when it was opened
+            journal = scraper.open_journal(resume)
+            for session in sessions:
+                session.journal = journal
+                session.failed_profiles.clear()
+            if not sink:
+                all_posts_data.extend(journal.records())
+            elif not sink.appending:
+                sink.write_many(journal.records())
+
+            # Randomize the order of accounts
+            accounts = scraper.config["socialMediaPlatforms"]["Instagram"]["accounts"]
+            random.shuffle(accounts)
+
+            queue = asyncio.Queue()
+            for username in accounts:
+                if journal.is_account_done(username):
+                    scraper.logger.info(
+                        f"Skipping {username}, already finished by the interrupted run"
+                    )
+                    continue
+                queue.put_nowait(username)
+
+            workers = [
+                asyncio.create_task(_profile_worker(session, queue, all_posts_data))
+                for session in sessions
+            ]
+            # A worker only ends early when a profile failed and
+            # skipFailedProfiles is off; that aborts the whole round
+            joined = asyncio.create_task(queue.join())
+            await asyncio.wait([joined, *workers], return_when=asyncio.FIRST_COMPLETED)
+            joined.cancel()
+            for worker in workers:
+                worker.cancel()
+            results = await asyncio.gather(*workers, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+
+            if not sink:
+                await scraper.save_to_json(all_posts_data)
+                all_posts_data.clear()
+            journal.close(completed=True)
+            resume = False
+            if not args.every:
+                break
+            await asyncio.sleep(args.every * 60)
+    finally:
+        if browser_pool:
+            browser_pool.close()
+        for s in scrapers:
+            s.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,14 @@
+import argparse
 import logging
 import json
+import os
+import sys
 import time
 import re
 import random
 import math
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 
 import undetected_chromedriver as uc
@@ -17,15 +21,57 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from fake_useragent import UserAgent
-from cachetools import TTLCache
+
+try:
+    import lxml.html
+except ImportError:  # Only needed to re-extract saved snapshots
+    lxml = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics_cache import MetricsCache
+from video_ids import timestamp_from_video_id, timestamps_from_urls, video_id_from_url
+from scraper_common.browser_pool import BrowserPool
+from scraper_common.counts import parse_count, parse_counts
+from scraper_common.job_journal import JobJournal
+from scraper_common.network_capture import NetworkCapture, current_target, drain_performance_log, enable_performance_log, find_objects
+from scraper_common.post_store import PINNED_POST_LIMIT, PostStore
+from scraper_common.rate_limiter import RateLimiter
+from scraper_common.readiness import PageReadiness
+from scraper_common.resource_policy import ResourcePolicy
+from scraper_common.retry import LOGGED_OUT, LoggedOutError, MissingSelectorError, RetryPolicy
+from scraper_common.session_store import SessionStore
+from scraper_common.sinks import create_sink
+from scraper_common.snapshots import SnapshotStore
+
+
+CAPTCHA_XPATH = "//div[contains(@class, 'captcha') or contains(@id, 'captcha')]"
+# Nav entries TikTok only renders for an authenticated visitor
+LOGGED_IN_NAV_SELECTOR = "[data-e2e='profile-icon'], a[href*='/upload']"
+# Page fields every video has; the caption is missing on videos posted without one
+REQUIRED_METRICS = ('likes', 'comments', 'shares', 'description')
+
 
 class AdvancedTikTokScraper:
     def __init__(self, config_path='config.json'):
         self.config = self.load_config(config_path)
         self.driver = None
         self.ua = UserAgent()
-        self.cache = TTLCache(maxsize=100, ttl=3600)
         self.logger = self.setup_logger()
+        self.snapshots = self.setup_snapshot_store()
+        self.sink = None
+        self.store = self.setup_post_store()
+        self.session_store = self.setup_session_store()
+        self.resource_policy = self.setup_resource_policy()
+        self.network_capture = self.setup_network_capture()
+        self.readiness = self.setup_readiness()
+        self.metrics_cache = self.setup_metrics_cache()
+        self.rate_limiter = self.setup_rate_limiter()
+        self.retry_policy = self.setup_retry_policy()
+        self.journal = None
+        self.failed_profiles = set()
+        self.api_videos = {}  # video ID -> item captured from the API
+        self.browser_pool = None
 
     def setup_logger(self):
         logging.basicConfig(
@@ -34,6 +80,220 @@ class AdvancedTikTokScraper:
         )
         return logging.getLogger(__name__)
 
+    def setup_snapshot_store(self):
+        snapshot_config = self.config.get('snapshots', {})
+        if not snapshot_config.get('enabled', False):
+            return None
+        return SnapshotStore(snapshot_config.get('directory', 'snapshots'), 'TikTok')
+
+    def setup_output_sink(self):
+        # Stream records as they are scraped when output_format is 'jsonl', 'parquet' or 'arrow',
+        # into a timestamped file per run so runs never append to each other
+        stem = os.path.splitext(self.config['output_file'])[0]
+        self.sink = create_sink(
+            self.config.get('output_format', 'json'),
+            f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            batch_size=self.config.get('output_batch_size', 50),
+            compression=self.config.get('output_compression', True)
+        )
+        if self.sink:
+            self.logger.info(f"Streaming records to {self.sink.path}")
+        return self.sink
+
+    def setup_post_store(self):
+        database_config = self.config.get('database', {})
+        if not database_config.get('enabled', False):
+            return None
+        return PostStore(database_config.get('path', 'scraped_posts.db'))
+
+    def setup_session_store(self):
+        session_config = self.config.get('session', {})
+        if not session_config.get('enabled', False):
+            return None
+        return SessionStore(
+            session_config.get('path', 'tiktok_session.bin'),
+            key_file=session_config.get('key_file', '.session.key'),
+            max_age_hours=session_config.get('max_age_hours')
+        )
+
+    def setup_resource_policy(self):
+        blocking_config = self.config.get('resource_blocking', {})
+        if not blocking_config.get('enabled', False):
+            return None
+        return ResourcePolicy(
+            block=blocking_config.get('block', ['image', 'media', 'font']),
+            block_trackers=blocking_config.get('block_trackers', True),
+            extra_patterns=blocking_config.get('extra_patterns', []),
+            logger=self.logger
+        )
+
+    def setup_network_capture(self):
+        if not self.config.get('network_capture', False):
+            return None
+        return NetworkCapture(r'/api/(post/item_list|item/detail)/', self.logger)
+
+    def setup_readiness(self):
+        readiness_config = self.config.get('readiness', {})
+        return PageReadiness(
+            quiet_ms=readiness_config.get('quiet_ms', 500),
+            timeout=readiness_config.get('timeout', 15),
+            logger=self.logger
+        )
+
+    def setup_metrics_cache(self):
+        cache_config = self.config.get('metrics_cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        return MetricsCache(
+            ttl=cache_config.get('ttl', 3600),
+            max_size=cache_config.get('max_size', 1000),
+            path=cache_config.get('path')
+        )
+
+    def cache_post(self, post_data):
+        """Remember a freshly scraped record so visits within the TTL can skip the page"""
+        if self.metrics_cache:
+            self.metrics_cache.put(self.get_video_id(post_data['url']), post_data)
+
+    def setup_rate_limiter(self):
+        limits_config = self.config.get('rate_limits', {})
+        if not limits_config.get('enabled', False):
+            return None
+        buckets = dict(zip(('global', 'platform', 'account'), self.rate_limit_buckets()))
+        limits = {
+            buckets[scope]: (limits_config[scope]['per_hour'], limits_config[scope].get('burst', 1))
+            for scope in buckets if scope in limits_config
+        }
+        return RateLimiter(limits, path=limits_config.get('path'))
+
+    def rate_limit_buckets(self):
+        return ['global', 'platform:TikTok', f"account:TikTok:{self.config['login']['email']}"]
+
+    def acquire_fetch_slot(self):
+        """Wait for a token of every rate limit bucket before loading a page"""
+        if not self.rate_limiter:
+            return
+        waited = self.rate_limiter.acquire(self.rate_limit_buckets())
+        if waited > 0.5:
+            self.logger.info(f"Rate limit: waited {waited:.1f}s for a fetch slot")
+
+    def setup_retry_policy(self):
+        error_config = self.config.get('error_handling', {})
+        return RetryPolicy(
+            max_retries=error_config.get('max_retries', 3),
+            retry_delay=error_config.get('retry_delay', 5),
+            exponential_backoff=error_config.get('exponential_backoff', True),
+            logger=self.logger
+        )
+
+    def recover_from_error(self, kind):
+        """Log the current driver back in before retrying after the session expired"""
+        if kind == LOGGED_OUT:
+            self.login()
+
+    def configure_network(self, driver, discard_log=True):
+        """Start resource blocking and network capture, only once logged in so CAPTCHAs still render"""
+        if self.resource_policy:
+            self.resource_policy.apply(driver, discard_log=discard_log)
+        if self.network_capture:
+            self.network_capture.start(driver)
+
+    def setup_browser_pool(self):
+        """Start a pool of warm, logged-in drivers; the first one logs in and saves the session"""
+        pool_config = self.config.get('browser_pool', {})
+        if not pool_config.get('enabled', False):
+            return None
+        if not self.session_store:
+            self.logger.warning("Browser pool requires session persistence, running without it")
+            return None
+
+        self.driver = self.setup_driver()
+        self.login()
+        self.browser_pool = BrowserPool(
+            self.setup_driver,
+            prepare_driver=self.prepare_pooled_driver,
+            size=pool_config.get('size', 2),
+            max_uses=pool_config.get('max_uses', 20),
+            max_memory_mb=pool_config.get('max_memory_mb'),
+            logger=self.logger
+        )
+        self.browser_pool.add(self.driver)
+        self.driver = None
+        self.browser_pool.start()
+        return self.browser_pool
+
+    def prepare_pooled_driver(self, driver):
+        """Authenticate a fresh pooled driver from the saved session"""
+        if not self.session_store.restore(driver, 'https://www.tiktok.com/'):
+            raise RuntimeError("No saved session to restore")
+        if not self.is_logged_in(driver):
+            raise RuntimeError("Saved session was rejected")
+        # Runs on a warm-up thread while other drivers may be mid-page: drop only this
+        # driver's session-restore traffic, without resetting the shared page stats
+        self.configure_network(driver, discard_log=False)
+        if self.resource_policy or self.network_capture:
+            drain_performance_log(driver)
+
+    def mark_driver_failed(self):
+        """Have the pool replace the leased driver once the failed job returns it"""
+        if self.browser_pool and self.driver:
+            self.browser_pool.mark_failed(self.driver)
+
+    @contextmanager
+    def leased_driver(self):
+        """Run the enclosed block on a pooled driver, or on self.driver without a pool"""
+        if not self.browser_pool:
+            yield self.driver
+            return
+        with self.browser_pool.lease() as driver:
+            self.driver = driver
+            try:
+                yield driver
+            finally:
+                self.driver = None
+
+    def collect_api_videos(self):
+        """Index the video items of the API responses the current tab received since the last call"""
+        messages = drain_performance_log(self.driver)
+        if self.resource_policy:
+            self.resource_policy.observe(messages)
+        # The log holds the events of every open tab; bodies can only be read from their own tab
+        for url, payload in self.network_capture.collect(self.driver, messages, current_target(self.driver)):
+            for item in find_objects(payload, ('id', 'desc', 'stats', 'createTime')):
+                self.api_videos[str(item['id'])] = item
+
+    def api_post_data(self, video_link, username):
+        """Exact counts from a captured API item, or None when the video was not captured"""
+        item = self.api_videos.pop(self.get_video_id(video_link), None)
+        if not item:
+            return None
+        stats = item['stats']
+        created_at = datetime.fromtimestamp(int(item['createTime']), timezone.utc)
+        post_data = {
+            "username": username,
+            "timestamp": created_at.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            "content": item['desc'],
+            "likes": int(stats.get('diggCount', 0)),
+            "comments": int(stats.get('commentCount', 0)),
+            "shares": int(stats.get('shareCount', 0)),
+            "url": video_link
+        }
+        self.cache_post(post_data)
+        return post_data
+
+    def get_video_id(self, video_link):
+        match = re.search(r'/video/(\d+)', video_link or '')
+        return match.group(1) if match else video_link
+
+    def record_post(self, post_data):
+        """Persist a finished record to the streaming sink and the post store"""
+        if self.sink:
+            self.sink.write(post_data)
+        if self.store:
+            self.store.upsert_post('TikTok', post_data, key=lambda record: self.get_video_id(record['url']))
+        if self.journal:
+            self.journal.record_post(post_data['username'], self.get_video_id(post_data['url']), post_data)
+
     def load_config(self, config_path):
         try:
             with open(config_path, 'r') as f:
@@ -62,6 +322,12 @@ class AdvancedTikTokScraper:
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--disable-extensions')
+
+        # Keep background tabs loading at full speed for parallel video fetches
+        chrome_options.add_argument('--disable-popup-blocking')
+        chrome_options.add_argument('--disable-background-timer-throttling')
+        chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+        chrome_options.add_argument('--disable-renderer-backgrounding')
         
         # Language and Platform Headers
         chrome_options.add_argument(f'--lang={language}')
@@ -70,6 +336,9 @@ class AdvancedTikTokScraper:
         if self.config.get('headless', False):
             chrome_options.add_argument('--headless=new')
 
+        if self.resource_policy or self.network_capture:
+            enable_performance_log(chrome_options)
+
         # Use undetected_chromedriver
         driver = uc.Chrome(options=chrome_options)
 
@@ -78,6 +347,7 @@ class AdvancedTikTokScraper:
             "platform": platform,
             "userAgent": user_agent
         })
+        self.readiness.install(driver)
 
         return driver
 
@@ -110,6 +380,63 @@ class AdvancedTikTokScraper:
             self.logger.warning(f"Random mouse move failed: {e}")
 
     def login(self):
+        """Reuse a saved session when it is still valid, otherwise log in with credentials"""
+        if self.restore_session():
+            self.logger.info("Restored saved session")
+        else:
+            self.login_with_credentials()
+
+            if self.session_store:
+                try:
+                    self.session_store.save(self.driver)
+                except Exception as e:
+                    self.logger.warning(f"Failed to save session: {e}")
+
+        self.configure_network(self.driver)
+
+    def wait_for_captcha(self, captcha_xpath, timeout, label):
+        """Wait for a manual CAPTCHA solve, with resource blocking lifted so the puzzle renders"""
+        self.logger.warning(f"CAPTCHA detected for {label}! Please solve the CAPTCHA manually.")
+        if self.resource_policy:
+            self.resource_policy.release(self.driver)
+            self.driver.refresh()
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: len(driver.find_elements(By.XPATH, captcha_xpath)) == 0
+            )
+        finally:
+            if self.resource_policy:
+                self.resource_policy.apply(self.driver, discard_log=False)
+
+    def restore_session(self):
+        if not self.session_store:
+            return False
+        try:
+            if not self.session_store.restore(self.driver, 'https://www.tiktok.com/'):
+                return False
+            if self.is_logged_in():
+                return True
+            self.logger.info("Saved session rejected, logging in with credentials")
+            self.session_store.clear()
+        except Exception as e:
+            self.logger.warning(f"Failed to restore session: {e}")
+        return False
+
+    def is_logged_in(self, driver=None, timeout=10):
+        """Validity probe: the server rendered the logged-in profile or upload nav"""
+        # The sessionid cookie proves nothing here: restore() has just injected it
+        driver = driver or self.driver
+        if "login" in driver.current_url.lower():
+            return False
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, LOGGED_IN_NAV_SELECTOR))
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def login_with_credentials(self):
         max_attempts = 3
         captcha_wait_time = 10  # 2 minutes for manual CAPTCHA solving
 
@@ -118,7 +445,7 @@ class AdvancedTikTokScraper:
                 self.driver.get(self.config['login']['url'])
                 
                 # Wait for login page to load
-                time.sleep(random.uniform(2, 5))
+                self.readiness.wait(self.driver, "input[type='password']")
                 
                 # Locate and fill email field
                 email_field = self.wait_and_find_element(By.CSS_SELECTOR, "input[type='text']")
@@ -189,83 +516,70 @@ class AdvancedTikTokScraper:
         raise Exception("Login failed after maximum attempts. Please check credentials and CAPTCHA handling.")
 
     def get_timestamp_from_video_id(self, video_link):
-        # Rest of the method remains the same as in the original script
-        match = re.search(r'/video/(\d+)', video_link)
-        if not match:
-            return None
-        
-        video_id = int(match.group(1))
-        binary_representation = bin(video_id)[2:]
-        binary_31_bits = binary_representation[:31]
-        decimal_value = int(binary_31_bits, 2)
-        timestamp = datetime.utcfromtimestamp(decimal_value)
-        return timestamp.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        """Creation time encoded in the top 32 bits of the video ID"""
+        video_id = video_id_from_url(video_link)
+        return timestamp_from_video_id(video_id) if video_id is not None else None
 
     # Rest of the methods remain the same as in the original script
-    def convert_value(self, value_str):
-        if not value_str:
-            return 0
-        
-        value_str = value_str.strip().replace(',', '')
-        
-        try:
-            if 'K' in value_str:
-                return int(float(value_str.replace('K', '')) * 1000)
-            elif 'M' in value_str:
-                return int(float(value_str.replace('M', '')) * 1000000)
-            return int(value_str)
-        except (ValueError, TypeError):
-            return 0
-
-    def extract_metrics_from_meta(self, description):
-        # Cache key based on description hash
-        cache_key = f"metrics_{hash(description)}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
-
-        metrics = {
-            'likes': 0,
-            'comments': 0,
-            'shares': 0,
-            'content': ""
-        }
+    def fetch_page_metrics(self, timeout=None):
+        """Read the counters, caption and meta description in a single script round trip"""
+        metrics_js = """
+        const text = (selector) => {
+            const element = document.querySelector(selector);
+            return element ? element.textContent.trim() : null;
+        };
+        const meta = document.querySelector('meta[name="description"]');
+        return {
+            likes: text("strong[data-e2e='like-count']"),
+            comments: text("strong[data-e2e='comment-count']"),
+            shares: text("strong[data-e2e='share-count']"),
+            content: text("h1[data-e2e='browse-video-desc'] > span"),
+            description: meta ? meta.getAttribute('content') : null
+        };
+        """
+        if timeout is None:
+            timeout = self.config.get('metrics_wait', 3)
 
-        try:
-            # Extract likes
-            likes_element = self.wait_and_find_element(
-                By.XPATH, "//strong[@data-e2e='like-count']"
-            )
-            if likes_element:
-                metrics['likes'] = self.convert_value(likes_element.text)
+        def required_fields_present(driver):
+            page_metrics = driver.execute_script(metrics_js)
+            return page_metrics if all(page_metrics[field] is not None for field in REQUIRED_METRICS) else False
 
-            # Extract comments
-            comments_element = self.wait_and_find_element(
-                By.XPATH, "//strong[@data-e2e='comment-count']"
-            )
-            if comments_element:
-                metrics['comments'] = self.convert_value(comments_element.text)
+        # One shared wait for the whole batch instead of a timeout per field
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(required_fields_present)
+        except TimeoutException:
+            page_metrics = self.driver.execute_script(metrics_js)
+            missing = [field for field in REQUIRED_METRICS if page_metrics[field] is None]
+            self.logger.warning(f"Fields not found after {timeout}s: {', '.join(missing)}")
+            return page_metrics
 
-            # Extract shares
-            shares_element = self.wait_and_find_element(
-                By.XPATH, "//strong[@data-e2e='share-count']"
-            )
-            if shares_element:
-                metrics['shares'] = self.convert_value(shares_element.text)
+    def page_metrics_from_html(self, html):
+        """Offline counterpart of fetch_page_metrics for a saved video page"""
+        if lxml is None:
+            raise ImportError("Re-extracting snapshots requires the lxml package")
+        tree = lxml.html.fromstring(html)
 
-            # Extract content
-            content_element = self.wait_and_find_element(
-                By.XPATH, "//h1[@data-e2e='browse-video-desc']/span"
-            )
-            if content_element:
-                metrics['content'] = content_element.text.strip()
+        def text(xpath):
+            nodes = tree.xpath(xpath)
+            return nodes[0].text_content().strip() if nodes else None
 
-            # Cache the results
-            self.cache[cache_key] = metrics
-            return metrics
+        descriptions = tree.xpath('//meta[@name="description"]/@content')
+        return {
+            'likes': text("//strong[@data-e2e='like-count']"),
+            'comments': text("//strong[@data-e2e='comment-count']"),
+            'shares': text("//strong[@data-e2e='share-count']"),
+            'content': text("//h1[@data-e2e='browse-video-desc']/span"),
+            'description': descriptions[0] if descriptions else None
+        }
 
-        except Exception as e:
-            self.logger.error(f"Error extracting metrics: {str(e)}")
-            return metrics
+    def normalize_page_metrics(self, page_metrics):
+        """Parse the raw strings of fetch_page_metrics or page_metrics_from_html into counts and caption"""
+        return {
+            'likes': parse_count(page_metrics.get('likes')),
+            'comments': parse_count(page_metrics.get('comments')),
+            'shares': parse_count(page_metrics.get('shares')),
+            'content': (page_metrics.get('content') or "").strip()
+        }
 
     def wait_and_find_element(self, by, value, timeout=10):
         """Helper method to wait and find an element"""
@@ -278,131 +592,434 @@ class AdvancedTikTokScraper:
             return None
 
     def scrape_profile(self, username):
+        # Loading the profile is retried on its own; a failing video only costs that video
         try:
-            profile_url = f"https://www.tiktok.com/@{username}"
-            self.logger.info(f"Scraping profile: {profile_url}")
-            
-            # Navigate to profile
-            self.driver.get(profile_url)
-            
-            # CAPTCHA Handling
+            post_links = self.retry_policy.call(
+                self.load_profile_links, username, label=f"Profile {username}", recover=self.recover_from_error
+            )
+        except Exception as e:
+            self.logger.error(f"Error scraping profile {username}: {e}")
+            self.mark_driver_failed()
+            if not self.config.get('error_handling', {}).get('skip_failed_profiles', True):
+                raise
+            self.failed_profiles.add(username)
+            return []
+
+        try:
+            # With incremental_crawl, skip videos stored by an earlier run and stop once past
+            # any pinned ones. The metrics cache wins over the store: a stored video whose
+            # cached record is still fresh is kept and served from the cache, only stale
+            # stored videos are skipped
+            cached_posts = {}
+            if self.store and self.config.get('incremental_crawl', False):
+                new_links = []
+                known_streak = 0
+                for link in post_links:
+                    video_id = self.get_video_id(link)
+                    if not self.store.has_post('TikTok', video_id):
+                        known_streak = 0
+                        new_links.append(link)
+                        continue
+                    known_streak += 1
+                    post_data = self.metrics_cache.get(video_id) if self.metrics_cache else None
+                    if post_data:
+                        cached_posts[link] = post_data
+                        new_links.append(link)
+                        continue
+                    if known_streak > PINNED_POST_LIMIT:
+                        self.logger.info(f"Reached videos stored by an earlier run for {username}")
+                        break
+                post_links = new_links
+
+            video_links = post_links[:5]  # Limit to first 5 posts
+            if self.journal:
+                # Videos finished before an interrupted job was resumed are already in its output
+                video_links = [link for link in video_links if not self.journal.is_post_done(self.get_video_id(link))]
+
+            # Videos scraped within the cache TTL need no page visit
+            posts_data = []
+            if self.metrics_cache:
+                remaining_links = []
+                for video_link in video_links:
+                    post_data = cached_posts.get(video_link) or self.metrics_cache.get(self.get_video_id(video_link))
+                    if post_data:
+                        self.record_post(post_data)
+                        posts_data.append(post_data)
+                    else:
+                        remaining_links.append(video_link)
+                video_links = remaining_links
+
+            # Videos the profile feed already delivered as JSON need no page visit
+            if self.network_capture:
+                self.collect_api_videos()
+                remaining_links = []
+                for video_link in video_links:
+                    post_data = self.api_post_data(video_link, username)
+                    if post_data:
+                        self.record_post(post_data)
+                        posts_data.append(post_data)
+                    else:
+                        remaining_links.append(video_link)
+                video_links = remaining_links
+
+            if self.config.get('parallel_tabs', {}).get('enabled', False):
+                return posts_data + self.scrape_videos_in_tabs(video_links, username)
+
+            for video_link in video_links:
+                post_data = self.scrape_video(video_link, username)
+                if post_data:
+                    posts_data.append(post_data)
+
+            return posts_data
+
+        except Exception as e:
+            self.logger.error(f"Error scraping profile {username}: {e}")
+            self.mark_driver_failed()
+            return []
+
+    def load_profile_links(self, username):
+        """Open a profile and return the links of its videos; errors propagate to the retry policy"""
+        profile_url = f"https://www.tiktok.com/@{username}"
+        self.logger.info(f"Scraping profile: {profile_url}")
+        
+        # Navigate to profile and wait until either the videos or a CAPTCHA rendered
+        self.acquire_fetch_slot()
+        self.driver.get(profile_url)
+        ready_at = self.readiness.wait(self.driver, "a[href*='/video/'], div[class*='captcha'], div[id*='captcha']")
+        if '/login' in self.driver.current_url:
+            raise LoggedOutError(f"Redirected to {self.driver.current_url}")
+        
+        # CAPTCHA Handling
+        if self.driver.find_elements(By.XPATH, CAPTCHA_XPATH):
             try:
-                # Check for CAPTCHA within 10 seconds
-                captcha_element = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'captcha') or contains(@id, 'captcha')]"))
-                )
-                
-                self.logger.warning(f"CAPTCHA detected for profile {username}! Please solve the CAPTCHA manually.")
-                
-                # Wait up to 3 minutes for CAPTCHA to be solved
-                WebDriverWait(self.driver, 15).until(
-                    lambda driver: len(driver.find_elements(By.XPATH, "//div[contains(@class, 'captcha') or contains(@id, 'captcha')]")) == 0
-                )
-                
-                # Additional wait for page to stabilize
-                time.sleep(random.uniform(2, 5))
+                self.wait_for_captcha(CAPTCHA_XPATH, 15, f"profile {username}")
+                # Wait for page to stabilize
+                ready_at = self.readiness.wait(self.driver, "a[href*='/video/']")
             except TimeoutException:
-                # No CAPTCHA or CAPTCHA solved quickly
                 pass
-            
-            # Wait for page to load
-            time.sleep(random.uniform(2, 5))
+        
+        # Human-like pause, counted from when the page was ready
+        time.sleep(PageReadiness.remaining_delay(ready_at, random.uniform(2, 5)))
 
-            # Get all video links
-            post_links = []
+        # Get all video links
+        posts = WebDriverWait(self.driver, 10).until(
+            EC.presence_of_all_elements_located((By.XPATH, '//div[@class=" css-13fa1gi-DivWrapper e1cg0wnj1"]/a'))
+        )
+        return [link for link in (post.get_attribute('href') for post in posts) if '/video/' in link]
+
+    def scrape_video(self, video_link, username):
+        """Load and extract one video in the current window, retrying it on its own"""
+        try:
+            return self.retry_policy.call(
+                self.load_video, video_link, username, label=f"Video {video_link}", recover=self.recover_from_error
+            )
+        except Exception as e:
+            self.logger.warning(f"Error scraping video {video_link}: {e}")
+            return None
+
+    def load_video(self, video_link, username):
+        """Single attempt at scrape_video(); errors propagate to the retry policy"""
+        # Navigate to video and wait until either its description or a CAPTCHA rendered
+        self.acquire_fetch_slot()
+        self.driver.get(video_link)
+        ready_at = self.readiness.wait(
+            self.driver, "h1[data-e2e='browse-video-desc'], div[class*='captcha'], div[id*='captcha']"
+        )
+        if '/login' in self.driver.current_url:
+            raise LoggedOutError(f"Redirected to {self.driver.current_url}")
+        
+        # CAPTCHA Handling for individual video
+        if self.driver.find_elements(By.XPATH, CAPTCHA_XPATH):
             try:
-                posts = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, '//div[@class=" css-13fa1gi-DivWrapper e1cg0wnj1"]/a'))
-                )
-                
-                for post in posts:
-                    link = post.get_attribute('href')
-                    if '/video/' in link:
-                        post_links.append(link)
-            except Exception as e:
-                self.logger.warning(f"Error finding post links for {username}: {e}")
-                return []
+                # Wait up to 3 minutes for CAPTCHA to be solved
+                self.wait_for_captcha(CAPTCHA_XPATH, 180, f"video {video_link}")
+                # Wait for page to stabilize
+                ready_at = self.readiness.wait(self.driver, "h1[data-e2e='browse-video-desc']")
+            except TimeoutException:
+                pass
 
-            posts_data = []
-            for video_link in post_links[:5]:  # Limit to first 5 posts
-                try:
-                    # Navigate to video
-                    self.driver.get(video_link)
-                    
-                    # CAPTCHA Handling for individual video
-                    try:
-                        # Check for CAPTCHA within 10 seconds
-                        video_captcha = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'captcha') or contains(@id, 'captcha')]"))
-                        )
-                        
-                        self.logger.warning(f"CAPTCHA detected for video {video_link}! Please solve the CAPTCHA manually.")
-                        
-                        # Wait up to 3 minutes for CAPTCHA to be solved
-                        WebDriverWait(self.driver, 180).until(
-                            lambda driver: len(driver.find_elements(By.XPATH, "//div[contains(@class, 'captcha') or contains(@id, 'captcha')]")) == 0
-                        )
-                        
-                        # Additional wait for page to stabilize
-                        time.sleep(random.uniform(2, 5))
-                    except TimeoutException:
-                        # No CAPTCHA or CAPTCHA solved quickly
-                        pass
+        time.sleep(PageReadiness.remaining_delay(ready_at, random.uniform(1, 3)))
+
+        post_data = self.extract_video_data(video_link, username)
+        if not post_data:
+            raise MissingSelectorError("Video description did not render")
+        return post_data
 
-                    time.sleep(random.uniform(1, 3))
+    def extract_video_data(self, video_link, username):
+        """Extract a post record from the video page loaded in the current window"""
+        if self.network_capture:
+            self.collect_api_videos()
+            post_data = self.api_post_data(video_link, username)
+            if post_data:
+                if self.resource_policy:
+                    self.resource_policy.log_page(self.driver, video_link)
+                self.record_post(post_data)
+                return post_data
 
-                    # Get timestamp from video ID
-                    timestamp = self.get_timestamp_from_video_id(video_link)
+        page_metrics = self.fetch_page_metrics()
+        if self.snapshots:
+            self.snapshots.save('video', self.driver.page_source, username=username, url=video_link)
+        if self.resource_policy:
+            self.resource_policy.log_page(self.driver, video_link)
+        post_data = self.build_post_data(video_link, username, page_metrics)
+        if post_data:
+            self.cache_post(post_data)
+            self.record_post(post_data)
+        return post_data
 
-                    # Extract metrics
-                    meta_desc = self.wait_and_find_element(By.XPATH, '//meta[@name="description"]')
-                    if not meta_desc:
+    def build_post_data(self, video_link, username, page_metrics, metrics=None, timestamp=None):
+        # Get timestamp from video ID
+        timestamp = timestamp or self.get_timestamp_from_video_id(video_link)
+
+        # Without the meta description the page is not a loaded video
+        if not page_metrics.get('description'):
+            return None
+
+        # Parse the raw metric strings, unless the caller already did
+        metrics = metrics or self.normalize_page_metrics(page_metrics)
+
+        return {
+            "username": username,
+            "timestamp": timestamp,
+            "content": metrics['content'],
+            "likes": metrics['likes'],
+            "comments": metrics['comments'],
+            "shares": metrics['shares'],
+            "url": video_link
+        }
+
+    def scrape_videos_in_tabs(self, video_links, username):
+        """Load videos in background tabs of the logged-in driver and extract each as soon as it is ready"""
+        tab_config = self.config.get('parallel_tabs', {})
+        max_tabs = max(1, tab_config.get('max_tabs', 3))
+        open_delay = tab_config.get('open_delay', {'min': 0.5, 'max': 1.5})
+        load_timeout = tab_config.get('load_timeout', 30)
+
+        main_handle = self.driver.current_window_handle
+        pending = list(enumerate(video_links))
+        open_tabs = {}  # window handle -> (index, video link, time opened)
+        results = {}
+        failed = []  # (index, video link) to retry one by one in the main window
+        next_fetch_at = 0  # when the rate limiter expects the next fetch token
+
+        try:
+            while pending or open_tabs:
+                # Keep up to max_tabs pages loading at once
+                while pending and len(open_tabs) < max_tabs and time.time() >= next_fetch_at:
+                    # Out of fetch tokens: keep polling the open tabs instead of blocking on the limiter
+                    if self.rate_limiter:
+                        wait = self.rate_limiter.try_acquire(self.rate_limit_buckets())
+                        if wait > 0:
+                            next_fetch_at = time.time() + wait
+                            break
+                    index, video_link = pending.pop(0)
+                    handles_before = set(self.driver.window_handles)
+                    # Open the tab blank first: blocking is per tab and must be in place before the video loads
+                    self.driver.execute_script("window.open('about:blank', '_blank');")
+                    new_handles = set(self.driver.window_handles) - handles_before
+                    if not new_handles:
+                        self.logger.warning(f"Could not open a tab for video {video_link}")
                         continue
+                    handle = new_handles.pop()
+                    self.driver.switch_to.window(handle)
+                    if self.resource_policy:
+                        self.resource_policy.apply(self.driver, discard_log=False)
+                    if self.network_capture:
+                        self.network_capture.start(self.driver)
+                    self.driver.execute_script("window.location.href = arguments[0];", video_link)
+                    open_tabs[handle] = (index, video_link, time.time())
+                    time.sleep(random.uniform(open_delay['min'], open_delay['max']))
 
-                    description = meta_desc.get_attribute('content')
-                    metrics = self.extract_metrics_from_meta(description)
-
-                    post_data = {
-                        "username": username,
-                        "timestamp": timestamp,
-                        "content": metrics['content'],
-                        "likes": metrics['likes'],
-                        "comments": metrics['comments'],
-                        "shares": metrics['shares'],
-                        "url": video_link
-                    }
-                    posts_data.append(post_data)
+                for handle, (index, video_link, opened_at) in list(open_tabs.items()):
+                    try:
+                        self.driver.switch_to.window(handle)
+                    except Exception as e:
+                        # The tab is gone; closing the current window instead could hit the profile tab
+                        self.logger.warning(f"Lost the tab of video {video_link}: {e}")
+                        failed.append((index, video_link))
+                        del open_tabs[handle]
+                        continue
 
-                except Exception as e:
-                    self.logger.warning(f"Error scraping video {video_link}: {e}")
+                    try:
+                        ready = self.driver.execute_script(
+                            "return document.readyState === 'complete' && location.href !== 'about:blank';"
+                        )
+                        if not ready and time.time() - opened_at < load_timeout:
+                            continue
+
+                        if not ready:
+                            self.logger.warning(f"Video {video_link} did not finish loading within {load_timeout}s")
+                            failed.append((index, video_link))
+                        else:
+                            if self.driver.find_elements(By.XPATH, CAPTCHA_XPATH):
+                                self.wait_for_captcha(CAPTCHA_XPATH, 180, f"video {video_link}")
+                            post_data = self.extract_video_data(video_link, username)
+                            if post_data:
+                                results[index] = post_data
+                            else:
+                                failed.append((index, video_link))
+                    except Exception as e:
+                        self.logger.warning(f"Error scraping video {video_link}: {e}")
+                        failed.append((index, video_link))
+
+                    # Switched to this tab above, so the current window is the one to close
+                    self.close_tab()
+                    del open_tabs[handle]
+                    self.driver.switch_to.window(main_handle)
+
+                # Poll loading tabs often; with none open, sleep until the next fetch token is due
+                time.sleep(0.2 if open_tabs or not pending else max(0.2, next_fetch_at - time.time()))
+        finally:
+            for handle in open_tabs:
+                try:
+                    self.driver.switch_to.window(handle)
+                except Exception:
                     continue
+                try:
+                    self.close_tab()
+                except Exception:
+                    pass
+            self.driver.switch_to.window(main_handle)
 
-            return posts_data
+        # Only the videos that failed in a tab are loaded again
+        for index, video_link in failed:
+            post_data = self.scrape_video(video_link, username)
+            if post_data:
+                results[index] = post_data
 
-        except Exception as e:
-            self.logger.error(f"Error scraping profile {username}: {e}")
-            return []
+        return [results[index] for index in sorted(results)]
+
+    def close_tab(self):
+        """Close the current tab, dropping the API responses it received that were never read"""
+        if self.network_capture:
+            self.network_capture.discard(current_target(self.driver))
+        self.driver.close()
+
+    def scrape_snapshots(self, directory=None):
+        """Re-run video extraction over saved video pages, without a browser"""
+        directory = directory or self.config.get('snapshots', {}).get('directory', 'snapshots')
+        pages = []
+        for entry, html in SnapshotStore(directory, 'TikTok').iter_snapshots('video'):
+            try:
+                pages.append((entry, self.page_metrics_from_html(html)))
+            except Exception as e:
+                self.logger.warning(f"Error re-extracting snapshot {entry['file']}: {e}")
+
+        # Parse each counter column and decode every timestamp of the whole batch at once
+        counts = {
+            field: parse_counts([page_metrics.get(field) for _, page_metrics in pages])
+            for field in ('likes', 'comments', 'shares')
+        }
+        timestamps = timestamps_from_urls(entry['url'] for entry, _ in pages)
+
+        posts_data = []
+        for index, (entry, page_metrics) in enumerate(pages):
+            metrics = {field: int(column[index]) for field, column in counts.items()}
+            metrics['content'] = (page_metrics.get('content') or "").strip()
+            try:
+                post_data = self.build_post_data(
+                    entry['url'], entry['username'], page_metrics, metrics, timestamps[index]
+                )
+                if post_data:
+                    posts_data.append(post_data)
+                    self.record_post(post_data)
+            except Exception as e:
+                self.logger.warning(f"Error re-extracting snapshot {entry['file']}: {e}")
+        return posts_data
 
-    def run(self):
+    def run(self, from_snapshots=None, every=None, resume=False):
         try:
-            self.driver = self.setup_driver()
-            self.login()
-            
-            all_data = {"TikTok": []}
-            for username in self.config['target_profiles']:
-                time.sleep(random.uniform(2, 5))  # Random delay between profile scrapes
-                posts = self.scrape_profile(username)
-                all_data["TikTok"].extend(posts)
+            self.setup_output_sink()
+            if from_snapshots is not None:
+                self.save_output(self.scrape_snapshots(from_snapshots or None))
+                return
+
+            # Without a pool a single driver is launched and logged in for the whole run
+            if not self.setup_browser_pool():
+                self.driver = self.setup_driver()
+                self.login()
+
+            while True:
+                # Videos finished before a crash go into this job's output again,
+                # unless the sink file already held them when it was opened
+                journal = self.open_journal(resume)
+                self.failed_profiles.clear()
+                posts_data = journal.records()
+                if self.sink and not self.sink.appending:
+                    self.sink.write_many(posts_data)
+                for username in self.config['target_profiles']:
+                    if journal.is_account_done(username):
+                        self.logger.info(f"Skipping {username}, already finished by the interrupted run")
+                        continue
+                    if not self.rate_limiter:
+                        time.sleep(random.uniform(2, 5))  # Random delay between profile scrapes
+                    # Each profile is a short job on a warm driver when pooling is enabled
+                    with self.leased_driver():
+                        posts = self.scrape_profile(username)
+                    # Skipped profiles are not marked finished, so --resume retries them
+                    # if this round is interrupted; a completed round deletes the journal
+                    if username not in self.failed_profiles:
+                        journal.finish_account(username)
+                    # With a sink the records were already streamed as they were scraped
+                    if not self.sink:
+                        posts_data.extend(posts)
 
-            with open(self.config['output_file'], 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, indent=2, ensure_ascii=False)
+                self.save_output(posts_data)
+                journal.close(completed=True)
+                self.journal = None
+                resume = False
+                if not every:
+                    break
+                time.sleep(every * 60)
 
         except Exception as e:
             self.logger.error(f"Scraping failed: {e}")
         finally:
+            if self.resource_policy:
+                self.resource_policy.log_totals()
+            if self.metrics_cache:
+                stats = self.metrics_cache.stats()
+                self.logger.info(
+                    f"Metrics cache: {stats['hits']} hits ({stats['disk_hits']} from disk), {stats['misses']} misses"
+                )
+                self.metrics_cache.close()
+            if self.browser_pool:
+                self.browser_pool.close()
+            if self.sink:
+                self.sink.close()
+            if self.store:
+                self.store.close()
+            if self.rate_limiter:
+                self.rate_limiter.close()
             if self.driver:
                 self.driver.quit()
 
+    def open_journal(self, resume=False):
+        """Start the checkpoint journal of a job, replaying an interrupted one when resuming"""
+        self.journal = JobJournal(self.config.get('job_journal', 'tiktok_job.journal'), resume=resume)
+        if self.journal.resumed:
+            self.logger.info(
+                f"Resuming job: {len(self.journal.done_accounts)} profiles and "
+                f"{len(self.journal.records())} videos already done"
+            )
+        return self.journal
+
+    def save_output(self, posts_data):
+        """Write the legacy JSON output; records were already streamed when a sink is open"""
+        if self.sink:
+            return
+        with open(self.config['output_file'], 'w', encoding='utf-8') as f:
+            json.dump({"TikTok": posts_data}, f, indent=2, ensure_ascii=False)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='TikTok profile scraper')
+    parser.add_argument('--from-snapshots', nargs='?', const='', metavar='DIR',
+                        help='re-extract videos from saved snapshots instead of a live browser')
+    parser.add_argument('--every', type=float, metavar='MINUTES',
+                        help='repeat the scrape every MINUTES, keeping pooled browsers warm in between')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue the job an interrupted run left in the checkpoint journal')
+    args = parser.parse_args()
+
     scraper = AdvancedTikTokScraper()
-    scraper.run()
\ No newline at end of file
+    scraper.run(from_snapshots=args.from_snapshots, every=args.every, resume=args.resume)
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Cache of scraped video records, keyed by video ID.
+
+Re-polling the same creators mostly revisits videos scraped minutes ago.
+A video whose record is younger than the TTL is served from the cache
+instead of loading its page. The in-memory tier is a bounded LRU with
+expiry; the optional SQLite tier keeps records across runs.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+
+
+class MetricsCache:
+    """
+    Two-tier cache of video records with hit and miss counters.
+
+    Entries expire `ttl` seconds after they were scraped in both tiers, so
+    a record promoted from disk to memory does not live longer than it
+    would have on disk.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS video_metrics (
+        video_id   TEXT PRIMARY KEY,
+        record     TEXT NOT NULL,
+        scraped_at REAL NOT NULL
+    )
+    """
+
+    def __init__(self, ttl: float = 3600, max_size: int = 1000, path: Optional[str] = None):
+        """
+        Args:
+            ttl: Seconds a record stays fresh
+            max_size: Records kept in memory, least recently used evicted first
+            path: SQLite file for the on-disk tier; memory only if None
+        """
+        self.ttl = ttl
+        self._memory = TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(self.SCHEMA)
+            self._conn.commit()
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """Fresh record of a video, or None when it has to be scraped."""
+        with self._lock:
+            entry = self._memory.get(video_id)
+            if entry is None and self._conn is not None:
+                entry = self._load(video_id)
+                if entry is not None:
+                    self._memory[video_id] = entry
+                    self.disk_hits += 1
+            if entry is None or time.time() - entry[0] >= self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, video_id: str, record: Dict) -> None:
+        """Store a freshly scraped record."""
+        scraped_at = time.time()
+        with self._lock:
+            self._memory[video_id] = (scraped_at, dict(record))
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO video_metrics (video_id, record, scraped_at) VALUES (?, ?, ?)",
+                        (video_id, json.dumps(record, ensure_ascii=False), scraped_at)
+                    )
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters since the cache was created."""
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses}
+
+    def close(self) -> None:
+        """Drop expired rows from the on-disk tier and close it."""
+        if self._conn is None:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM video_metrics WHERE scraped_at < ?", (time.time() - self.ttl,))
+            self._conn.close()
+            self._conn = None
+
+    def _load(self, video_id: str):
+        row = self._conn.execute(
+            "SELECT scraped_at, record FROM video_metrics WHERE video_id = ? AND scraped_at > ?",
+            (video_id, time.time() - self.ttl)
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
@@ -0,0 +1,117 @@
+"""
+Parser backend benchmark - compares tweet extraction throughput and peak
+memory of the bs4, lxml and selectolax backends over saved timeline HTML.
+
+Usage:
+    python benchmarks/benchmark_parsers.py [--fixtures DIR] [--repeat N]
+                                           [--backends bs4 lxml selectolax]
+
+Every *.html / *.html.gz file in the fixtures directory is parsed N times.
+Each backend runs in its own subprocess so peak RSS is not shared between them.
+"""
+
+import argparse
+import gzip
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# html_parsers imports scraper_common from the repository root
+sys.path.insert(1, str(Path(__file__).resolve().parent.parent.parent))
+
+from html_parsers import PARSERS, create_parser
+
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+
+def load_fixtures(fixtures_dir: Path) -> List[str]:
+    """Read every saved timeline page in the fixtures directory."""
+    pages = []
+    for path in sorted(fixtures_dir.iterdir()):
+        if path.name.endswith('.html.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                pages.append(f.read())
+        elif path.suffix == '.html':
+            pages.append(path.read_text(encoding='utf-8'))
+    return pages
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+
+
+def run_backend(backend: str, fixtures_dir: Path, repeat: int) -> Dict:
+    """Benchmark a single backend in the current process."""
+    pages = load_fixtures(fixtures_dir)
+    parser = create_parser(backend)
+
+    tweet_count = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            tweet_count += len(parser.extract_tweets(html, 'benchmark'))
+    elapsed = time.perf_counter() - start
+
+    # Traced separately: tracemalloc overhead would skew the timing above
+    tracemalloc.start()
+    for html in pages:
+        parser.extract_tweets(html, 'benchmark')
+    _, peak_python = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "pages": len(pages) * repeat,
+        "tweets": tweet_count,
+        "seconds": round(elapsed, 4),
+        "tweets_per_second": round(tweet_count / elapsed, 1) if elapsed else 0.0,
+        "peak_python_mb": round(peak_python / (1024 * 1024), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 2),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--fixtures', type=Path, default=DEFAULT_FIXTURES)
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    arg_parser.add_argument('--backends', nargs='+', default=list(PARSERS), choices=list(PARSERS))
+    arg_parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.fixtures, args.repeat)))
+        return
+
+    print(f"{'backend':<12}{'tweets':>10}{'seconds':>10}{'tweets/s':>12}{'py peak MB':>12}{'rss peak MB':>13}")
+    for backend in args.backends:
+        proc = subprocess.run(
+            [sys.executable, __file__, '--worker', backend,
+             '--fixtures', str(args.fixtures), '--repeat', str(args.repeat)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'unknown error'
+            print(f"{backend:<12}skipped: {error}")
+            continue
+        result = json.loads(proc.stdout)
+        print(f"{result['backend']:<12}{result['tweets']:>10}{result['seconds']:>10}"
+              f"{result['tweets_per_second']:>12}{result['peak_python_mb']:>12}{result['peak_rss_mb']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+HTML parser backends for the Twitter/X tweet extractor.
+
+The extraction logic lives in TweetParser and only relies on a handful of
+node primitives, so it runs unchanged on BeautifulSoup, lxml or selectolax.
+"""
+
+import logging
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type
+
+from scraper_common.counts import parse_count
+
+
+STATUS_PATH_PATTERN = re.compile(r'(/[^/?#]+/status/\d+)')
+
+
+class TweetParser(ABC):
+    """
+    Base class for parser backends.
+
+    Subclasses provide the node primitives (article lookup, CSS selection,
+    attribute and text access); the tweet extraction on top is shared. A
+    backend missing a primitive fails when it is instantiated.
+    """
+
+    name = 'base'
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger('StealthScraper')
+
+    # region Backend Primitives
+    @abstractmethod
+    def articles(self, html: str, fragments: bool = False) -> List[Any]:
+        """
+        Parse HTML and return its tweet articles.
+
+        Args:
+            html: Full page source, or concatenated article outerHTML
+            fragments: True when html is a run of top-level article fragments
+        """
+
+    @abstractmethod
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        """Return the first descendant matching a CSS selector."""
+
+    @abstractmethod
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        """Return an attribute value of a node."""
+
+    @abstractmethod
+    def text(self, node: Any) -> str:
+        """Return the text content of a node."""
+
+    @abstractmethod
+    def parent_link(self, node: Any) -> Optional[Any]:
+        """Return the nearest enclosing <a href> of a node."""
+    # endregion
+
+    # region Extraction
+    def extract_tweets(self, html: str, handle: str, fragments: bool = False) -> List[Dict]:
+        """
+        Extract tweet records from HTML.
+
+        Args:
+            html: Page source or concatenated article fragments
+            handle: Twitter handle the tweets are attributed to
+            fragments: Whether html holds article fragments only
+
+        Returns:
+            List of dictionaries containing tweet data
+        """
+        tweets = []
+        for tweet in self.articles(html, fragments):
+            try:
+                tweet_data = {
+                    "username": handle,
+                    "timestamp": self._extract_timestamp(tweet),
+                    "content": self._extract_content(tweet),
+                    "likes": self._extract_metric(tweet, 'like'),
+                    "retweets": self._extract_metric(tweet, 'retweet'),
+                    "comments": self._extract_metric(tweet, 'reply'),
+                    "url": self._extract_permalink(tweet)
+                }
+                tweets.append(tweet_data)
+            except Exception as e:
+                self.logger.warning(f"Failed to parse tweet: {str(e)}")
+
+        return tweets
+
+    def _extract_timestamp(self, tweet_element: Any) -> Optional[str]:
+        """Extract timestamp from tweet element."""
+        time_element = self.select_one(tweet_element, 'time')
+        return self.attr(time_element, 'datetime') if time_element is not None else None
+
+    def _extract_content(self, tweet_element: Any) -> str:
+        """Extract content from tweet element."""
+        content_element = self.select_one(tweet_element, 'div[data-testid="tweetText"]')
+        return self.text(content_element) if content_element is not None else ''
+
+    def _extract_permalink(self, tweet_element: Any) -> Optional[str]:
+        """Extract the status permalink from tweet element."""
+        # The tweet's own timestamp links to it; other status links may belong to a
+        # quoted tweet or a "replying to" block, so they are only a fallback
+        time_element = self.select_one(tweet_element, 'time')
+        link_element = self.parent_link(time_element) if time_element is not None else None
+        if link_element is None or '/status/' not in (self.attr(link_element, 'href') or ''):
+            link_element = self.select_one(tweet_element, 'a[href*="/status/"]')
+        href = self.attr(link_element, 'href') if link_element is not None else None
+        match = STATUS_PATH_PATTERN.search(href or '')
+        return f"https://twitter.com{match.group(1)}" if match else None
+
+    def _extract_metric(self, tweet_element: Any, metric_type: str) -> int:
+        """Extract metric (likes, retweets, replies) from tweet element."""
+        metric_element = self.select_one(tweet_element, f'button[data-testid="{metric_type}"]')
+        if metric_element is not None and (aria_label := self.attr(metric_element, 'aria-label')):
+            # e.g. "1,234 Likes. Like" or "1.5K Reposts. Repost"
+            return parse_count(aria_label)
+        return 0
+    # endregion
+
+
+class BeautifulSoupParser(TweetParser):
+    """Pure-Python backend using BeautifulSoup with html.parser."""
+
+    name = 'bs4'
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        super().__init__(logger)
+        try:
+            from bs4 import BeautifulSoup
+        except ImportError as e:
+            raise ImportError("The 'bs4' parser requires the beautifulsoup4 package") from e
+        self._soup = BeautifulSoup
+
+    def articles(self, html: str, fragments: bool = False) -> List[Any]:
+        soup = self._soup(html, 'html.parser')
+        return soup.find_all('article', recursive=not fragments)
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return node.select_one(selector)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def text(self, node: Any) -> str:
+        return node.text
+
+    def parent_link(self, node: Any) -> Optional[Any]:
+        return node.find_parent('a', href=True)
+
+
+class LxmlParser(TweetParser):
+    """libxml2 backend; CSS selectors are compiled once to XPath via cssselect."""
+
+    name = 'lxml'
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        super().__init__(logger)
+        try:
+            import lxml.html
+            from lxml.cssselect import CSSSelector
+        except ImportError as e:
+            raise ImportError("The 'lxml' parser requires the lxml and cssselect packages") from e
+        self._html = lxml.html
+        self._css_selector = CSSSelector
+        self._selectors: Dict[str, Any] = {}
+
+    def articles(self, html: str, fragments: bool = False) -> List[Any]:
+        if not html.strip():
+            return []
+        if fragments:
+            return [node for node in self._html.fragments_fromstring(html)
+                    if getattr(node, 'tag', None) == 'article']
+        return list(self._html.fromstring(html).iter('article'))
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        if selector not in self._selectors:
+            self._selectors[selector] = self._css_selector(selector)
+        matches = self._selectors[selector](node)
+        return matches[0] if matches else None
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def text(self, node: Any) -> str:
+        return node.text_content()
+
+    def parent_link(self, node: Any) -> Optional[Any]:
+        return next((parent for parent in node.iterancestors('a') if parent.get('href')), None)
+
+
+class SelectolaxParser(TweetParser):
+    """Lexbor-based backend from selectolax."""
+
+    name = 'selectolax'
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        super().__init__(logger)
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as e:
+            raise ImportError("The 'selectolax' parser requires the selectolax package") from e
+        self._parser = LexborHTMLParser
+
+    def articles(self, html: str, fragments: bool = False) -> List[Any]:
+        tree = self._parser(html)
+        return tree.css('body > article' if fragments else 'article')
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return node.css_first(selector)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+    def text(self, node: Any) -> str:
+        return node.text(deep=True)
+
+    def parent_link(self, node: Any) -> Optional[Any]:
+        parent = node.parent
+        while parent is not None and not (parent.tag == 'a' and parent.attributes.get('href')):
+            parent = parent.parent
+        return parent
+
+
+PARSERS: Dict[str, Type[TweetParser]] = {
+    BeautifulSoupParser.name: BeautifulSoupParser,
+    LxmlParser.name: LxmlParser,
+    SelectolaxParser.name: SelectolaxParser,
+}
+
+
+def create_parser(name: str = 'bs4', logger: Optional[logging.Logger] = None) -> TweetParser:
+    """
+    Instantiate a parser backend by name.
+
+    Args:
+        name: One of 'bs4', 'lxml' or 'selectolax'
+        logger: Logger used for per-tweet parse warnings
+    """
+    try:
+        return PARSERS[name](logger)
+    except KeyError:
+        raise ValueError(f"Unknown parser '{name}', expected one of {sorted(PARSERS)}")
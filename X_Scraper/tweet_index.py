@@ -0,0 +1,43 @@
+"""
+Per-profile deduplication of tweet records.
+
+Kept free of browser imports so the merge rules can be tested on their own.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Set
+
+
+def tweet_key(tweet: Dict) -> str:
+    """Build a stable identity for a tweet, preferring its status ID."""
+    if tweet.get('url') and (match := re.search(r'/status/(\d+)', tweet['url'])):
+        return match.group(1)
+    content_hash = hashlib.sha1(tweet['content'].encode('utf-8')).hexdigest()
+    return f"{tweet['timestamp']}:{content_hash}"
+
+
+def merge_tweets(tweets: Dict[str, Dict], new_tweets: List[Dict], exact_keys: Set[str], exact: bool = False) -> None:
+    """
+    Merge freshly extracted tweets into the deduplication index.
+
+    A tweet seen again on a later scroll only refreshes its metrics, so the
+    index holds exactly one record per tweet. Metrics taken from the page are
+    rounded ("1.2K"), so they never overwrite the exact counts of a record
+    built from an API response.
+
+    Args:
+        tweets: Index of tweet records by tweet_key(), updated in place
+        new_tweets: Records from one extraction pass
+        exact_keys: Keys whose metrics came from the API, updated in place
+        exact: Whether new_tweets carry exact API counts
+    """
+    for tweet in new_tweets:
+        key = tweet_key(tweet)
+        if key not in tweets:
+            tweets[key] = tweet
+        elif exact or key not in exact_keys:
+            for metric in ('likes', 'retweets', 'comments'):
+                tweets[key][metric] = tweet[metric]
+        if exact:
+            exact_keys.add(key)
@@ -1,470 +1,988 @@
-"""
-Twitter Scraper - A stealth web scraping tool for Twitter/X
-Uses advanced anti-detection measures and human-like behavior patterns.
-Version: 1.0
-"""
-
-import atexit
-import json
-import logging
-import psutil
-import random
-import re
-import signal
-import sys
-import time
-from datetime import datetime
-from typing import Dict, List, Optional
-
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-import undetected_chromedriver as uc
-
-
-class TwitterScraper:
-    """
-    A sophisticated Twitter scraper that mimics human behavior and bypasses detection.
-    
-    Features:
-    - Stealth browsing using undetected_chromedriver
-    - Human-like scrolling and typing patterns
-    - Advanced anti-detection measures
-    - Automatic cleanup of browser processes
-    """
-
-    def __init__(self, config_path: str = 'config.json'):
-        """
-        Initialize the scraper with configuration settings.
-        
-        Args:
-            config_path: Path to the configuration JSON file
-        """
-        self.config = self._load_config(config_path)
-        self._setup_logging()
-        self.driver: Optional[uc.Chrome] = None
-        self.session_cookies: Optional[List[Dict]] = None
-        self.last_action_time: float = time.time()
-        self.action_count: int = 0
-        self._chrome_pid: Optional[int] = None
-        atexit.register(self.force_cleanup)
-
-    # region Configuration and Setup
-    def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from JSON file."""
-        with open(config_path, 'r') as f:
-            return json.load(f)
-
-    def _setup_logging(self) -> None:
-        """Configure logging based on settings in config file."""
-        logging.basicConfig(
-            level=getattr(logging, self.config['logging']['level']),
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            filename=self.config['logging']['logFilePath'] if self.config['logging']['logToFile'] else None
-        )
-        self.logger = logging.getLogger('StealthScraper')
-
-    def _create_stealth_driver(self) -> uc.Chrome:
-        """Create an undetectable Chrome instance with anti-detection measures."""
-        options = self._configure_chrome_options()
-        
-        try:
-            # Modify undetected_chromedriver's cleanup behavior
-            uc.Chrome.__del__ = lambda self: self.quit() if hasattr(self, 'quit') else None
-            
-            driver = uc.Chrome(options=options)
-            self._chrome_pid = driver.service.process.pid
-            self._inject_stealth_js(driver)
-            return driver
-        except Exception as e:
-            self.logger.error(f"Failed to create driver: {str(e)}")
-            raise
-
-    def _configure_chrome_options(self) -> uc.ChromeOptions:
-        """Configure Chrome options for stealth operation."""
-        options = uc.ChromeOptions()
-        
-        # Anti-detection arguments
-        stealth_args = [
-            '--disable-blink-features=AutomationControlled',
-            '--disable-dev-shm-usage',
-            '--disable-infobars',
-            '--disable-browser-side-navigation',
-            '--disable-gpu',
-            '--no-sandbox',
-            '--no-first-run',
-            '--disable-background-networking',
-            '--disable-background-timer-throttling',
-            '--disable-backgrounding-occluded-windows',
-            '--disable-breakpad',
-            '--disable-component-extensions-with-background-pages',
-            '--disable-extensions',
-            '--disable-features=TranslateUI',
-            '--disable-ipc-flooding-protection',
-            '--disable-renderer-backgrounding',
-        ]
-        
-        for arg in stealth_args:
-            options.add_argument(arg)
-
-        # Random window size
-        width = random.randint(1050, 1200)
-        height = random.randint(800, 1000)
-        options.add_argument(f'--window-size={width},{height}')
-        
-        # Random user agent
-        ua = UserAgent()
-        options.add_argument(f'user-agent={ua.chrome}')
-        
-        return options
-    # endregion
-
-    # region Anti-Detection Methods
-    def _inject_stealth_js(self, driver: uc.Chrome) -> None:
-        """Inject JavaScript to mask automation indicators."""
-        stealth_js = """
-        // Mask webdriver property
-        Object.defineProperty(navigator, 'webdriver', {
-            get: () => undefined
-        });
-        
-        // Handle permissions
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => (
-            parameters.name === 'notifications' ?
-            Promise.resolve({state: Notification.permission}) :
-            originalQuery(parameters)
-        );
-        
-        // Randomize canvas fingerprint
-        const originalGetContext = HTMLCanvasElement.prototype.getContext;
-        HTMLCanvasElement.prototype.getContext = function(type) {
-            const context = originalGetContext.apply(this, arguments);
-            if (type === '2d') {
-                const originalFillText = context.fillText;
-                context.fillText = function() {
-                    arguments[0] = arguments[0] + ' ';
-                    return originalFillText.apply(this, arguments);
-                }
-            }
-            return context;
-        };
-        
-        // Add fake plugins
-        Object.defineProperty(navigator, 'plugins', {
-            get: () => [
-                { name: 'Chrome PDF Plugin', suffixes: 'pdf', description: 'Portable Document Format' },
-                { name: 'Chrome PDF Viewer', suffixes: 'pdf', description: '' },
-                { name: 'Native Client', suffixes: '', description: '' }
-            ]
-        });
-        """
-        driver.execute_script(stealth_js)
-
-    def _human_like_delay(self) -> None:
-        """Implement human-like delays between actions."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_action_time
-        
-        base_delay = random.uniform(3, 5) if self.action_count > 10 else random.uniform(1, 2)
-        delay = base_delay * (1 + random.uniform(-0.2, 0.2))
-        
-        if time_since_last < 0.5:
-            delay += random.uniform(1, 2)
-            
-        time.sleep(delay)
-        self.last_action_time = time.time()
-        self.action_count = 0 if self.action_count > 10 else self.action_count + 1
-
-    def _natural_scroll(self, scroll_distance: int) -> None:
-        """Perform natural-looking scroll with variable speed."""
-        start_pos = self.driver.execute_script("return window.pageYOffset;")
-        current_pos = start_pos
-        target_pos = start_pos + scroll_distance
-        
-        def easeInOutQuad(t: float) -> float:
-            return t * t if t < 0.5 else -1 + (4 - 2 * t) * t
-        
-        steps = random.randint(20, 30)
-        for i in range(steps + 1):
-            t = i / steps
-            next_pos = start_pos + (scroll_distance * easeInOutQuad(t))
-            self.driver.execute_script(f"window.scrollTo(0, {next_pos});")
-            time.sleep(random.uniform(0.01, 0.03))
-
-    def _simulate_human_typing(self, element: webdriver.remote.webelement.WebElement, text: str) -> None:
-        """Simulate human-like typing patterns."""
-        for char in text:
-            element.send_keys(char)
-            time.sleep(random.uniform(0.1, 0.3))
-            if random.random() < 0.1:
-                time.sleep(random.uniform(0.3, 0.7))
-    # endregion
-
-    # region Core Functionality
-    def login(self) -> None:
-        """Perform login with human-like behavior."""
-        try:
-            credentials = self.config["credentials"]["X"]
-            if not self.driver:
-                self.driver = self._create_stealth_driver()
-
-            self.driver.get('https://twitter.com/login')
-            self._human_like_delay()
-
-            # Handle username
-            username_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "text"))
-            )
-            self._simulate_human_typing(username_input, credentials["username"])
-            self._click_next_button()
-
-            # Handle email verification if needed
-            try:
-                self._handle_email_verification(credentials["e_mail"])
-            except TimeoutException:
-                self.logger.info("Email verification not required")
-
-            # Handle password
-            self._handle_password_entry(credentials["password"])
-            
-            self.session_cookies = self.driver.get_cookies()
-            self.logger.info("Successfully logged in")
-
-        except Exception as e:
-            self.logger.error(f"Login failed: {str(e)}")
-            raise
-
-    def scrape_profile(self, handle: str) -> List[Dict]:
-        """
-        Scrape tweets from a profile with natural behavior.
-        
-        Args:
-            handle: Twitter handle to scrape
-            
-        Returns:
-            List of dictionaries containing tweet data
-        """
-        tweets = []
-        try:
-            self.driver.get(f'https://twitter.com/{handle}')
-            self._human_like_delay()
-            
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            scroll_attempts = 0
-            
-            while len(tweets) < self.config['scrapeSettings'].get('maxTweetsPerProfile', 20):
-                self._natural_scroll(random.randint(300, 500))
-                
-                new_tweets = self._extract_tweets_from_page(handle)
-                tweets.extend(tweet for tweet in new_tweets if tweet not in tweets)
-                
-                if not self._should_continue_scrolling(last_height, scroll_attempts):
-                    break
-                    
-                self._human_like_delay()
-            
-            return tweets
-            
-        except Exception as e:
-            self.logger.error(f"Failed to scrape profile {handle}: {str(e)}")
-            return []
-
-    def save_results(self, results: List[Dict]) -> None:
-        """Save scraped data to JSON file."""
-        output = {"X": results}
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"twitter_scrape_{timestamp}.json"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
-            
-        self.logger.info(f"Results saved to {filename}")
-    # endregion
-
-    # region Helper Methods
-    def _click_next_button(self) -> None:
-        """Click the 'Next' button with natural mouse movement."""
-        next_button = self.driver.find_element(By.XPATH, "//span[text()='Next']")
-        ActionChains(self.driver)\
-            .move_to_element(next_button)\
-            .pause(random.uniform(0.1, 0.3))\
-            .click()\
-            .perform()
-        self._human_like_delay()
-
-    def _handle_email_verification(self, email: str) -> None:
-        """Handle email verification step if present."""
-        mail_input = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.NAME, "text"))
-        )
-        self._simulate_human_typing(mail_input, email)
-        self._click_next_button()
-
-    def _handle_password_entry(self, password: str) -> None:
-        """Handle password entry step."""
-        password_input = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.NAME, "password"))
-        )
-        self._simulate_human_typing(password_input, password)
-        
-        login_button = self.driver.find_element(By.XPATH, "//span[text()='Log in']")
-        ActionChains(self.driver)\
-            .move_to_element(login_button)\
-            .pause(random.uniform(0.2, 0.4))\
-            .click()\
-            .perform()
-
-    def _extract_tweets_from_page(self, handle: str) -> List[Dict]:
-        """Extract tweets from the current page."""
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        tweets = []
-        
-        for tweet in soup.find_all('article'):
-            try:
-                tweet_data = {
-                    "username": handle,
-                    "timestamp": self._extract_timestamp(tweet),
-                    "content": self._extract_content(tweet),
-                    "likes": self._extract_metric(tweet, 'like'),
-                    "retweets": self._extract_metric(tweet, 'retweet'),
-                    "comments": self._extract_metric(tweet, 'reply')
-                }
-                tweets.append(tweet_data)
-            except Exception as e:
-                self.logger.warning(f"Failed to parse tweet: {str(e)}")
-        
-        return tweets
-
-    def _should_continue_scrolling(self, last_height: int, scroll_attempts: int) -> bool:
-        """Determine if scrolling should continue."""
-        new_height = self.driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            scroll_attempts += 1
-            return scroll_attempts < 3
-        return True
-
-    def _extract_timestamp(self, tweet_element: BeautifulSoup) -> Optional[str]:
-        """Extract timestamp from tweet element."""
-        time_element = tweet_element.find('time')
-        return time_element['datetime'] if time_element and 'datetime' in time_element.attrs else None
-
-    def _extract_content(self, tweet_element: BeautifulSoup) -> str:
-        """Extract content from tweet element."""
-        content_element = tweet_element.find('div', {'data-testid': 'tweetText'})
-        return content_element.text if content_element else ''
-
-    def _extract_metric(self, tweet_element: BeautifulSoup, metric_type: str) -> int:
-        """Extract metric (likes, retweets, replies) from tweet element."""
-        metric_element = tweet_element.find('button', {'data-testid': metric_type})
-        if metric_element and (aria_label := metric_element.get('aria-label')):
-            try:
-                return int(re.search(r'\d+', aria_label).group())
-            except (ValueError, AttributeError):
-                return 0
-        return 0
-    # endregion
-
-# region Cleanup Methods
-    def _kill_process_tree(self, pid: int) -> None:
-        """Kill a process and all its children."""
-        try:
-            parent = psutil.Process(pid)
-            for child in parent.children(recursive=True):
-                try:
-                    child.kill()
-                except psutil.NoSuchProcess:
-                    pass
-            
-            try:
-                parent.kill()
-            except psutil.NoSuchProcess:
-                pass
-            
-        except psutil.NoSuchProcess:
-            pass
-
-    def force_cleanup(self) -> None:
-        """Force cleanup of all related processes."""
-        try:
-            # Regular cleanup attempt
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except Exception:
-                    self.logger.warning("Failed to quit driver gracefully")
-                
-            # Kill Chrome process tree
-            if self._chrome_pid:
-                self._kill_process_tree(self._chrome_pid)
-            
-            # Clean up remaining automation-related chrome processes
-            self._cleanup_remaining_processes()
-                    
-        except Exception as e:
-            self.logger.error(f"Error during force cleanup: {str(e)}")
-        finally:
-            self.driver = None
-            self._chrome_pid = None
-
-    def _cleanup_remaining_processes(self) -> None:
-        """Clean up any remaining chrome processes related to automation."""
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                if 'chrome' in proc.info['name'].lower():
-                    cmdline = proc.cmdline()
-                    if any('--disable-blink-features=AutomationControlled' in arg for arg in cmdline):
-                        self._kill_process_tree(proc.pid)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-
-    def cleanup(self) -> None:
-        """Clean up resources."""
-        self.force_cleanup()
-
-    def create_signal_handler(self):
-        """Create a signal handler for graceful shutdown."""
-        def signal_handler(signum, frame):
-            if self:
-                self.cleanup()
-            sys.exit(1)
-        return signal_handler
-    # endregion
-
-
-def main():
-    """Main execution function."""
-    scraper = None
-    try:
-        # Initialize scraper
-        scraper = TwitterScraper()
-        
-        # Set up signal handler
-        signal_handler = scraper.create_signal_handler()
-        signal.signal(signal.SIGINT, signal_handler)
-        
-        # Login and scrape
-        scraper.login()
-        
-        all_tweets = []
-        for handle in scraper.config['socialMediaPlatforms']['X']['accounts']:
-            tweets = scraper.scrape_profile(handle)
-            all_tweets.extend(tweets)
-            time.sleep(random.uniform(30, 60))  # Pause between profiles
-        
-        scraper.save_results(all_tweets)
-        
-    except Exception as e:
-        logging.error(f"Scraping failed: {str(e)}")
-    finally:
-        if scraper:
-            scraper.cleanup()
-
-
-if __name__ == "__main__":
+"""
+Twitter Scraper - A stealth web scraping tool for Twitter/X
+Uses advanced anti-detection measures and human-like behavior patterns.
+Version: 1.0
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import psutil
+import random
+import signal
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from fake_useragent import UserAgent
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+import undetected_chromedriver as uc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_parsers import create_parser
+from tweet_index import merge_tweets, tweet_key
+from scraper_common.browser_pool import BrowserPool
+from scraper_common.job_journal import JobJournal
+from scraper_common.network_capture import NetworkCapture, drain_performance_log, enable_performance_log, find_objects
+from scraper_common.post_store import PostStore
+from scraper_common.rate_limiter import RateLimiter
+from scraper_common.retry import LOGGED_OUT, LoggedOutError, RetryPolicy
+from scraper_common.readiness import PageReadiness
+from scraper_common.resource_policy import ResourcePolicy
+from scraper_common.scroll_progress import STOP_CHECKPOINT, ScrollProgress
+from scraper_common.session_store import SessionStore
+from scraper_common.sinks import ColumnarSink, JsonlSink, create_sink
+from scraper_common.snapshots import SnapshotStore
+
+
+class TwitterScraper:
+    """
+    A sophisticated Twitter scraper that mimics human behavior and bypasses detection.
+    
+    Features:
+    - Stealth browsing using undetected_chromedriver
+    - Human-like scrolling and typing patterns
+    - Advanced anti-detection measures
+    - Automatic cleanup of browser processes
+    """
+
+    def __init__(self, config_path: str = 'config.json'):
+        """
+        Initialize the scraper with configuration settings.
+        
+        Args:
+            config_path: Path to the configuration JSON file
+        """
+        self.config = self._load_config(config_path)
+        self._setup_logging()
+        self.parser = create_parser(self.config['scrapeSettings'].get('parser', 'bs4'), self.logger)
+        self.snapshots = self._create_snapshot_store()
+        self.sink: Optional[Union[JsonlSink, ColumnarSink]] = None
+        self.store = self._create_post_store()
+        self.session_store = self._create_session_store()
+        self.resource_policy = self._create_resource_policy()
+        self.network_capture = self._create_network_capture()
+        self.readiness = self._create_readiness()
+        self.rate_limiter = self._create_rate_limiter()
+        self.retry_policy = self._create_retry_policy()
+        self.failed_profiles: Set[str] = set()
+        # Why scrolling stopped, per profile handle
+        self.scroll_stop_reasons: Dict[str, str] = {}
+        self.browser_pool: Optional[BrowserPool] = None
+        self.driver: Optional[uc.Chrome] = None
+        self.session_cookies: Optional[List[Dict]] = None
+        self.last_action_time: float = time.time()
+        self.action_count: int = 0
+        # Chromedriver process of every driver launched, keyed by id(driver); pooled
+        # drivers are warmed up on background threads, so one attribute would lose them
+        self._chrome_processes: Dict[int, psutil.Process] = {}
+        atexit.register(self.force_cleanup)
+
+    # region Configuration and Setup
+    def _load_config(self, config_path: str) -> Dict:
+        """Load configuration from JSON file."""
+        with open(config_path, 'r') as f:
+            return json.load(f)
+
+    def _setup_logging(self) -> None:
+        """Configure logging based on settings in config file."""
+        logging.basicConfig(
+            level=getattr(logging, self.config['logging']['level']),
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            filename=self.config['logging']['logFilePath'] if self.config['logging']['logToFile'] else None
+        )
+        self.logger = logging.getLogger('StealthScraper')
+
+    def _create_snapshot_store(self) -> Optional[SnapshotStore]:
+        """Create the page snapshot store if snapshots are enabled in config."""
+        snapshot_config = self.config.get('snapshots', {})
+        if not snapshot_config.get('enabled', False):
+            return None
+        return SnapshotStore(snapshot_config.get('directory', 'snapshots'), 'X')
+
+    def _create_post_store(self) -> Optional[PostStore]:
+        """Open the shared SQLite post store if enabled in config."""
+        database_config = self.config.get('database', {})
+        if not database_config.get('enabled', False):
+            return None
+        return PostStore(database_config.get('path', 'scraped_posts.db'))
+
+    def _create_session_store(self) -> Optional[SessionStore]:
+        """Open the encrypted session store if session reuse is enabled in config."""
+        session_config = self.config.get('session', {})
+        if not session_config.get('enabled', False):
+            return None
+        return SessionStore(
+            session_config.get('path', 'x_session.bin'),
+            key_file=session_config.get('keyFile', '.session.key'),
+            max_age_hours=session_config.get('maxAgeHours')
+        )
+
+    def _create_resource_policy(self) -> Optional[ResourcePolicy]:
+        """Build the resource blocking policy if enabled in config."""
+        blocking_config = self.config.get('resourceBlocking', {})
+        if not blocking_config.get('enabled', False):
+            return None
+        return ResourcePolicy(
+            block=blocking_config.get('block', ['image', 'media', 'font']),
+            block_trackers=blocking_config.get('blockTrackers', True),
+            extra_patterns=blocking_config.get('extraPatterns', []),
+            logger=self.logger
+        )
+
+    def _create_network_capture(self) -> Optional[NetworkCapture]:
+        """Capture the timeline GraphQL responses if scrapeSettings.networkCapture is set."""
+        if not self.config['scrapeSettings'].get('networkCapture', False):
+            return None
+        return NetworkCapture(r'/i/api/graphql/[^/]+/(UserTweets|UserTweetsAndReplies)\b', self.logger)
+
+    def _create_readiness(self) -> PageReadiness:
+        """Build the page readiness waiter from scrapeSettings.readiness."""
+        readiness_config = self.config['scrapeSettings'].get('readiness', {})
+        return PageReadiness(
+            quiet_ms=readiness_config.get('quietMs', 500),
+            timeout=readiness_config.get('timeout', 15),
+            logger=self.logger
+        )
+
+    def _create_rate_limiter(self) -> Optional[RateLimiter]:
+        """Build the global, platform and account token buckets from config rateLimits."""
+        limits_config = self.config.get('rateLimits', {})
+        if not limits_config.get('enabled', False):
+            return None
+        limits = {}
+        for scope, name in zip(('global', 'platform', 'account'), self._rate_limit_buckets()):
+            if scope in limits_config:
+                limits[name] = (limits_config[scope]['perHour'], limits_config[scope].get('burst', 1))
+        return RateLimiter(limits, path=limits_config.get('path'))
+
+    def _rate_limit_buckets(self) -> List[str]:
+        """Names of the buckets a page fetch draws from."""
+        account = self.config['credentials']['X']['username']
+        return ['global', 'platform:X', f'account:X:{account}']
+
+    def _acquire_fetch_slot(self) -> None:
+        """Wait for a token of every rate limit bucket before fetching a page."""
+        if not self.rate_limiter:
+            return
+        waited = self.rate_limiter.acquire(self._rate_limit_buckets())
+        if waited > 0.5:
+            self.logger.debug(f"Rate limit: waited {waited:.1f}s for a fetch slot")
+
+    def _create_retry_policy(self) -> RetryPolicy:
+        """Build the per-profile retry policy from config errorHandling."""
+        error_config = self.config.get('errorHandling', {})
+        return RetryPolicy(
+            max_retries=error_config.get('maxRetries', 3),
+            retry_delay=error_config.get('retryDelay', 5),
+            exponential_backoff=error_config.get('exponentialBackoff', True),
+            logger=self.logger
+        )
+
+    def _recover_from_error(self, kind: str) -> None:
+        """Log the current driver back in before retrying after the session expired."""
+        if kind == LOGGED_OUT:
+            self.login()
+
+    def create_browser_pool(self) -> Optional[BrowserPool]:
+        """
+        Start a pool of warm, logged-in drivers if enabled in config.
+
+        The first driver goes through login() and saves the session, every
+        other pooled driver is authenticated by restoring that session.
+        """
+        pool_config = self.config.get('browserPool', {})
+        if not pool_config.get('enabled', False):
+            return None
+        if not self.session_store:
+            self.logger.warning("Browser pool requires session persistence, running without it")
+            return None
+
+        self.login()
+        self.browser_pool = BrowserPool(
+            self._create_stealth_driver,
+            prepare_driver=self._prepare_pooled_driver,
+            size=pool_config.get('size', 2),
+            max_uses=pool_config.get('maxUses', 20),
+            max_memory_mb=pool_config.get('maxMemoryMb'),
+            logger=self.logger
+        )
+        self.browser_pool.add(self.driver)
+        self.driver = None
+        self.browser_pool.start()
+        return self.browser_pool
+
+    def _prepare_pooled_driver(self, driver: uc.Chrome) -> None:
+        """Authenticate a fresh pooled driver from the saved session."""
+        if not self.session_store.restore(driver, 'https://twitter.com/'):
+            raise RuntimeError("No saved session to restore")
+        if not self._is_logged_in(driver=driver):
+            raise RuntimeError("Saved session was rejected")
+        # Runs on a warm-up thread while other drivers may be mid-page: drop only this
+        # driver's session-restore traffic, without resetting the shared page stats
+        self._configure_network(driver, discard_log=False)
+        if self.resource_policy or self.network_capture:
+            drain_performance_log(driver)
+
+    @contextmanager
+    def leased_driver(self) -> Iterator[uc.Chrome]:
+        """Run the enclosed block on a pooled driver, or on the scraper's own driver without a pool."""
+        if not self.browser_pool:
+            yield self.driver
+            return
+        with self.browser_pool.lease() as driver:
+            self.driver = driver
+            try:
+                yield driver
+            finally:
+                self.driver = None
+
+    def _mark_driver_failed(self) -> None:
+        """Have the pool replace the leased driver once the failed job returns it."""
+        if self.browser_pool and self.driver:
+            self.browser_pool.mark_failed(self.driver)
+
+    def _create_stealth_driver(self) -> uc.Chrome:
+        """Create an undetectable Chrome instance with anti-detection measures."""
+        options = self._configure_chrome_options()
+        
+        try:
+            # Modify undetected_chromedriver's cleanup behavior
+            uc.Chrome.__del__ = lambda self: self.quit() if hasattr(self, 'quit') else None
+            
+            driver = uc.Chrome(options=options)
+            self._chrome_processes[id(driver)] = psutil.Process(driver.service.process.pid)
+            self._inject_stealth_js(driver)
+            self.readiness.install(driver)
+            return driver
+        except Exception as e:
+            self.logger.error(f"Failed to create driver: {str(e)}")
+            raise
+
+    def _configure_chrome_options(self) -> uc.ChromeOptions:
+        """Configure Chrome options for stealth operation."""
+        options = uc.ChromeOptions()
+        
+        # Anti-detection arguments
+        stealth_args = [
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--disable-infobars',
+            '--disable-browser-side-navigation',
+            '--disable-gpu',
+            '--no-sandbox',
+            '--no-first-run',
+            '--disable-background-networking',
+            '--disable-background-timer-throttling',
+            '--disable-backgrounding-occluded-windows',
+            '--disable-breakpad',
+            '--disable-component-extensions-with-background-pages',
+            '--disable-extensions',
+            '--disable-features=TranslateUI',
+            '--disable-ipc-flooding-protection',
+            '--disable-renderer-backgrounding',
+        ]
+        
+        for arg in stealth_args:
+            options.add_argument(arg)
+
+        # Random window size
+        width = random.randint(1050, 1200)
+        height = random.randint(800, 1000)
+        options.add_argument(f'--window-size={width},{height}')
+        
+        # Random user agent
+        ua = UserAgent()
+        options.add_argument(f'user-agent={ua.chrome}')
+        
+        if self.resource_policy or self.network_capture:
+            enable_performance_log(options)
+        
+        return options
+    # endregion
+
+    # region Anti-Detection Methods
+    def _inject_stealth_js(self, driver: uc.Chrome) -> None:
+        """Inject JavaScript to mask automation indicators."""
+        stealth_js = """
+        // Mask webdriver property
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined
+        });
+        
+        // Handle permissions
+        const originalQuery = window.navigator.permissions.query;
+        window.navigator.permissions.query = (parameters) => (
+            parameters.name === 'notifications' ?
+            Promise.resolve({state: Notification.permission}) :
+            originalQuery(parameters)
+        );
+        
+        // Randomize canvas fingerprint
+        const originalGetContext = HTMLCanvasElement.prototype.getContext;
+        HTMLCanvasElement.prototype.getContext = function(type) {
+            const context = originalGetContext.apply(this, arguments);
+            if (type === '2d') {
+                const originalFillText = context.fillText;
+                context.fillText = function() {
+                    arguments[0] = arguments[0] + ' ';
+                    return originalFillText.apply(this, arguments);
+                }
+            }
+            return context;
+        };
+        
+        // Add fake plugins
+        Object.defineProperty(navigator, 'plugins', {
+            get: () => [
+                { name: 'Chrome PDF Plugin', suffixes: 'pdf', description: 'Portable Document Format' },
+                { name: 'Chrome PDF Viewer', suffixes: 'pdf', description: '' },
+                { name: 'Native Client', suffixes: '', description: '' }
+            ]
+        });
+        """
+        driver.execute_script(stealth_js)
+
+    def _human_like_delay(self, ready_at: Optional[float] = None) -> None:
+        """
+        Implement human-like delays between actions.
+        
+        Args:
+            ready_at: When the page became ready, from PageReadiness.wait();
+                time already spent since then counts towards the delay
+        """
+        current_time = time.time()
+        time_since_last = current_time - self.last_action_time
+        
+        base_delay = random.uniform(3, 5) if self.action_count > 10 else random.uniform(1, 2)
+        delay = base_delay * (1 + random.uniform(-0.2, 0.2))
+        
+        if time_since_last < 0.5:
+            delay += random.uniform(1, 2)
+        if ready_at is not None:
+            delay = PageReadiness.remaining_delay(ready_at, delay)
+            
+        time.sleep(delay)
+        self.last_action_time = time.time()
+        self.action_count = 0 if self.action_count > 10 else self.action_count + 1
+
+    def _natural_scroll(self, scroll_distance: int) -> None:
+        """Perform natural-looking scroll with variable speed."""
+        start_pos = self.driver.execute_script("return window.pageYOffset;")
+        current_pos = start_pos
+        target_pos = start_pos + scroll_distance
+        
+        def easeInOutQuad(t: float) -> float:
+            return t * t if t < 0.5 else -1 + (4 - 2 * t) * t
+        
+        steps = random.randint(20, 30)
+        for i in range(steps + 1):
+            t = i / steps
+            next_pos = start_pos + (scroll_distance * easeInOutQuad(t))
+            self.driver.execute_script(f"window.scrollTo(0, {next_pos});")
+            time.sleep(random.uniform(0.01, 0.03))
+
+    def _simulate_human_typing(self, element: webdriver.remote.webelement.WebElement, text: str) -> None:
+        """Simulate human-like typing patterns."""
+        for char in text:
+            element.send_keys(char)
+            time.sleep(random.uniform(0.1, 0.3))
+            if random.random() < 0.1:
+                time.sleep(random.uniform(0.3, 0.7))
+    # endregion
+
+    # region Core Functionality
+    def login(self) -> None:
+        """Perform login with human-like behavior."""
+        try:
+            credentials = self.config["credentials"]["X"]
+            if not self.driver:
+                self.driver = self._create_stealth_driver()
+
+            if self._restore_session():
+                self.session_cookies = self.driver.get_cookies()
+                self.logger.info("Restored saved session")
+                self._configure_network()
+                return
+
+            self.driver.get('https://twitter.com/login')
+            self._human_like_delay(self.readiness.wait(self.driver, 'input[name="text"]'))
+
+            # Handle username
+            username_input = WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.NAME, "text"))
+            )
+            self._simulate_human_typing(username_input, credentials["username"])
+            self._click_next_button()
+
+            # Handle email verification if needed
+            try:
+                self._handle_email_verification(credentials["e_mail"])
+            except TimeoutException:
+                self.logger.info("Email verification not required")
+
+            # Handle password
+            self._handle_password_entry(credentials["password"])
+            
+            self.session_cookies = self.driver.get_cookies()
+            self.logger.info("Successfully logged in")
+            self._save_session()
+            self._configure_network()
+
+        except Exception as e:
+            self.logger.error(f"Login failed: {str(e)}")
+            raise
+
+    def _restore_session(self) -> bool:
+        """Restore saved cookies and localStorage, returning whether the session is still valid."""
+        if not self.session_store:
+            return False
+        try:
+            if not self.session_store.restore(self.driver, 'https://twitter.com/'):
+                return False
+            if self._is_logged_in():
+                return True
+            self.logger.info("Saved session rejected, logging in with credentials")
+            self.session_store.clear()
+        except Exception as e:
+            self.logger.warning(f"Failed to restore session: {str(e)}")
+        return False
+
+    def _is_logged_in(self, timeout: int = 5, driver: Optional[uc.Chrome] = None) -> bool:
+        """Cheap validity probe: the home timeline loads without a login redirect."""
+        driver = driver or self.driver
+        driver.get('https://twitter.com/home')
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'a[data-testid="AppTabBar_Home_Link"]'))
+            )
+        except TimeoutException:
+            return False
+        return 'login' not in driver.current_url
+
+    def _configure_network(self, driver: Optional[uc.Chrome] = None, discard_log: bool = True) -> None:
+        """Start resource blocking and network capture; only after login so challenges still render."""
+        driver = driver or self.driver
+        if self.resource_policy:
+            self.resource_policy.apply(driver, discard_log=discard_log)
+        if self.network_capture:
+            self.network_capture.start(driver)
+
+    def _save_session(self) -> None:
+        """Persist the session once X has issued its auth cookie."""
+        if not self.session_store:
+            return
+        try:
+            WebDriverWait(self.driver, 15).until(lambda driver: driver.get_cookie('auth_token'))
+            self.session_store.save(self.driver)
+            self.session_cookies = self.driver.get_cookies()
+        except TimeoutException:
+            self.logger.warning("No auth cookie after login, session not saved")
+        except Exception as e:
+            self.logger.warning(f"Failed to save session: {str(e)}")
+
+    def scrape_profile(self, handle: str, checkpoint: Optional[Tuple[str, str]] = None) -> List[Dict]:
+        """
+        Scrape tweets from a profile with natural behavior.
+        
+        In incremental crawl mode scrolling stops as soon as a scroll step
+        surfaces only tweets at or before the checkpoint, and those tweets
+        are left out of the results.
+        
+        Timeouts, missing content and expired sessions are retried on the
+        same driver according to errorHandling. A profile that still fails
+        is skipped when skipFailedProfiles is set, otherwise the error is
+        raised.
+        
+        Args:
+            handle: Twitter handle to scrape
+            checkpoint: (timestamp, status ID) of the newest tweet already
+                persisted; loaded from the post store when omitted
+            
+        Returns:
+            List of dictionaries containing tweet data
+        """
+        if checkpoint is None:
+            checkpoint = self._load_checkpoint(handle)
+        try:
+            return self.retry_policy.call(
+                self._scrape_profile_once, handle, checkpoint,
+                label=f"Profile @{handle}", recover=self._recover_from_error
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to scrape profile {handle}: {str(e)}")
+            self._mark_driver_failed()
+            if not self.config.get('errorHandling', {}).get('skipFailedProfiles', True):
+                raise
+            self.failed_profiles.add(handle)
+            return []
+
+    def _scrape_profile_once(self, handle: str, checkpoint: Optional[Tuple[str, str]]) -> List[Dict]:
+        """Single attempt at scrape_profile(); errors propagate to the retry policy."""
+        tweets: Dict[str, Dict] = {}
+        exact_keys: Set[str] = set()
+        self._acquire_fetch_slot()
+        self.driver.get(f'https://twitter.com/{handle}')
+        ready_at = self.readiness.wait(self.driver, 'article time')
+        if 'login' in self.driver.current_url:
+            raise LoggedOutError(f"Redirected to {self.driver.current_url}")
+        self._human_like_delay(ready_at)
+        
+        scroll_timeout = self.config['scrapeSettings'].get('readiness', {}).get('scrollTimeout', 5)
+        progress = self._create_scroll_progress(self.driver.execute_script("return document.body.scrollHeight"))
+        
+        while True:
+            self._natural_scroll(random.randint(300, 500))
+            # Let the batch the scroll triggered finish rendering before reading it
+            ready_at = self.readiness.wait(self.driver, timeout=scroll_timeout)
+            
+            new_tweets, exact = self._extract_tweets_from_page(handle)
+            if checkpoint:
+                fresh_tweets = [tweet for tweet in new_tweets if self._is_after_checkpoint(tweet, checkpoint)]
+                if new_tweets and not fresh_tweets:
+                    self.logger.info(f"Reached checkpoint {checkpoint[1] or checkpoint[0]} for {handle}")
+                    progress.stop(STOP_CHECKPOINT)
+                    break
+                new_tweets = fresh_tweets
+            merge_tweets(tweets, new_tweets, exact_keys, exact)
+            
+            if not self._should_continue_scrolling(progress, len(tweets)):
+                break
+                
+            self._human_like_delay(ready_at)
+        
+        self.scroll_stop_reasons[handle] = progress.stop_reason
+        self.logger.info(
+            f"Stopped scrolling @{handle} after {progress.steps} steps and {progress.elapsed:.0f}s: "
+            f"{progress.stop_reason} ({len(tweets)} tweets)"
+        )
+        if self.store:
+            self.store.upsert_posts('X', tweets.values(), key=tweet_key)
+        if self.resource_policy:
+            self.resource_policy.log_page(self.driver, f"@{handle}")
+        return list(tweets.values())
+
+    def scrape_snapshots(self, directory: Optional[str] = None) -> List[Dict]:
+        """
+        Re-run tweet extraction over saved timeline snapshots, without a browser.
+        
+        Args:
+            directory: Snapshot root, defaults to the configured directory
+            
+        Returns:
+            List of dictionaries containing tweet data, deduplicated per handle
+        """
+        directory = directory or self.config.get('snapshots', {}).get('directory', 'snapshots')
+        tweets_by_handle: Dict[str, Dict[str, Dict]] = {}
+        
+        for entry, html in SnapshotStore(directory, 'X').iter_snapshots('timeline'):
+            handle = entry['handle']
+            new_tweets = self.parser.extract_tweets(html, handle, fragments=entry.get('fragments', False))
+            merge_tweets(tweets_by_handle.setdefault(handle, {}), new_tweets, set())
+        
+        results = [tweet for tweets in tweets_by_handle.values() for tweet in tweets.values()]
+        if self.store:
+            self.store.upsert_posts('X', results, key=tweet_key)
+        return results
+
+    def open_output_sink(self) -> Optional[Union[JsonlSink, ColumnarSink]]:
+        """Open a streaming sink when output.format is 'jsonl', 'parquet' or 'arrow'."""
+        output_config = self.config.get('output', {})
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.sink = create_sink(
+            output_config.get('format', 'json'),
+            f"twitter_scrape_{timestamp}",
+            batch_size=output_config.get('batchSize', 50),
+            max_bytes=output_config.get('rotateMaxBytes') or None,
+            compression=output_config.get('compressionEnabled', True)
+        )
+        if self.sink:
+            self.logger.info(f"Streaming results to {self.sink.path}")
+        return self.sink
+
+    def open_journal(self, resume: bool = False) -> JobJournal:
+        """
+        Start the checkpoint journal of a job.
+        
+        Args:
+            resume: Continue the job a crashed run left in the journal
+            
+        Returns:
+            The journal, with the progress of the earlier run when resuming
+        """
+        path = self.config.get('jobJournal', {}).get('path', 'twitter_job.journal')
+        journal = JobJournal(path, resume=resume)
+        if journal.resumed:
+            self.logger.info(
+                f"Resuming job: {len(journal.done_accounts)} profiles and "
+                f"{len(journal.records())} tweets already done"
+            )
+        return journal
+
+    def save_results(self, results: List[Dict]) -> None:
+        """Save scraped data to JSON file."""
+        output = {"X": results}
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"twitter_scrape_{timestamp}.json"
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+            
+        self.logger.info(f"Results saved to {filename}")
+    # endregion
+
+    # region Helper Methods
+    def _click_next_button(self) -> None:
+        """Click the 'Next' button with natural mouse movement."""
+        next_button = self.driver.find_element(By.XPATH, "//span[text()='Next']")
+        ActionChains(self.driver)\
+            .move_to_element(next_button)\
+            .pause(random.uniform(0.1, 0.3))\
+            .click()\
+            .perform()
+        self._human_like_delay()
+
+    def _handle_email_verification(self, email: str) -> None:
+        """Handle email verification step if present."""
+        mail_input = WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.NAME, "text"))
+        )
+        self._simulate_human_typing(mail_input, email)
+        self._click_next_button()
+
+    def _handle_password_entry(self, password: str) -> None:
+        """Handle password entry step."""
+        password_input = WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.NAME, "password"))
+        )
+        self._simulate_human_typing(password_input, password)
+        
+        login_button = self.driver.find_element(By.XPATH, "//span[text()='Log in']")
+        ActionChains(self.driver)\
+            .move_to_element(login_button)\
+            .pause(random.uniform(0.2, 0.4))\
+            .click()\
+            .perform()
+
+    def _extract_tweets_from_page(self, handle: str) -> Tuple[List[Dict], bool]:
+        """
+        Extract tweets from the current page.
+        
+        In incremental mode only the articles rendered since the previous
+        call are parsed, so the cost per scroll stays flat however deep
+        into the timeline we are.
+        
+        Returns:
+            The tweets, and whether their metrics are exact API counts
+        """
+        if self.network_capture:
+            api_tweets = self._capture_api_tweets(handle)
+            if api_tweets:
+                # The API already covered these articles: keep a later DOM
+                # fallback from parsing them again
+                self._fetch_unseen_articles(collect=False)
+                return api_tweets, True
+        
+        fragments = self.config['scrapeSettings'].get('incrementalExtraction', True)
+        if fragments:
+            html = ''.join(self._fetch_unseen_articles())
+        else:
+            html = self.driver.page_source
+        
+        if self.snapshots and html:
+            self.snapshots.save('timeline', html, handle=handle, fragments=fragments)
+        return self.parser.extract_tweets(html, handle, fragments=fragments), False
+
+    def _capture_api_tweets(self, handle: str) -> List[Dict]:
+        """Map the timeline responses received since the last call into tweet records."""
+        messages = drain_performance_log(self.driver)
+        if self.resource_policy:
+            self.resource_policy.observe(messages)
+        
+        tweets = []
+        for url, payload in self.network_capture.collect(self.driver, messages):
+            tweets.extend(self._tweets_from_api(payload, handle))
+        return tweets
+
+    def _tweets_from_api(self, payload: Dict, handle: str) -> List[Dict]:
+        """
+        Build tweet records from a UserTweets GraphQL payload.
+        
+        Counts come straight from the API, so they are exact instead of
+        the rounded figures rendered on the page. Retweeted and quoted
+        tweets by other accounts are nested in the payload and skipped.
+        """
+        tweets = []
+        for result in find_objects(payload, ('rest_id', 'legacy')):
+            legacy = result['legacy']
+            if 'full_text' not in legacy:
+                # User objects share the rest_id/legacy shape
+                continue
+            
+            user = result.get('core', {}).get('user_results', {}).get('result', {})
+            screen_name = user.get('legacy', {}).get('screen_name') or user.get('core', {}).get('screen_name')
+            if (screen_name or '').lower() != handle.lower():
+                continue
+            
+            # Long posts carry their untruncated text separately
+            note = result.get('note_tweet', {}).get('note_tweet_results', {}).get('result', {})
+            created_at = datetime.strptime(legacy['created_at'], '%a %b %d %H:%M:%S %z %Y')
+            tweets.append({
+                "username": handle,
+                "timestamp": created_at.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                "content": note.get('text') or legacy['full_text'],
+                "likes": legacy.get('favorite_count', 0),
+                "retweets": legacy.get('retweet_count', 0),
+                "comments": legacy.get('reply_count', 0),
+                "url": f"https://twitter.com/{screen_name}/status/{result['rest_id']}"
+            })
+        return tweets
+
+    def _fetch_unseen_articles(self, collect: bool = True) -> List[str]:
+        """
+        Return the outerHTML of rendered articles not returned by a previous call.
+        
+        Args:
+            collect: When False, only mark the articles as seen and return nothing
+        """
+        unseen_js = """
+        const seen = window.__scrapedArticles = window.__scrapedArticles || new WeakSet();
+        const fresh = [];
+        document.querySelectorAll('article').forEach(article => {
+            // Skip placeholders that have not finished rendering yet
+            if (seen.has(article) || !article.querySelector('time')) {
+                return;
+            }
+            seen.add(article);
+            if (arguments[0]) {
+                fresh.push(article.outerHTML);
+            }
+        });
+        return fresh;
+        """
+        return self.driver.execute_script(unseen_js, collect) or []
+
+    def _load_checkpoint(self, handle: str) -> Optional[Tuple[str, str]]:
+        """Load the newest persisted tweet for a handle when incremental crawling is on."""
+        if not self.store or not self.config['scrapeSettings'].get('incrementalCrawl', False):
+            return None
+        return self.store.high_water_mark('X', handle)
+
+    def _is_after_checkpoint(self, tweet: Dict, checkpoint: Tuple[str, str]) -> bool:
+        """
+        Whether a tweet is newer than the checkpoint.
+        
+        Status IDs are time-ordered, so they are compared first; the
+        timestamp is the fallback for tweets without a permalink.
+        """
+        checkpoint_timestamp, checkpoint_id = checkpoint
+        key = tweet_key(tweet)
+        if key.isdigit() and checkpoint_id and checkpoint_id.isdigit():
+            return int(key) > int(checkpoint_id)
+        if tweet['timestamp'] and checkpoint_timestamp:
+            return tweet['timestamp'] > checkpoint_timestamp
+        # Undated tweets cannot be placed, keep them rather than stop early
+        return True
+
+    def _create_scroll_progress(self, initial_height: int) -> ScrollProgress:
+        """Build the scroll tracker of one profile from config scrapeSettings.scrollLimits."""
+        settings = self.config['scrapeSettings']
+        limits = settings.get('scrollLimits', {})
+        return ScrollProgress(
+            settings.get('maxTweetsPerProfile', 20),
+            initial_height=initial_height,
+            max_stalled_steps=limits.get('maxStalledSteps', 3),
+            max_idle_steps=limits.get('maxIdleSteps', 6),
+            time_budget=limits.get('timeBudget')
+        )
+
+    def _should_continue_scrolling(self, progress: ScrollProgress, tweet_count: int) -> bool:
+        """
+        Determine if scrolling should continue.
+        
+        Args:
+            progress: Tracker of the profile being scrolled
+            tweet_count: Unique tweets collected so far
+            
+        Returns:
+            False once the target is reached, the timeline stalled or the
+            time budget is spent; progress.stop_reason says which
+        """
+        new_height = self.driver.execute_script("return document.body.scrollHeight")
+        return progress.update(new_height, tweet_count)
+
+    # endregion
+
+# region Cleanup Methods
+    def _kill_process_tree(self, pid: int) -> None:
+        """Kill a process and all its children."""
+        try:
+            parent = psutil.Process(pid)
+            for child in parent.children(recursive=True):
+                try:
+                    child.kill()
+                except psutil.NoSuchProcess:
+                    pass
+            
+            try:
+                parent.kill()
+            except psutil.NoSuchProcess:
+                pass
+            
+        except psutil.NoSuchProcess:
+            pass
+
+    def force_cleanup(self) -> None:
+        """Force cleanup of all related processes."""
+        try:
+            # Regular cleanup attempt
+            if self.driver:
+                try:
+                    self.driver.quit()
+                except Exception:
+                    self.logger.warning("Failed to quit driver gracefully")
+                
+            # Kill the Chrome process tree of every driver still running; is_running()
+            # also guards against PIDs reused after a pooled driver was recycled
+            for process in list(self._chrome_processes.values()):
+                if process.is_running():
+                    self._kill_process_tree(process.pid)
+            
+            # Clean up remaining automation-related chrome processes
+            self._cleanup_remaining_processes()
+                    
+        except Exception as e:
+            self.logger.error(f"Error during force cleanup: {str(e)}")
+        finally:
+            self.driver = None
+            self._chrome_processes.clear()
+
+    def _cleanup_remaining_processes(self) -> None:
+        """Clean up any remaining chrome processes related to automation."""
+        for proc in psutil.process_iter(['pid', 'name']):
+            try:
+                if 'chrome' in proc.info['name'].lower():
+                    cmdline = proc.cmdline()
+                    if any('--disable-blink-features=AutomationControlled' in arg for arg in cmdline):
+                        self._kill_process_tree(proc.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+
+    def cleanup(self) -> None:
+        """Clean up resources."""
+        if self.resource_policy:
+            self.resource_policy.log_totals()
+        if self.browser_pool:
+            self.browser_pool.close()
+        if self.sink:
+            self.sink.close()
+        if self.store:
+            self.store.close()
+        if self.rate_limiter:
+            self.rate_limiter.close()
+        self.force_cleanup()
+
+    def create_signal_handler(self):
+        """Create a signal handler for graceful shutdown."""
+        def signal_handler(signum, frame):
+            if self:
+                self.cleanup()
+            sys.exit(1)
+        return signal_handler
+    # endregion
+
+
+def main():
+    """Main execution function."""
+    arg_parser = argparse.ArgumentParser(description='Twitter/X profile scraper')
+    arg_parser.add_argument('--from-snapshots', nargs='?', const='', metavar='DIR',
+                            help='re-extract tweets from saved snapshots instead of a live browser')
+    arg_parser.add_argument('--every', type=float, metavar='MINUTES',
+                            help='repeat the scrape every MINUTES, keeping pooled browsers warm in between')
+    arg_parser.add_argument('--resume', action='store_true',
+                            help='continue the job an interrupted run left in the checkpoint journal')
+    args = arg_parser.parse_args()
+    
+    scraper = None
+    try:
+        # Initialize scraper
+        scraper = TwitterScraper()
+        
+        sink = scraper.open_output_sink()
+        
+        if args.from_snapshots is not None:
+            tweets = scraper.scrape_snapshots(args.from_snapshots or None)
+            if sink:
+                sink.write_many(tweets)
+            else:
+                scraper.save_results(tweets)
+            return
+        
+        # Set up signal handler
+        signal_handler = scraper.create_signal_handler()
+        signal.signal(signal.SIGINT, signal_handler)
+        
+        # Login once, or warm up the browser pool which logs in its drivers
+        if not scraper.create_browser_pool():
+            scraper.login()
+        
+        resume = args.resume
+        while True:
+            # Tweets of profiles finished before a crash go into this job's output again,
+            # unless the sink file already held them when it was opened
+            journal = scraper.open_journal(resume)
+            scraper.failed_profiles.clear()
+            all_tweets = []
+            if not sink:
+                all_tweets.extend(journal.records())
+            elif not sink.appending:
+                sink.write_many(journal.records())
+            
+            for handle in scraper.config['socialMediaPlatforms']['X']['accounts']:
+                if journal.is_account_done(handle):
+                    logging.info(f"Skipping @{handle}, already finished by the interrupted run")
+                    continue
+                # Each profile is a short job on a warm driver when pooling is enabled
+                with scraper.leased_driver():
+                    tweets = scraper.scrape_profile(handle)
+                for tweet in tweets:
+                    journal.record_post(handle, tweet_key(tweet), tweet)
+                # Skipped profiles are not marked finished, so --resume retries them
+                # if this round is interrupted; a completed round deletes the journal
+                if handle not in scraper.failed_profiles:
+                    journal.finish_account(handle)
+                # Stream each finished profile instead of holding the whole run in memory
+                if sink:
+                    sink.write_many(tweets)
+                else:
+                    all_tweets.extend(tweets)
+                if not scraper.rate_limiter:
+                    time.sleep(random.uniform(30, 60))  # Pause between profiles
+            
+            if not sink:
+                scraper.save_results(all_tweets)
+            journal.close(completed=True)
+            resume = False
+            if not args.every:
+                break
+            time.sleep(args.every * 60)
+        
+    except Exception as e:
+        logging.error(f"Scraping failed: {str(e)}")
+    finally:
+        if scraper:
+            scraper.cleanup()
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
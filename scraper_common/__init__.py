@@ -0,0 +1,6 @@
+"""
+Shared building blocks for the X, Instagram and TikTok scrapers.
+
+Each scraper is run as a standalone script from its own directory and puts
+the repository root on sys.path before importing from this package.
+"""
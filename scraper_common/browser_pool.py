@@ -0,0 +1,222 @@
+"""
+Pool of warm, pre-authenticated Selenium drivers.
+
+Starting Chrome and logging in is the largest fixed cost of a job. The
+pool pays it up front, keeps the drivers alive between jobs and hands them
+out through a lease/return API, replacing drivers that fail a health
+check, have served too many leases or use too much memory.
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Set
+
+
+class BrowserPoolError(Exception):
+    """Raised when no healthy driver can be leased in time."""
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of logged-in drivers.
+
+    Drivers are created by `create_driver` and authenticated by
+    `prepare_driver` before they are ever leased. Replacements for
+    recycled drivers are warmed up on a background thread so returning a
+    driver never blocks on a cold start. Warm-ups run one at a time:
+    undetected_chromedriver patches its binary on launch, and a burst of
+    simultaneous logins is exactly what the sites flag.
+    """
+
+    def __init__(self, create_driver: Callable[[], object],
+                 prepare_driver: Optional[Callable[[object], None]] = None,
+                 size: int = 2, max_uses: int = 20, max_memory_mb: Optional[float] = None,
+                 health_check: Optional[Callable[[object], bool]] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            create_driver: Launches a new browser
+            prepare_driver: Logs a fresh driver in; may raise on failure
+            size: Number of drivers kept warm
+            max_uses: Recycle a driver after this many leases
+            max_memory_mb: Recycle a driver whose browser process tree
+                uses more resident memory than this
+            health_check: Extra check run before each lease
+            logger: Logger for pool events
+        """
+        if max_memory_mb:
+            try:
+                import psutil
+            except ImportError as e:
+                raise ImportError("Memory-based driver recycling requires the psutil package") from e
+            self._psutil = psutil
+
+        self.create_driver = create_driver
+        self.prepare_driver = prepare_driver
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.health_check = health_check
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._idle: queue.Queue = queue.Queue()
+        self._uses: Dict[int, int] = {}
+        self._failed: Set[int] = set()
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self._closed = False
+
+    def add(self, driver: object) -> None:
+        """
+        Hand an already logged-in driver to the pool.
+
+        Used to seed the pool with the driver that went through the
+        interactive credential login, so `prepare_driver` only ever has to
+        restore the session that login saved.
+        """
+        self._idle.put(driver)
+
+    def start(self) -> None:
+        """Launch and log in drivers until the pool is full."""
+        for _ in range(max(0, self.size - self._idle.qsize())):
+            self._add_fresh_driver()
+        self.logger.info(f"Browser pool ready with {self._idle.qsize()}/{self.size} warm drivers")
+
+    def acquire(self, timeout: float = 300) -> object:
+        """
+        Lease a healthy driver, waiting for one to become free.
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            A logged-in driver that must be handed back with release()
+        """
+        while True:
+            try:
+                driver = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise BrowserPoolError(f"No healthy driver available within {timeout}s")
+            if self._is_healthy(driver):
+                return driver
+            self.logger.warning("Pooled driver failed its health check, replacing it")
+            self._replace(driver)
+
+    def mark_failed(self, driver: object) -> None:
+        """
+        Flag a leased driver so it is replaced rather than reused when released.
+
+        For jobs that catch and log their own errors, so no exception
+        reaches lease() to mark the driver unhealthy.
+        """
+        with self._lock:
+            self._failed.add(id(driver))
+
+    def release(self, driver: object, healthy: bool = True) -> None:
+        """
+        Return a leased driver.
+
+        Args:
+            driver: Driver obtained from acquire()
+            healthy: False when the job saw the driver misbehave
+        """
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            uses = self._uses[id(driver)]
+            if id(driver) in self._failed:
+                self._failed.discard(id(driver))
+                healthy = False
+
+        if self._closed:
+            self._quit(driver)
+        elif not healthy:
+            self._replace(driver)
+        elif self.max_uses and uses >= self.max_uses:
+            self.logger.info(f"Recycling driver after {uses} uses")
+            self._replace(driver)
+        elif self.max_memory_mb and (memory := self._memory_mb(driver)) > self.max_memory_mb:
+            self.logger.info(f"Recycling driver using {memory:.0f} MB")
+            self._replace(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout: float = 300) -> Iterator[object]:
+        """Context manager around acquire()/release(); errors and mark_failed() mark the driver unhealthy."""
+        driver = self.acquire(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.release(driver, healthy)
+
+    def close(self) -> None:
+        """Quit every idle driver; drivers still leased are quit on release."""
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _add_fresh_driver(self) -> None:
+        driver = None
+        try:
+            with self._warm_lock:
+                driver = self.create_driver()
+                if self.prepare_driver:
+                    self.prepare_driver(driver)
+        except Exception as e:
+            self.logger.error(f"Failed to warm up pooled driver: {str(e)}")
+            if driver is not None:
+                self._quit(driver)
+            return
+
+        if self._closed:
+            self._quit(driver)
+        else:
+            self._idle.put(driver)
+
+    def _replace(self, driver: object) -> None:
+        self._quit(driver)
+        if not self._closed:
+            threading.Thread(target=self._add_fresh_driver, daemon=True).start()
+
+    def _quit(self, driver: object) -> None:
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._failed.discard(id(driver))
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _is_healthy(self, driver: object) -> bool:
+        try:
+            # Any round trip fails fast if the browser or its window is gone
+            driver.current_url
+            return self.health_check(driver) if self.health_check else True
+        except Exception:
+            return False
+
+    def _memory_mb(self, driver: object) -> float:
+        """Resident memory of the chromedriver process and every browser process below it."""
+        psutil = self._psutil
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except (AttributeError, psutil.NoSuchProcess):
+            return 0.0
+
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return total / (1024 * 1024)
@@ -0,0 +1,156 @@
+"""
+Parsing of the abbreviated counts the platforms display.
+
+Likes, comments and views come as "2,345", "1.5K", "3M", "1,2 Mio." or
+"12 345" depending on size and locale. parse_count() reads one of them,
+count_before() finds the count labelled by a word such as "likes" in a
+longer text, and parse_counts() converts a whole column at once for bulk
+re-extraction.
+"""
+
+import functools
+import re
+from typing import Iterable, Optional
+
+
+SUFFIX_MULTIPLIERS = {
+    '': 1,
+    'k': 1_000,
+    'tsd': 1_000,
+    'm': 1_000_000,
+    'mio': 1_000_000,
+    'b': 1_000_000_000,
+    'mrd': 1_000_000_000,
+}
+SUFFIX = r'(mio|mrd|tsd|[kmb])\.?'
+
+# Digits with grouping or decimal separators between them, then an optional
+# suffix. Spaces, no-break spaces and apostrophes only ever group thousands;
+# a plain space only counts when three digits follow, so "1,234, 56" stays
+# two numbers.
+NUMBER = r"\d+(?:[.,'\u00a0\u202f]\d+|\s\d{3}(?!\d))*"
+COUNT_PATTERN = re.compile(rf"({NUMBER})\s*(?:{SUFFIX}(?![a-z]))?", re.IGNORECASE)
+
+_GROUPING_PATTERN = re.compile(r"['\s\u00a0\u202f]")
+_THOUSANDS_GROUP_PATTERN = re.compile(r'^\d{1,3}(?:[.,]\d{3})+$')
+
+
+def _to_number(digits: str, decimal: Optional[str] = None) -> float:
+    """
+    Turn a run of digits and separators into a number.
+
+    Without an explicit decimal separator it is inferred: with both ',' and
+    '.' present the last one is decimal; a single kind is grouping when it
+    repeats or splits off exactly three digits, as in "1,234" or "1.234".
+    """
+    digits = _GROUPING_PATTERN.sub('', digits)
+    if decimal is None:
+        if ',' in digits and '.' in digits:
+            decimal = '.' if digits.rfind('.') > digits.rfind(',') else ','
+        elif _THOUSANDS_GROUP_PATTERN.match(digits):
+            decimal = ''
+        else:
+            decimal = ',' if ',' in digits else '.'
+    if not decimal:
+        return float(digits.replace(',', '').replace('.', ''))
+    grouping = ',' if decimal == '.' else '.'
+    return float(digits.replace(grouping, '').replace(decimal, '.'))
+
+
+def _parse_groups(digits: str, suffix: Optional[str], decimal: Optional[str]) -> int:
+    """Count from the number and suffix groups of a match."""
+    if suffix and decimal is None and re.fullmatch(r'\d+[.,]\d+', digits):
+        # "1,5K" or "1.234K": a single separator before a suffix is decimal
+        decimal = ',' if ',' in digits else '.'
+    # round() rather than int(): 2.3 * 1e6 is 2299999.9999999995
+    return int(round(_to_number(digits, decimal) * SUFFIX_MULTIPLIERS[(suffix or '').lower()]))
+
+
+def parse_count(text: Optional[str], default: int = 0, decimal: Optional[str] = None) -> int:
+    """
+    Parse the first count in text.
+
+    A single separator before a suffix is always decimal, so "1,5K" is
+    1500, while "1,500" without a suffix is read as grouped thousands.
+
+    Args:
+        text: e.g. "1.5K", "2,345", "3M likes" or "1,2 M"
+        default: Returned when text holds no count
+        decimal: Force the decimal separator ('.' or ','), for a known locale
+
+    Returns:
+        The count as an integer
+    """
+    if not text:
+        return default
+    match = COUNT_PATTERN.search(text)
+    if not match:
+        return default
+    try:
+        return _parse_groups(*match.groups(), decimal)
+    except ValueError:
+        return default
+
+
+@functools.lru_cache(maxsize=None)
+def _labelled_pattern(label: str) -> re.Pattern:
+    return re.compile(rf"({NUMBER})\s*(?:{SUFFIX})?\s*{label}", re.IGNORECASE)
+
+
+def count_before(text: Optional[str], label: str, decimal: Optional[str] = None) -> Optional[int]:
+    """
+    Find the count directly followed by label, e.g. "1.5K" in "1.5K likes, 20 comments".
+
+    Args:
+        text: Text to search
+        label: Regex for the word after the count; compiled once per label
+        decimal: Force the decimal separator, see parse_count()
+
+    Returns:
+        The count, or None when label does not follow a count in text
+    """
+    if not text:
+        return None
+    match = _labelled_pattern(label).search(text)
+    if not match:
+        return None
+    try:
+        return _parse_groups(*match.groups(), decimal)
+    except ValueError:
+        return None
+
+
+def parse_counts(values: Iterable[Optional[str]], default: int = 0, decimal: Optional[str] = None):
+    """
+    Parse a column of count strings in one go.
+
+    Plain digit strings, the bulk of any column, are converted by NumPy in
+    a single cast, and every other distinct string is parsed only once no
+    matter how often it repeats.
+
+    Args:
+        values: Count strings; None and unparseable entries become default
+        default: Value for entries without a count
+        decimal: Force the decimal separator, see parse_count()
+
+    Returns:
+        numpy.ndarray of int64, aligned with values
+    """
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("Batch count parsing requires the numpy package") from e
+
+    column = np.array([value.strip() if value else '' for value in values], dtype=str)
+    if not column.size:
+        return np.zeros(0, dtype=np.int64)
+
+    unique, inverse = np.unique(column, return_inverse=True)
+    counts = np.full(unique.shape, default, dtype=np.int64)
+    plain = np.char.isdecimal(unique) & (np.char.str_len(unique) < 19)
+    counts[plain] = unique[plain].astype(np.int64)
+    for index in np.flatnonzero(~plain):
+        count = parse_count(str(unique[index]), default, decimal)
+        # Anything beyond int64 is garbage, not a count
+        counts[index] = count if count < 2 ** 63 else default
+    return counts[inverse.reshape(-1)]
@@ -0,0 +1,114 @@
+"""
+Append-only checkpoint journal for long multi-account jobs.
+
+Every finished post and every finished account is appended to a JSON Lines
+file and flushed right away. After a crash the job is started again with
+--resume: the journal replays which accounts and posts are already done,
+together with the records scraped for them, so only the work that was in
+flight is lost.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+class JobJournal:
+    """
+    Progress of one job, replayed from and appended to a journal file.
+
+    A truncated last line, as left by a crash mid-write, is ignored.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Args:
+            path: Journal file
+            resume: Continue the job recorded in path; otherwise any old
+                journal is discarded and a new job starts
+        """
+        self.path = path
+        self.done_accounts = set()
+        self.done_posts = set()
+        self._records: Dict[str, Dict] = {}  # post key -> record, so each post is output once
+        self._lock = threading.Lock()
+
+        partial_line = False
+        if resume and os.path.exists(path):
+            partial_line = self._replay()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if partial_line:
+            # Terminate the line a crash cut off so the next entry starts cleanly
+            self._file.write('\n')
+
+    @property
+    def resumed(self) -> bool:
+        """Whether earlier progress was replayed."""
+        return bool(self.done_accounts or self.done_posts)
+
+    def is_account_done(self, account: str) -> bool:
+        return account in self.done_accounts
+
+    def is_post_done(self, post_key: str) -> bool:
+        return post_key in self.done_posts
+
+    def records(self) -> List[Dict]:
+        """Records of every post finished by this job, one per post, in completion order."""
+        return list(self._records.values())
+
+    def record_post(self, account: str, post_key: str, record: Optional[Dict]) -> None:
+        """
+        Mark a post as finished, keeping its scraped record for the job output.
+
+        Args:
+            account: Account the post belongs to
+            post_key: Stable identity of the post, e.g. its URL or ID
+            record: The scraped record, if any
+        """
+        with self._lock:
+            self.done_posts.add(post_key)
+            if record is not None:
+                self._records[post_key] = record
+            self._append({'event': 'post', 'account': account, 'post': post_key, 'record': record})
+
+    def finish_account(self, account: str) -> None:
+        """Mark an account as finished; it is skipped entirely on resume."""
+        with self._lock:
+            self.done_accounts.add(account)
+            self._append({'event': 'account', 'account': account})
+
+    def close(self, completed: bool = False) -> None:
+        """
+        Close the journal file.
+
+        Args:
+            completed: The job finished, so the journal is deleted and the
+                next run starts fresh
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+        if completed:
+            os.remove(self.path)
+
+    def _append(self, entry: Dict) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def _replay(self) -> bool:
+        """Load earlier progress; returns whether the file ends in a partial line."""
+        line = '\n'
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('event') == 'account':
+                    self.done_accounts.add(entry['account'])
+                elif entry.get('event') == 'post':
+                    self.done_posts.add(entry['post'])
+                    if entry.get('record') is not None:
+                        self._records[entry['post']] = entry['record']
+        return not line.endswith('\n')
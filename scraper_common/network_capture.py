@@ -0,0 +1,169 @@
+"""
+Capture of the JSON API responses a page fetches while it loads.
+
+The platforms' own frontends request structured JSON with exact counters,
+while the rendered DOM only shows rounded "1.5K" strings. Chrome's
+performance log tells us which responses arrived, and the DevTools
+`Network.getResponseBody` command returns their bodies, so the scrapers can
+map those payloads into their records instead of parsing markup.
+"""
+
+import base64
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Keep response bodies around long enough to be read after the page loads
+NETWORK_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+def enable_performance_log(options) -> None:
+    """Ask chromedriver to record DevTools network events for a driver about to be created."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def drain_performance_log(driver) -> List[Dict]:
+    """
+    Read and clear the driver's performance log.
+
+    The log is shared by every tab of the driver, so each message is
+    tagged with the tab (DevTools target) that produced it.
+
+    Returns:
+        The DevTools event messages ({'method', 'params', 'target'})
+        recorded since the previous call
+    """
+    messages = []
+    for entry in driver.get_log('performance'):
+        try:
+            event = json.loads(entry['message'])
+            message = event['message']
+        except (KeyError, ValueError):
+            continue
+        message['target'] = event.get('webview')
+        messages.append(message)
+    return messages
+
+
+def current_target(driver) -> str:
+    """DevTools target ID of the tab the driver is switched to, as used in performance log messages."""
+    handle = driver.current_window_handle
+    return handle[len('CDwindow-'):] if handle.startswith('CDwindow-') else handle
+
+
+def find_objects(payload: Any, keys: Iterable[str]) -> Iterator[Dict]:
+    """
+    Yield every dict nested anywhere in payload that has all of keys.
+
+    The platforms wrap the same objects in differently shaped envelopes per
+    endpoint and version, so looking for the object itself is sturdier
+    than following a fixed path.
+    """
+    keys = tuple(keys)
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if all(key in node for key in keys):
+                yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+class NetworkCapture:
+    """
+    Collects the JSON bodies of responses whose URL matches a pattern.
+
+    Responses are tracked from `Network.responseReceived` until their
+    `Network.loadingFinished` event, then read with getResponseBody.
+    getResponseBody only works in the tab that made the request, so with
+    several tabs open, responses of other tabs are kept until collect() is
+    called while switched to them.
+    """
+
+    def __init__(self, url_pattern: str, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            url_pattern: Regex selecting the API endpoints worth reading
+            logger: Logger for unreadable responses
+        """
+        self.url_pattern = re.compile(url_pattern)
+        self.logger = logger or logging.getLogger(__name__)
+        self._pending: Dict[str, Tuple[str, Optional[str]]] = {}  # request ID -> (url, target)
+        self._finished: Dict[str, Tuple[str, Optional[str]]] = {}  # finished in a tab not read yet
+
+    def start(self, driver) -> None:
+        """Enable the Network domain for the current tab with room to keep response bodies."""
+        driver.execute_cdp_cmd('Network.enable', {
+            'maxTotalBufferSize': NETWORK_BUFFER_BYTES,
+            'maxResourceBufferSize': NETWORK_BUFFER_BYTES // 4,
+        })
+
+    def collect(self, driver, messages: List[Dict], target: Optional[str] = None) -> List[Tuple[str, Any]]:
+        """
+        Read the matching responses that finished loading.
+
+        Args:
+            driver: Driver whose performance log produced messages
+            messages: Events from drain_performance_log()
+            target: Tab the driver is switched to, see current_target().
+                Only that tab's responses are read; those of other tabs
+                are kept for a later call. None reads every response, for
+                callers that use a single tab.
+
+        Returns:
+            (url, decoded JSON) pairs in the order the responses finished
+        """
+        for message in messages:
+            method = message.get('method')
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+            if method == 'Network.responseReceived':
+                url = params.get('response', {}).get('url', '')
+                if self.url_pattern.search(url):
+                    self._pending[request_id] = (url, message.get('target'))
+            elif method == 'Network.loadingFinished' and request_id in self._pending:
+                self._finished[request_id] = self._pending.pop(request_id)
+            elif method == 'Network.loadingFailed':
+                self._pending.pop(request_id, None)
+
+        payloads = []
+        for request_id, (url, response_target) in list(self._finished.items()):
+            if target is not None and response_target != target:
+                continue
+            del self._finished[request_id]
+            payload = self._read_json(driver, request_id, url)
+            if payload is not None:
+                payloads.append((url, payload))
+        return payloads
+
+    def discard(self, target: str) -> None:
+        """Forget the responses of a tab that was closed before they were read."""
+        for responses in (self._pending, self._finished):
+            for request_id in [request_id for request_id, (_, response_target) in responses.items()
+                               if response_target == target]:
+                del responses[request_id]
+
+    def _read_json(self, driver, request_id: str, url: str) -> Optional[Any]:
+        try:
+            response = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            # Evicted from the buffer, or made by a tab we are not switched to
+            self.logger.debug(f"Could not read response body of {url}: {str(e)}")
+            return None
+
+        body = response.get('body', '')
+        if response.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        # Some endpoints prefix their JSON with an anti-hijacking guard
+        body = body.lstrip()
+        if body.startswith('for (;;);'):
+            body = body[len('for (;;);'):]
+        try:
+            return json.loads(body)
+        except ValueError:
+            self.logger.debug(f"Response of {url} is not JSON")
+            return None
@@ -0,0 +1,170 @@
+"""
+SQLite-backed store for scraped posts shared by all three scrapers.
+
+Posts are upserted by (platform, post key), so re-crawls refresh metrics
+instead of duplicating rows, and every account keeps a high-water mark of
+the newest post seen. Scrapers use it to stop paging once they reach posts
+stored by an earlier run.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+# Profiles can pin up to three older posts above the newest ones, so a run
+# of known posts only means "caught up" once it is longer than this
+PINNED_POST_LIMIT = 3
+
+
+class PostStore:
+    """
+    Post database in WAL mode.
+
+    One connection is shared between threads behind a lock, which is
+    enough for the scrapers' write rate and lets several processes use the
+    same file concurrently.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS posts (
+        platform   TEXT NOT NULL,
+        post_key   TEXT NOT NULL,
+        username   TEXT,
+        timestamp  TEXT,
+        content    TEXT,
+        likes      INTEGER,
+        comments   INTEGER,
+        retweets   INTEGER,
+        shares     INTEGER,
+        url        TEXT,
+        first_seen TEXT NOT NULL,
+        last_seen  TEXT NOT NULL,
+        PRIMARY KEY (platform, post_key)
+    );
+    CREATE TABLE IF NOT EXISTS accounts (
+        platform         TEXT NOT NULL,
+        username         TEXT NOT NULL,
+        newest_timestamp TEXT,
+        newest_post_key  TEXT,
+        updated_at       TEXT NOT NULL,
+        PRIMARY KEY (platform, username)
+    );
+    """
+
+    UPSERT_POST = """
+    INSERT INTO posts (platform, post_key, username, timestamp, content, likes,
+                       comments, retweets, shares, url, first_seen, last_seen)
+    VALUES (:platform, :post_key, :username, :timestamp, :content, :likes,
+            :comments, :retweets, :shares, :url, :now, :now)
+    ON CONFLICT (platform, post_key) DO UPDATE SET
+        timestamp = COALESCE(NULLIF(excluded.timestamp, ''), posts.timestamp),
+        content   = COALESCE(NULLIF(excluded.content, ''), posts.content),
+        likes     = excluded.likes,
+        comments  = excluded.comments,
+        retweets  = excluded.retweets,
+        shares    = excluded.shares,
+        url       = COALESCE(excluded.url, posts.url),
+        last_seen = excluded.last_seen
+    """
+
+    # Timestamps are ISO-8601 UTC strings, which compare chronologically as text
+    UPSERT_HIGH_WATER_MARK = """
+    INSERT INTO accounts (platform, username, newest_timestamp, newest_post_key, updated_at)
+    VALUES (:platform, :username, :timestamp, :post_key, :now)
+    ON CONFLICT (platform, username) DO UPDATE SET
+        newest_timestamp = excluded.newest_timestamp,
+        newest_post_key  = excluded.newest_post_key,
+        updated_at       = excluded.updated_at
+    WHERE accounts.newest_timestamp IS NULL
+       OR excluded.newest_timestamp > accounts.newest_timestamp
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file, created if missing
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def upsert_posts(self, platform: str, records: Iterable[Dict],
+                     key: Optional[Callable[[Dict], Optional[str]]] = None) -> int:
+        """
+        Insert or refresh posts and advance each account's high-water mark.
+
+        Args:
+            platform: 'X', 'Instagram' or 'TikTok'
+            records: Scraped post dictionaries
+            key: Returns the post key for a record, defaults to its url
+
+        Returns:
+            Number of records written
+        """
+        key = key or (lambda record: record.get('url'))
+        now = datetime.now().isoformat()
+        rows = []
+        for record in records:
+            post_key = key(record)
+            if not post_key:
+                continue
+            rows.append({
+                "platform": platform,
+                "post_key": post_key,
+                "username": record.get('username'),
+                "timestamp": record.get('timestamp'),
+                "content": record.get('content'),
+                "likes": record.get('likes'),
+                "comments": record.get('comments'),
+                "retweets": record.get('retweets'),
+                "shares": record.get('shares'),
+                "url": record.get('url'),
+                "now": now,
+            })
+
+        with self._lock, self._conn:
+            self._conn.executemany(self.UPSERT_POST, rows)
+            self._conn.executemany(
+                self.UPSERT_HIGH_WATER_MARK,
+                [row for row in rows if row['username'] and row['timestamp']]
+            )
+        return len(rows)
+
+    def upsert_post(self, platform: str, record: Dict,
+                    key: Optional[Callable[[Dict], Optional[str]]] = None) -> None:
+        """Insert or refresh a single post."""
+        self.upsert_posts(platform, [record], key)
+
+    def has_post(self, platform: str, post_key: str) -> bool:
+        """Whether a post was stored by any earlier run."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM posts WHERE platform = ? AND post_key = ?",
+                (platform, post_key)
+            ).fetchone()
+        return row is not None
+
+    def high_water_mark(self, platform: str, username: str) -> Optional[Tuple[str, str]]:
+        """
+        Newest post seen for an account.
+
+        Returns:
+            (timestamp, post key) of the newest stored post, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_timestamp, newest_post_key FROM accounts "
+                "WHERE platform = ? AND username = ?",
+                (platform, username)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,138 @@
+"""
+Token-bucket rate limiting for page fetches.
+
+Every fetch takes one token from each bucket that applies to it, typically
+a global bucket, one per platform and one per logged-in account. A bucket
+refills continuously at its hourly budget and holds at most `burst`
+tokens, so a scraper runs right at its configured rate instead of behind
+worst-case sleeps.
+
+Bucket state lives in memory, or in a SQLite file when several processes
+have to share the same budgets.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class RateLimiter:
+    """
+    Named token buckets, acquired together.
+
+    A fetch only proceeds once every bucket it names has a token, and
+    then takes one from each in a single step, so a fetch waiting on a
+    tight account budget never holds tokens of the shared buckets.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS buckets (
+        name    TEXT PRIMARY KEY,
+        tokens  REAL NOT NULL,
+        updated REAL NOT NULL
+    )
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], path: Optional[str] = None):
+        """
+        Args:
+            limits: Bucket name -> (tokens per hour, burst capacity)
+            path: SQLite file shared between processes; in-memory if None
+        """
+        self.limits = {
+            name: (per_hour / 3600.0, max(1.0, float(burst)))
+            for name, (per_hour, burst) in limits.items() if per_hour
+        }
+        self._lock = threading.Lock()
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._conn = None
+        if path:
+            # isolation_level=None so BEGIN IMMEDIATE below controls the transaction
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self.SCHEMA)
+
+    def try_acquire(self, names: Iterable[str]) -> float:
+        """
+        Take one token from each named bucket if all of them have one.
+
+        Names without a configured limit are ignored.
+
+        Returns:
+            0 when the tokens were taken, otherwise the seconds until they
+            are expected to be available
+        """
+        names = [name for name in names if name in self.limits]
+        if not names:
+            return 0.0
+        with self._lock:
+            if self._conn is None:
+                return self._take(names, self._state)
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                placeholders = ','.join('?' * len(names))
+                rows = self._conn.execute(
+                    f"SELECT name, tokens, updated FROM buckets WHERE name IN ({placeholders})", names
+                ).fetchall()
+                state = {name: (tokens, updated) for name, tokens, updated in rows}
+                wait = self._take(names, state)
+                if wait == 0:
+                    self._conn.executemany(
+                        "INSERT INTO buckets (name, tokens, updated) VALUES (?, ?, ?) "
+                        "ON CONFLICT (name) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                        [(name, *state[name]) for name in names]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def acquire(self, names: Iterable[str]) -> float:
+        """
+        Block until a token of every named bucket was taken.
+
+        Returns:
+            Seconds spent waiting
+        """
+        names = list(names)
+        started = time.monotonic()
+        while (wait := self.try_acquire(names)) > 0:
+            time.sleep(wait)
+        return time.monotonic() - started
+
+    async def acquire_async(self, names: Iterable[str]) -> float:
+        """Awaitable acquire() that leaves the event loop free while waiting."""
+        names = list(names)
+        started = time.monotonic()
+        while (wait := self.try_acquire(names)) > 0:
+            await asyncio.sleep(wait)
+        return time.monotonic() - started
+
+    def close(self) -> None:
+        """Close the shared database, if any."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def _take(self, names, state: Dict[str, Tuple[float, float]]) -> float:
+        now = time.time()
+        levels = {}
+        wait = 0.0
+        for name in names:
+            rate, burst = self.limits[name]
+            # New buckets start full; others refill for the time since their last update
+            tokens, updated = state.get(name, (burst, now))
+            tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+            levels[name] = tokens
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / rate)
+        if wait > 0:
+            return wait
+        for name, tokens in levels.items():
+            state[name] = (tokens - 1, now)
+        return 0.0
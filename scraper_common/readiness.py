@@ -0,0 +1,124 @@
+"""
+Event-driven page readiness waits.
+
+Instead of sleeping a fixed random time after every navigation, the
+scrapers wait for concrete signals: the document finished loading, an
+optional target selector is present, and neither the DOM nor the network
+has changed for a short quiet window. Fast pages therefore finish fast,
+and any human-like pacing is measured from the moment the page was ready
+rather than stacked on top of its load time.
+"""
+
+import logging
+import time
+from typing import Optional
+
+
+# Records the time of the last DOM mutation or finished resource load. It
+# only observes: fetch and XMLHttpRequest are left untouched so the page
+# cannot tell it is being watched.
+ACTIVITY_TRACKER_JS = """
+(() => {
+    if (window.__pageActivity) {
+        return;
+    }
+    const state = window.__pageActivity = {last: performance.now()};
+    const touch = () => { state.last = performance.now(); };
+    const observe = () => new MutationObserver(touch).observe(
+        document.documentElement, {childList: true, subtree: true, characterData: true}
+    );
+    if (document.documentElement) {
+        observe();
+    } else {
+        document.addEventListener('DOMContentLoaded', observe);
+    }
+    try {
+        new PerformanceObserver(touch).observe({type: 'resource', buffered: false});
+    } catch (e) {}
+})();
+"""
+
+READINESS_PROBE_JS = ACTIVITY_TRACKER_JS + """
+const selector = arguments[0];
+return {
+    complete: document.readyState === 'complete',
+    idleMs: performance.now() - window.__pageActivity.last,
+    found: !selector || document.querySelector(selector) !== null
+};
+"""
+
+
+class PageReadiness:
+    """
+    Waits until a page is ready, judged from signals inside the page.
+
+    The activity tracker is registered to run before page scripts on every
+    new document when install() is called, and injected lazily otherwise
+    (e.g. in tabs opened later), in which case quiet time is only measured
+    from the first probe.
+    """
+
+    def __init__(self, quiet_ms: int = 500, timeout: float = 15, poll_interval: float = 0.1,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            quiet_ms: How long the DOM and network must stay unchanged
+            timeout: Upper bound of a single wait, in seconds
+            poll_interval: Seconds between probes
+            logger: Logger for waits that time out
+        """
+        self.quiet_ms = quiet_ms
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger(__name__)
+
+    def install(self, driver) -> None:
+        """Track activity from the very start of every document the current tab loads."""
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': ACTIVITY_TRACKER_JS})
+
+    def wait(self, driver, selector: Optional[str] = None, timeout: Optional[float] = None,
+             quiet_ms: Optional[int] = None) -> float:
+        """
+        Block until the page is loaded, selector is present and activity settled.
+
+        A timeout is not an error: the page is used as it is, as the fixed
+        sleeps this replaces would have done.
+
+        Args:
+            driver: Selenium driver on the page
+            selector: CSS selector that must be present
+            timeout: Override of the default timeout
+            quiet_ms: Override of the default quiet window
+
+        Returns:
+            time.monotonic() at which the page was ready, for pacing
+        """
+        timeout = self.timeout if timeout is None else timeout
+        quiet_ms = self.quiet_ms if quiet_ms is None else quiet_ms
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                state = driver.execute_script(READINESS_PROBE_JS, selector)
+            except Exception:
+                # Navigation in progress; the next probe runs in the new document
+                state = None
+            if state and state['complete'] and state['found'] and state['idleMs'] >= quiet_ms:
+                return time.monotonic()
+            if time.monotonic() >= deadline:
+                self.logger.debug(f"Page not ready after {timeout}s (selector={selector}), continuing")
+                return time.monotonic()
+            time.sleep(self.poll_interval)
+
+    @staticmethod
+    def remaining_delay(ready_at: float, delay: float) -> float:
+        """
+        Part of a pacing delay still to wait once the page has been ready for a while.
+
+        Args:
+            ready_at: Value returned by wait()
+            delay: Desired pause after the page became ready
+
+        Returns:
+            Seconds left to sleep, never negative
+        """
+        return max(0.0, delay - (time.monotonic() - ready_at))
@@ -0,0 +1,152 @@
+"""
+Per-platform policy for what Chrome is allowed to download.
+
+The scrapers only read markup, meta tags and counters, yet every page load
+pulls in images, video, fonts and third-party trackers. The policy blocks
+those with the DevTools `Network.setBlockedURLs` command and reads
+Chrome's performance log to report how much each page loaded and roughly
+how much the blocked requests would have cost.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from .network_capture import drain_performance_log
+
+
+# setBlockedURLs matches wildcard URL patterns, not resource types, so each
+# type is described by the extensions its files are served with. The
+# trailing * keeps query strings such as CDN signatures matching.
+RESOURCE_PATTERNS = {
+    'image': ['*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.heic*', '*.ico*', '*.svg*'],
+    'media': ['*.mp4*', '*.webm*', '*.m4s*', '*.m4a*', '*.mp3*', '*.m3u8*', '*.mpd*'],
+    'font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'stylesheet': ['*.css*'],
+}
+
+TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*connect.facebook.net*',
+    '*analytics.twitter.com*',
+    '*ads-twitter.com*',
+    '*analytics.tiktok.com*',
+    '*mon.tiktokv.com*',
+]
+
+# Typical transfer size per Chrome resource type, used to estimate what a
+# blocked request would have downloaded
+ESTIMATED_BYTES = {
+    'Image': 60_000,
+    'Media': 1_000_000,
+    'Font': 40_000,
+    'Stylesheet': 30_000,
+    'Script': 30_000,
+    'Other': 5_000,
+}
+
+
+class ResourcePolicy:
+    """
+    Blocks unneeded resource types for a driver and reports the savings.
+
+    The performance log the report is built from has to be switched on when
+    the driver is created, see network_capture.enable_performance_log().
+    Scrapers that read the log themselves pass the events to observe() so
+    the report still covers them.
+    """
+
+    def __init__(self, block: Iterable[str] = ('image', 'media', 'font'), block_trackers: bool = True,
+                 extra_patterns: Iterable[str] = (), logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            block: Resource types to drop, keys of RESOURCE_PATTERNS
+            block_trackers: Also drop the known third-party trackers
+            extra_patterns: Additional platform-specific URL patterns
+            logger: Logger for the per-page report
+        """
+        unknown = set(block) - set(RESOURCE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {', '.join(sorted(unknown))}")
+
+        self.patterns: List[str] = [pattern for kind in block for pattern in RESOURCE_PATTERNS[kind]]
+        if block_trackers:
+            self.patterns.extend(TRACKER_PATTERNS)
+        self.patterns.extend(extra_patterns)
+        self.logger = logger or logging.getLogger(__name__)
+        self.totals = {'pages': 0, 'requests': 0, 'blocked': 0, 'bytes_loaded': 0, 'bytes_saved': 0}
+        self._page = self._empty_stats()
+
+    def apply(self, driver, discard_log: bool = True) -> None:
+        """
+        Start blocking for the driver's current tab.
+
+        Blocking is per tab: apply it again after switching to a new one.
+
+        Args:
+            driver: Chrome driver created with the performance log enabled
+            discard_log: Drop events recorded so far, e.g. the login pages,
+                so the next report only covers scraping traffic
+        """
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+        if discard_log:
+            drain_performance_log(driver)
+            self._page = self._empty_stats()
+
+    def release(self, driver) -> None:
+        """Stop blocking for the current tab, e.g. so a CAPTCHA can render its images."""
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+
+    def observe(self, messages: List[Dict]) -> None:
+        """Count performance log events that were drained by someone else."""
+        stats = self._page
+        for message in messages:
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                stats['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                stats['bytes_loaded'] += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                stats['blocked'] += 1
+                stats['bytes_saved'] += ESTIMATED_BYTES.get(params.get('type'), ESTIMATED_BYTES['Other'])
+
+    def page_stats(self, driver) -> Dict[str, int]:
+        """
+        Summarise the network traffic since the previous call.
+
+        Returns:
+            Request count, blocked request count, bytes actually loaded and
+            the estimated bytes saved by blocking
+        """
+        self.observe(drain_performance_log(driver))
+        stats, self._page = self._page, self._empty_stats()
+        self.totals['pages'] += 1
+        for key, value in stats.items():
+            self.totals[key] += value
+        return stats
+
+    def log_page(self, driver, label: str) -> Dict[str, int]:
+        """Log the page_stats() of the page just scraped."""
+        stats = self.page_stats(driver)
+        self.logger.info(
+            f"{label}: blocked {stats['blocked']}/{stats['requests']} requests, "
+            f"loaded {stats['bytes_loaded'] / 1024:.0f} KB, ~{stats['bytes_saved'] / 1024:.0f} KB saved"
+        )
+        return stats
+
+    def log_totals(self) -> None:
+        """Log the savings accumulated over the run."""
+        if not self.totals['pages']:
+            return
+        self.logger.info(
+            f"Resource blocking over {self.totals['pages']} pages: blocked {self.totals['blocked']} "
+            f"of {self.totals['requests']} requests, loaded {self.totals['bytes_loaded'] / 2**20:.1f} MB, "
+            f"~{self.totals['bytes_saved'] / 2**20:.1f} MB saved"
+        )
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {'requests': 0, 'blocked': 0, 'bytes_loaded': 0, 'bytes_saved': 0}
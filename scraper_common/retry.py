@@ -0,0 +1,151 @@
+"""
+Retries of single scraping units with exponential backoff.
+
+A unit is one page or profile load. When it fails, the error is classified
+and only retried if another attempt on the same driver can plausibly
+succeed: a timeout, a selector that has not rendered yet, or a session
+that expired and can be restored. Other errors are raised right away, so
+one bad video no longer costs a re-login and a re-scrape of every profile.
+A page that loaded but has nothing to scrape, such as a private profile,
+is never retried.
+"""
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+from typing import Any, Callable, Iterable, Optional
+
+
+TIMEOUT = 'timeout'
+MISSING_SELECTOR = 'missing_selector'
+LOGGED_OUT = 'logged_out'
+UNAVAILABLE = 'unavailable'
+OTHER = 'other'
+
+
+class LoggedOutError(Exception):
+    """Raised by a scraper when a page shows it is no longer logged in."""
+
+
+class MissingSelectorError(Exception):
+    """Raised by a scraper when content it waits for did not render."""
+
+
+class ContentUnavailableError(Exception):
+    """Raised by a scraper when a page loaded but has no content, e.g. a private or empty profile."""
+
+
+# Matched by class name so classification works without importing Selenium
+_ERROR_KINDS = {
+    'TimeoutException': TIMEOUT,
+    'TimeoutError': TIMEOUT,
+    'NoSuchElementException': MISSING_SELECTOR,
+    'StaleElementReferenceException': MISSING_SELECTOR,
+    'ElementNotInteractableException': MISSING_SELECTOR,
+    'ElementClickInterceptedException': MISSING_SELECTOR,
+    'MissingSelectorError': MISSING_SELECTOR,
+    'LoggedOutError': LOGGED_OUT,
+    'ContentUnavailableError': UNAVAILABLE,
+}
+
+
+def classify_error(error: BaseException) -> str:
+    """Map an exception to TIMEOUT, MISSING_SELECTOR, LOGGED_OUT, UNAVAILABLE or OTHER."""
+    for cls in type(error).__mro__:
+        if cls.__name__ in _ERROR_KINDS:
+            return _ERROR_KINDS[cls.__name__]
+    return OTHER
+
+
+class RetryPolicy:
+    """
+    Runs a unit of work, retrying classified failures with backoff.
+
+    The n-th retry waits retry_delay * 2**n with exponential backoff, or
+    retry_delay otherwise, capped at max_delay. Half of that wait is
+    randomised so parallel workers that failed together do not retry in
+    lockstep.
+    """
+
+    def __init__(self, max_retries: int = 3, retry_delay: float = 5, exponential_backoff: bool = True,
+                 max_delay: float = 300, retry_on: Iterable[str] = (TIMEOUT, MISSING_SELECTOR, LOGGED_OUT),
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            max_retries: Attempts after the first one
+            retry_delay: Base wait before a retry, in seconds
+            exponential_backoff: Double the wait after every failed retry
+            max_delay: Upper bound of a single wait
+            retry_on: Error kinds worth another attempt
+            logger: Logger for failed attempts
+        """
+        self.max_retries = max(0, max_retries)
+        self.retry_delay = retry_delay
+        self.exponential_backoff = exponential_backoff
+        self.max_delay = max_delay
+        self.retry_on = set(retry_on)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def backoff(self, retry: int) -> float:
+        """Seconds to wait before the given retry, counted from 0."""
+        delay = self.retry_delay * (2 ** retry if self.exponential_backoff else 1)
+        delay = min(delay, self.max_delay)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def call(self, func: Callable[..., Any], *args, label: str = '',
+             recover: Optional[Callable[[str], Any]] = None, **kwargs) -> Any:
+        """
+        Call func(*args, **kwargs), retrying failures the policy covers.
+
+        Args:
+            func: The unit of work
+            label: Name of the unit for log messages
+            recover: Called with the error kind before each retry, e.g. to
+                log back in after LOGGED_OUT
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            The last error, once it is not retryable or retries ran out
+        """
+        retry = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                kind = self._check_retry(e, retry, label)
+            time.sleep(self.backoff(retry))
+            if recover:
+                recover(kind)
+            retry += 1
+
+    async def call_async(self, func: Callable[..., Any], *args, label: str = '',
+                         recover: Optional[Callable[[str], Any]] = None, **kwargs) -> Any:
+        """Coroutine version of call(); func and recover may be coroutine functions."""
+        retry = 0
+        while True:
+            try:
+                result = func(*args, **kwargs)
+                return await result if inspect.isawaitable(result) else result
+            except Exception as e:
+                kind = self._check_retry(e, retry, label)
+            await asyncio.sleep(self.backoff(retry))
+            if recover:
+                result = recover(kind)
+                if inspect.isawaitable(result):
+                    await result
+            retry += 1
+
+    def _check_retry(self, error: Exception, retry: int, label: str) -> str:
+        """Return the error kind if the unit should be retried, otherwise re-raise."""
+        kind = classify_error(error)
+        if kind not in self.retry_on or retry >= self.max_retries:
+            raise error
+        self.logger.warning(
+            f"{label or 'Unit'} failed ({kind}: {str(error).strip() or type(error).__name__}), "
+            f"retry {retry + 1}/{self.max_retries}"
+        )
+        return kind
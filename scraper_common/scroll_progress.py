@@ -0,0 +1,95 @@
+"""
+Termination logic for infinite-scroll feeds.
+
+A feed can end, stall behind a spinner, or keep growing with placeholders
+and ads that never turn into new posts. The tracker combines page height
+growth, the number of newly discovered posts and a wall-clock budget, so a
+profile stops scrolling as soon as more scrolling is unlikely to pay off,
+and records why it stopped.
+"""
+
+import time
+from typing import Optional
+
+
+STOP_TARGET = 'target_reached'
+STOP_STALLED = 'stalled'
+STOP_IDLE = 'no_new_posts'
+STOP_TIME_BUDGET = 'time_budget'
+STOP_CHECKPOINT = 'checkpoint'
+
+
+class ScrollProgress:
+    """
+    Decides after every scroll step whether scrolling a feed should go on.
+
+    A step without new posts and without page growth counts as stalled; a
+    step without new posts while the page still grows counts as idle. Both
+    counters reset as soon as a step discovers a new post.
+    """
+
+    def __init__(self, target: int, initial_height: int = 0, max_stalled_steps: int = 3,
+                 max_idle_steps: int = 6, time_budget: Optional[float] = None):
+        """
+        Args:
+            target: Number of posts after which scrolling stops
+            initial_height: Page height before the first scroll
+            max_stalled_steps: Consecutive stalled steps before giving up
+            max_idle_steps: Consecutive steps without new posts before
+                giving up, even though the page keeps growing
+            time_budget: Seconds a feed may be scrolled in total
+        """
+        self.target = target
+        self.max_stalled_steps = max_stalled_steps
+        self.max_idle_steps = max_idle_steps
+        self.time_budget = time_budget
+        self.steps = 0
+        self.posts = 0
+        self.stop_reason: Optional[str] = None
+        self._height = initial_height
+        self._stalled_steps = 0
+        self._idle_steps = 0
+        self._started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since scrolling started."""
+        return time.monotonic() - self._started
+
+    def update(self, height: int, posts: int) -> bool:
+        """
+        Record the state after a scroll step.
+
+        Args:
+            height: Current document scroll height
+            posts: Total number of unique posts found so far
+
+        Returns:
+            Whether to keep scrolling; stop_reason is set when not
+        """
+        self.steps += 1
+        grew = height > self._height
+        found_new = posts > self.posts
+        self._height = max(self._height, height)
+        self.posts = posts
+
+        if found_new:
+            self._stalled_steps = self._idle_steps = 0
+        else:
+            self._idle_steps += 1
+            self._stalled_steps = 0 if grew else self._stalled_steps + 1
+
+        if posts >= self.target:
+            return self.stop(STOP_TARGET)
+        if self._stalled_steps >= self.max_stalled_steps:
+            return self.stop(STOP_STALLED)
+        if self._idle_steps >= self.max_idle_steps:
+            return self.stop(STOP_IDLE)
+        if self.time_budget is not None and self.elapsed >= self.time_budget:
+            return self.stop(STOP_TIME_BUDGET)
+        return True
+
+    def stop(self, reason: str) -> bool:
+        """Stop for a reason found by the caller, e.g. reaching a checkpoint; returns False."""
+        self.stop_reason = reason
+        return False
@@ -0,0 +1,135 @@
+"""
+Encrypted-at-rest persistence of browser sessions.
+
+After a successful login the cookies and localStorage of the site are
+saved, Fernet-encrypted, and restored into the next fresh driver so the
+credential flow only runs when the saved session no longer works.
+
+The key is read from the SCRAPER_SESSION_KEY environment variable, or from
+a key file that is generated on first use with owner-only permissions.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+KEY_ENV_VAR = 'SCRAPER_SESSION_KEY'
+
+
+class SessionStore:
+    """Save and restore one site's cookies and localStorage for a Selenium driver."""
+
+    def __init__(self, path: str, key_file: str = '.session.key', max_age_hours: Optional[float] = None):
+        """
+        Args:
+            path: Encrypted session file
+            key_file: Fernet key file used when SCRAPER_SESSION_KEY is unset
+            max_age_hours: Ignore sessions saved longer ago than this
+        """
+        try:
+            from cryptography.fernet import Fernet, InvalidToken
+        except ImportError as e:
+            raise ImportError("Session persistence requires the cryptography package") from e
+
+        self.path = path
+        self.max_age_hours = max_age_hours
+        self._invalid_token = InvalidToken
+        self._fernet = Fernet(self._load_key(key_file, Fernet))
+
+    @staticmethod
+    def _load_key(key_file: str, fernet_cls) -> bytes:
+        if os.environ.get(KEY_ENV_VAR):
+            return os.environ[KEY_ENV_VAR].encode()
+        if os.path.exists(key_file):
+            with open(key_file, 'rb') as f:
+                return f.read().strip()
+
+        key = fernet_cls.generate_key()
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+
+    def save(self, driver) -> None:
+        """
+        Persist the cookies and localStorage of the driver's current site.
+
+        Args:
+            driver: Logged-in Selenium driver, on a page of the site
+        """
+        state = {
+            "saved_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(
+                "return Object.assign({}, window.localStorage);"
+            ) or {},
+        }
+        token = self._fernet.encrypt(json.dumps(state).encode('utf-8'))
+
+        # Write to a temporary file first so a crash never leaves a torn session
+        temp_path = f"{self.path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(token)
+        os.replace(temp_path, self.path)
+
+    def load(self) -> Optional[Dict]:
+        """Decrypt the saved session, or None if missing, expired or unreadable."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                state = json.loads(self._fernet.decrypt(f.read()))
+        except (self._invalid_token, ValueError):
+            return None
+
+        if self.max_age_hours and time.time() - state['saved_at'] > self.max_age_hours * 3600:
+            return None
+        return state
+
+    def restore(self, driver, origin_url: str) -> bool:
+        """
+        Load a saved session into a fresh driver.
+
+        Cookies can only be set for the current domain, so the driver is
+        first pointed at origin_url and reloaded once the state is applied.
+
+        Args:
+            driver: Selenium driver without a session
+            origin_url: Page on the site the session belongs to
+
+        Returns:
+            Whether a saved session was applied; the caller still has to
+            probe that it is accepted by the site
+        """
+        state = self.load()
+        if not state:
+            return False
+
+        driver.get(origin_url)
+        for cookie in state['cookies']:
+            cookie = {k: v for k, v in cookie.items() if k in
+                      ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry', 'sameSite')}
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                # Cookies for sibling domains are rejected; the rest still apply
+                continue
+
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) {"
+            "    window.localStorage.setItem(key, value);"
+            "}",
+            state['local_storage']
+        )
+        driver.refresh()
+        return True
+
+    def clear(self) -> None:
+        """Delete the saved session, e.g. after it was rejected."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,268 @@
+"""
+Output sinks that persist scraped records as they are produced.
+
+Unlike the end-of-run json.dump, a sink keeps memory flat and leaves a
+usable file behind when a run dies halfway through.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+
+class JsonlSink:
+    """
+    Streaming JSON Lines writer.
+
+    Records are serialised immediately, buffered in memory and appended to
+    the output file every `batch_size` records. The file can be rotated
+    atomically, either on demand or once it grows past `max_bytes`.
+    """
+
+    def __init__(self, path: str, batch_size: int = 50, max_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Output file, appended to if it already exists
+            batch_size: Number of records buffered before each flush
+            max_bytes: Rotate automatically once the file exceeds this size
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.max_bytes = max_bytes
+        self.records_written = 0
+        # Whether the file already held records when it was opened
+        self.appending = os.path.exists(path) and os.path.getsize(path) > 0
+        self._buffer: List[str] = []
+        self._rotation = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record: Dict) -> None:
+        """Queue a single record, flushing once a full batch is buffered."""
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._buffer.append(line)
+            self.records_written += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def write_many(self, records: List[Dict]) -> None:
+        """Queue several records."""
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Write any buffered records to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def rotate(self, rotated_path: Optional[str] = None) -> str:
+        """
+        Atomically move the current file aside and start a fresh one.
+
+        Args:
+            rotated_path: Destination of the finished file, defaults to
+                <name>.<n><ext> next to the output file
+
+        Returns:
+            Path the finished file was moved to
+        """
+        with self._lock:
+            return self._rotate_locked(rotated_path)
+
+    def close(self) -> None:
+        """Flush remaining records and close the file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer or self._file.closed:
+            return
+        self._file.write(''.join(self._buffer))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer.clear()
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate_locked()
+
+    def _rotate_locked(self, rotated_path: Optional[str] = None) -> str:
+        if self._buffer:
+            self._file.write(''.join(self._buffer))
+            self._buffer.clear()
+        self._file.close()
+
+        if rotated_path is None:
+            stem, ext = os.path.splitext(self.path)
+            while True:
+                self._rotation += 1
+                rotated_path = f"{stem}.{self._rotation}{ext}"
+                if not os.path.exists(rotated_path):
+                    break
+        # os.replace is atomic, readers never see a half-moved file
+        os.replace(self.path, rotated_path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return rotated_path
+
+    def __enter__(self) -> 'JsonlSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ColumnarSink:
+    """
+    Parquet / Arrow IPC writer with a fixed post schema.
+
+    Records are buffered and written as one row group (Parquet) or record
+    batch (Arrow) every `batch_size` records. Fields a platform does not
+    have, e.g. retweets on Instagram, are stored as nulls. The file footer
+    is only written on close, so use JSONL when crash safety matters more
+    than size.
+    """
+
+    COUNT_FIELDS = ('likes', 'comments', 'retweets', 'shares')
+
+    def __init__(self, path: str, file_format: str = 'parquet', batch_size: int = 500,
+                 compression: bool = True):
+        """
+        Args:
+            path: Output file, overwritten if it exists
+            file_format: 'parquet' or 'arrow'
+            batch_size: Number of records per row group / record batch
+            compression: Compress column data with zstd
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(f"The '{file_format}' output format requires the pyarrow package") from e
+
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.records_written = 0
+        self.appending = False
+        self._pa = pa
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.schema = pa.schema([
+            ('username', pa.string()),
+            ('timestamp', pa.timestamp('ms', tz='UTC')),
+            ('content', pa.string()),
+            ('likes', pa.int64()),
+            ('comments', pa.int64()),
+            ('retweets', pa.int64()),
+            ('shares', pa.int64()),
+            ('url', pa.string()),
+        ])
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        codec = 'zstd' if compression else None
+        if file_format == 'parquet':
+            self._file = None
+            self._writer = pq.ParquetWriter(path, self.schema, compression=codec or 'none')
+        elif file_format == 'arrow':
+            self._file = pa.OSFile(path, 'wb')
+            options = pa.ipc.IpcWriteOptions(compression=codec)
+            self._writer = pa.ipc.new_file(self._file, self.schema, options=options)
+        else:
+            raise ValueError(f"Unknown columnar format '{file_format}'")
+
+    def write(self, record: Dict) -> None:
+        """Queue a single record, writing a batch once enough are buffered."""
+        row = {
+            'username': record.get('username'),
+            'timestamp': self._parse_timestamp(record.get('timestamp')),
+            'content': record.get('content'),
+            'url': record.get('url'),
+        }
+        for field in self.COUNT_FIELDS:
+            value = record.get(field)
+            row[field] = int(value) if value is not None else None
+
+        with self._lock:
+            self._buffer.append(row)
+            self.records_written += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def write_many(self, records: List[Dict]) -> None:
+        """Queue several records."""
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Write any buffered records as a batch."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Write remaining records and the file footer."""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._writer.close()
+            if self._file is not None:
+                self._file.close()
+            self._closed = True
+
+    def _flush_locked(self) -> None:
+        if not self._buffer or self._closed:
+            return
+        batch = self._pa.RecordBatch.from_pylist(self._buffer, schema=self.schema)
+        self._writer.write_batch(batch)
+        self._buffer.clear()
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    def __enter__(self) -> 'ColumnarSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+SINK_EXTENSIONS = {'jsonl': '.jsonl', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def create_sink(output_format: str, path_stem: str, batch_size: int = 50,
+                max_bytes: Optional[int] = None,
+                compression: bool = True) -> Optional[Union[JsonlSink, ColumnarSink]]:
+    """
+    Open the streaming sink for an output format.
+
+    Args:
+        output_format: 'jsonl', 'parquet' or 'arrow'; anything else (the
+            legacy 'json') returns None so callers fall back to json.dump
+        path_stem: Output path without extension
+        batch_size: Records buffered per write
+        max_bytes: Size limit for JSONL rotation
+        compression: Use zstd for the columnar formats
+
+    Returns:
+        An open sink, or None for formats without one
+    """
+    if output_format not in SINK_EXTENSIONS:
+        return None
+    path = path_stem + SINK_EXTENSIONS[output_format]
+    if output_format == 'jsonl':
+        return JsonlSink(path, batch_size=batch_size, max_bytes=max_bytes)
+    return ColumnarSink(path, output_format, batch_size=batch_size, compression=compression)
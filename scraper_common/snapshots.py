@@ -0,0 +1,90 @@
+"""
+Compressed store for raw page HTML captured during a scrape.
+
+Snapshots let the extraction logic be re-run offline over saved pages,
+at disk speed and without a browser.
+
+Layout:
+    <directory>/<platform>/manifest.jsonl        one JSON line per snapshot
+    <directory>/<platform>/<kind>/<name>.html.gz  gzip-compressed page HTML
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+
+class SnapshotStore:
+    """
+    Append-only snapshot store for one platform.
+
+    Every snapshot is written as a gzip file and registered in a manifest
+    together with free-form metadata (username, url, ...) needed to
+    re-extract it later.
+    """
+
+    MANIFEST_NAME = 'manifest.jsonl'
+
+    def __init__(self, directory: str, platform: str):
+        """
+        Args:
+            directory: Root snapshot directory shared by all platforms
+            platform: Sub-directory for this scraper, e.g. 'X'
+        """
+        self.root = os.path.join(directory, platform)
+        self.manifest_path = os.path.join(self.root, self.MANIFEST_NAME)
+        self._lock = threading.Lock()
+
+    def save(self, kind: str, html: str, **metadata) -> str:
+        """
+        Compress and store a page.
+
+        Args:
+            kind: Page type, e.g. 'timeline', 'post' or 'video'
+            html: Raw HTML to store
+            **metadata: JSON-serialisable details recorded in the manifest
+
+        Returns:
+            Path of the written snapshot file
+        """
+        saved_at = datetime.now()
+        digest = hashlib.sha1(html.encode('utf-8')).hexdigest()[:12]
+        name = f"{saved_at.strftime('%Y%m%d_%H%M%S_%f')}_{digest}.html.gz"
+        relative_path = os.path.join(kind, name)
+        path = os.path.join(self.root, relative_path)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(html)
+
+        entry = {"kind": kind, "file": relative_path, "saved_at": saved_at.isoformat(), **metadata}
+        with self._lock, open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return path
+
+    def iter_snapshots(self, kind: Optional[str] = None) -> Iterator[Tuple[Dict, str]]:
+        """
+        Yield (manifest entry, html) pairs in the order they were saved.
+
+        Args:
+            kind: Only yield snapshots of this page type when given
+        """
+        if not os.path.exists(self.manifest_path):
+            return
+
+        with open(self.manifest_path, 'r', encoding='utf-8') as manifest:
+            for line in manifest:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if kind and entry['kind'] != kind:
+                    continue
+                path = os.path.join(self.root, entry['file'])
+                if not os.path.exists(path):
+                    continue
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    yield entry, f.read()
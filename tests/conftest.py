@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The scrapers are run as scripts from their own directories, not installed
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'TikTok_Scraper'))
+sys.path.insert(0, os.path.join(ROOT, 'X_Scraper'))
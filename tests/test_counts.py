@@ -0,0 +1,47 @@
+import pytest
+
+from scraper_common.counts import count_before, parse_count, parse_counts
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('1.5K', 1500),
+    ('2M', 2_000_000),
+    ('2.3M', 2_300_000),
+    ('1,234', 1234),
+    ('1.234', 1234),
+    ('12 345', 12345),
+    ('1,234,567', 1234567),
+    ('1,5K', 1500),
+    ('1,2 Mio.', 1_200_000),
+    ('3 Mrd', 3_000_000_000),
+    ('1.5K Likes. Like', 1500),
+    ('987', 987),
+])
+def test_parse_count(text, expected):
+    assert parse_count(text) == expected
+
+
+@pytest.mark.parametrize('text', [None, '', 'Like', 'no count here'])
+def test_parse_count_default(text):
+    assert parse_count(text) == 0
+    assert parse_count(text, default=-1) == -1
+
+
+def test_parse_count_forced_decimal():
+    assert parse_count('1,234', decimal=',') == 1
+    assert parse_count('1.234', decimal='.') == 1
+
+
+def test_count_before():
+    text = '1.5K likes, 20 comments'
+    assert count_before(text, 'likes?') == 1500
+    assert count_before(text, 'comments?') == 20
+    assert count_before(text, 'shares?') is None
+    assert count_before(None, 'likes?') is None
+
+
+def test_parse_counts_matches_parse_count():
+    pytest.importorskip('numpy')
+    values = ['1.5K', '2M', '1,234', '42', None, '', 'n/a', '42', '9' * 30]
+    assert parse_counts(values).tolist() == [1500, 2_000_000, 1234, 42, 0, 0, 0, 42, 0]
+    assert parse_counts([]).tolist() == []
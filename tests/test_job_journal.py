@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+
+from scraper_common.job_journal import JobJournal
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'job.journal')
+
+
+def record(key, likes=0):
+    return {'url': f'https://example.com/{key}', 'likes': likes}
+
+
+def test_resume_replays_finished_accounts_and_posts(path):
+    journal = JobJournal(path)
+    journal.record_post('nasa', '1', record('1'))
+    journal.record_post('nasa', '2', record('2'))
+    journal.finish_account('nasa')
+    journal.record_post('esa', '3', record('3'))
+    journal.close()
+
+    resumed = JobJournal(path, resume=True)
+    assert resumed.resumed
+    assert resumed.is_account_done('nasa')
+    assert not resumed.is_account_done('esa')
+    assert resumed.is_post_done('3')
+    assert [r['url'] for r in resumed.records()] == [
+        'https://example.com/1', 'https://example.com/2', 'https://example.com/3'
+    ]
+    resumed.close()
+
+
+def test_post_recorded_twice_is_output_once(path):
+    journal = JobJournal(path)
+    journal.record_post('nasa', '1', record('1', likes=5))
+    journal.close()
+
+    resumed = JobJournal(path, resume=True)
+    # The resumed job scrapes the post again before finishing its account
+    resumed.record_post('nasa', '1', record('1', likes=7))
+    assert resumed.records() == [record('1', likes=7)]
+    resumed.close()
+
+    again = JobJournal(path, resume=True)
+    assert again.records() == [record('1', likes=7)]
+    again.close()
+
+
+def test_post_without_record_is_done_but_not_output(path):
+    journal = JobJournal(path)
+    journal.record_post('nasa', '1', None)
+    assert journal.is_post_done('1')
+    assert journal.records() == []
+    journal.close()
+
+
+def test_partial_trailing_line_is_ignored_and_terminated(path):
+    journal = JobJournal(path)
+    journal.record_post('nasa', '1', record('1'))
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "post", "account": "nasa", "po')
+
+    resumed = JobJournal(path, resume=True)
+    assert resumed.records() == [record('1')]
+    resumed.finish_account('nasa')
+    resumed.close()
+
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert json.loads(lines[-1]) == {'event': 'account', 'account': 'nasa'}
+    assert JobJournal(path, resume=True).is_account_done('nasa')
+
+
+def test_new_job_discards_old_journal(path):
+    journal = JobJournal(path)
+    journal.finish_account('nasa')
+    journal.close()
+
+    fresh = JobJournal(path)
+    assert not fresh.resumed
+    assert not fresh.is_account_done('nasa')
+    fresh.close()
+
+
+def test_completed_job_deletes_journal(path):
+    journal = JobJournal(path)
+    journal.finish_account('nasa')
+    journal.close(completed=True)
+    assert not os.path.exists(path)
+
+    assert not JobJournal(path, resume=True).resumed
@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip('cachetools')
+
+import metrics_cache
+from metrics_cache import MetricsCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {'now': 1_000_000.0}
+    monkeypatch.setattr(metrics_cache.time, 'time', lambda: clock['now'])
+    return clock
+
+
+def record(likes):
+    return {'url': 'https://www.tiktok.com/@nasa/video/1', 'likes': likes}
+
+
+def test_fresh_record_is_served_until_ttl(clock):
+    cache = MetricsCache(ttl=60)
+    assert cache.get('1') is None
+    cache.put('1', record(10))
+
+    clock['now'] += 59
+    assert cache.get('1') == record(10)
+    clock['now'] += 1
+    assert cache.get('1') is None
+    assert cache.stats() == {'hits': 1, 'disk_hits': 0, 'misses': 2}
+
+
+def test_returned_record_is_a_copy(clock):
+    cache = MetricsCache()
+    cache.put('1', record(10))
+    cache.get('1')['likes'] = 99
+    assert cache.get('1') == record(10)
+
+
+def test_memory_tier_evicts_least_recently_used(clock):
+    cache = MetricsCache(max_size=2)
+    cache.put('1', record(1))
+    cache.put('2', record(2))
+    cache.get('1')
+    cache.put('3', record(3))
+
+    assert cache.get('2') is None
+    assert cache.get('1') == record(1)
+    assert cache.get('3') == record(3)
+
+
+def test_disk_tier_survives_restart(clock, tmp_path):
+    path = str(tmp_path / 'metrics.db')
+    cache = MetricsCache(ttl=60, path=path)
+    cache.put('1', record(10))
+    cache.close()
+
+    reopened = MetricsCache(ttl=60, path=path)
+    assert reopened.get('1') == record(10)
+    # Promoted to memory, so the second lookup does not touch the disk
+    assert reopened.get('1') == record(10)
+    assert reopened.stats() == {'hits': 2, 'disk_hits': 1, 'misses': 0}
+    reopened.close()
+
+
+def test_expired_disk_rows_are_missed_and_pruned_on_close(clock, tmp_path):
+    path = str(tmp_path / 'metrics.db')
+    cache = MetricsCache(ttl=60, path=path)
+    cache.put('old', record(1))
+    clock['now'] += 30
+    cache.put('new', record(2))
+    cache.close()
+
+    clock['now'] += 45
+    reopened = MetricsCache(ttl=60, path=path)
+    assert reopened.get('old') is None
+    assert reopened.get('new') == record(2)
+    reopened.close()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT video_id FROM video_metrics").fetchall() == [('new',)]
+    conn.close()
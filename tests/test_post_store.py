@@ -0,0 +1,61 @@
+import sqlite3
+
+import pytest
+
+from scraper_common.post_store import PostStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'))
+    yield store
+    store.close()
+
+
+def post(key, timestamp, likes=0, content='text'):
+    return {'username': 'natgeo', 'timestamp': timestamp, 'content': content, 'likes': likes,
+            'comments': 1, 'url': f'https://example.com/{key}'}
+
+
+def test_upsert_refreshes_metrics_instead_of_duplicating(store, tmp_path):
+    store.upsert_post('TikTok', post('1', '2024-01-01T00:00:00.000Z', likes=10))
+    store.upsert_post('TikTok', post('1', '2024-01-01T00:00:00.000Z', likes=25, content=''))
+
+    conn = sqlite3.connect(str(tmp_path / 'posts.db'))
+    rows = conn.execute("SELECT likes, content FROM posts").fetchall()
+    conn.close()
+    # Metrics follow the latest crawl, an empty re-extraction keeps the old text
+    assert rows == [(25, 'text')]
+
+
+def test_has_post_by_platform_and_key(store):
+    store.upsert_posts('TikTok', [post('1', '2024-01-01T00:00:00.000Z')], key=lambda record: record['url'][-1])
+    assert store.has_post('TikTok', '1')
+    assert not store.has_post('Instagram', '1')
+    assert not store.has_post('TikTok', '2')
+
+
+def test_records_without_key_are_skipped(store):
+    assert store.upsert_posts('X', [{'username': 'a', 'url': None}]) == 0
+
+
+def test_high_water_mark_only_moves_forward(store):
+    assert store.high_water_mark('X', 'natgeo') is None
+    store.upsert_posts('X', [post('2', '2024-01-02T00:00:00.000Z'), post('1', '2024-01-01T00:00:00.000Z')])
+    assert store.high_water_mark('X', 'natgeo') == ('2024-01-02T00:00:00.000Z', 'https://example.com/2')
+
+    store.upsert_post('X', post('0', '2023-12-31T00:00:00.000Z'))
+    assert store.high_water_mark('X', 'natgeo') == ('2024-01-02T00:00:00.000Z', 'https://example.com/2')
+
+    store.upsert_post('X', post('3', '2024-01-03T00:00:00.000Z'))
+    assert store.high_water_mark('X', 'natgeo') == ('2024-01-03T00:00:00.000Z', 'https://example.com/3')
+
+
+def test_store_persists_across_connections(tmp_path):
+    path = str(tmp_path / 'posts.db')
+    first = PostStore(path)
+    first.upsert_post('Instagram', post('1', '2024-01-01T00:00:00.000Z'))
+    first.close()
+    second = PostStore(path)
+    assert second.has_post('Instagram', 'https://example.com/1')
+    second.close()
@@ -0,0 +1,93 @@
+import pytest
+
+from scraper_common import rate_limiter
+from scraper_common.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'time', clock.time)
+    return clock
+
+
+def test_burst_then_wait_for_refill(clock):
+    # 3600/hour is one token a second
+    limiter = RateLimiter({'global': (3600, 2)})
+
+    assert limiter.try_acquire(['global']) == 0
+    assert limiter.try_acquire(['global']) == 0
+    assert limiter.try_acquire(['global']) == pytest.approx(1.0)
+
+    clock.now += 0.5
+    assert limiter.try_acquire(['global']) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert limiter.try_acquire(['global']) == 0
+
+
+def test_refill_is_capped_at_burst(clock):
+    limiter = RateLimiter({'global': (3600, 2)})
+    limiter.try_acquire(['global'])
+    clock.now += 3600
+
+    assert limiter.try_acquire(['global']) == 0
+    assert limiter.try_acquire(['global']) == 0
+    assert limiter.try_acquire(['global']) > 0
+
+
+def test_waiting_bucket_takes_no_token_from_the_others(clock):
+    limiter = RateLimiter({'global': (3600, 5), 'account': (360, 1)})
+    assert limiter.try_acquire(['global', 'account']) == 0
+    # The account refills every 10s; the global bucket must not be drained meanwhile
+    assert limiter.try_acquire(['global', 'account']) == pytest.approx(10.0)
+    assert limiter.try_acquire(['global', 'account']) == pytest.approx(10.0)
+
+    for _ in range(4):
+        assert limiter.try_acquire(['global']) == 0
+
+
+def test_unconfigured_names_are_ignored(clock):
+    limiter = RateLimiter({'global': (3600, 1), 'disabled': (0, 5)})
+    assert limiter.try_acquire(['unknown', 'disabled']) == 0
+    assert limiter.try_acquire([]) == 0
+
+
+def test_sqlite_buckets_are_shared_between_instances(clock, tmp_path):
+    path = str(tmp_path / 'limits.db')
+    first = RateLimiter({'global': (3600, 2)}, path=path)
+    second = RateLimiter({'global': (3600, 2)}, path=path)
+
+    assert first.try_acquire(['global']) == 0
+    assert second.try_acquire(['global']) == 0
+    assert first.try_acquire(['global']) == pytest.approx(1.0)
+    first.close()
+    second.close()
+
+    reopened = RateLimiter({'global': (3600, 2)}, path=path)
+    assert reopened.try_acquire(['global']) == pytest.approx(1.0)
+    clock.now += 1
+    assert reopened.try_acquire(['global']) == 0
+    reopened.close()
+
+
+def test_acquire_sleeps_until_the_token_is_due(clock, monkeypatch):
+    limiter = RateLimiter({'global': (3600, 1)})
+    limiter.try_acquire(['global'])
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(rate_limiter.time, 'sleep', sleep)
+    limiter.acquire(['global'])
+
+    assert sleeps == [pytest.approx(1.0)]
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from scraper_common import retry
+from scraper_common.retry import (
+    LOGGED_OUT,
+    MISSING_SELECTOR,
+    OTHER,
+    TIMEOUT,
+    UNAVAILABLE,
+    ContentUnavailableError,
+    LoggedOutError,
+    MissingSelectorError,
+    RetryPolicy,
+    classify_error,
+)
+
+
+class TimeoutException(Exception):
+    """Stands in for Selenium's exception, matched by class name."""
+
+
+class Unit:
+    """Fails with the given errors in turn, then returns 'ok'."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def test_classify_error():
+    assert classify_error(TimeoutException()) == TIMEOUT
+    assert classify_error(TimeoutError()) == TIMEOUT
+    assert classify_error(MissingSelectorError()) == MISSING_SELECTOR
+    assert classify_error(LoggedOutError()) == LOGGED_OUT
+    assert classify_error(ContentUnavailableError()) == UNAVAILABLE
+    assert classify_error(ValueError()) == OTHER
+
+
+def test_classify_error_follows_subclasses():
+    class PrivateProfileError(ContentUnavailableError):
+        pass
+
+    assert classify_error(PrivateProfileError()) == UNAVAILABLE
+
+
+def test_backoff_doubles_with_jitter_and_is_capped(monkeypatch):
+    policy = RetryPolicy(retry_delay=2, max_delay=10)
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: high)
+    assert [policy.backoff(n) for n in range(4)] == [2, 4, 8, 10]
+
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: low)
+    assert [policy.backoff(n) for n in range(4)] == [1, 2, 4, 5]
+
+
+def test_backoff_without_exponential_stays_flat(monkeypatch):
+    policy = RetryPolicy(retry_delay=3, exponential_backoff=False)
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: high)
+    assert [policy.backoff(n) for n in range(3)] == [3, 3, 3]
+
+
+def test_retryable_errors_are_retried(sleeps):
+    unit = Unit(TimeoutException(), MissingSelectorError())
+    assert RetryPolicy(max_retries=3).call(unit) == 'ok'
+    assert unit.calls == 3
+    assert len(sleeps) == 2
+
+
+@pytest.mark.parametrize('error', [ValueError('bad'), ContentUnavailableError('private')])
+def test_other_and_unavailable_errors_raise_at_once(sleeps, error):
+    unit = Unit(error)
+    with pytest.raises(type(error)):
+        RetryPolicy(max_retries=3).call(unit)
+    assert unit.calls == 1
+    assert sleeps == []
+
+
+def test_last_error_raised_once_retries_run_out(sleeps):
+    unit = Unit(*(TimeoutException(str(n)) for n in range(5)))
+    with pytest.raises(TimeoutException, match='2'):
+        RetryPolicy(max_retries=2).call(unit)
+    assert unit.calls == 3
+
+
+def test_recover_gets_the_error_kind(sleeps):
+    kinds = []
+    unit = Unit(LoggedOutError())
+    RetryPolicy().call(unit, recover=kinds.append)
+    assert kinds == [LOGGED_OUT]
+
+
+def test_call_async_awaits_func_and_recover(monkeypatch):
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(retry.asyncio, 'sleep', no_sleep)
+    unit = Unit(TimeoutException())
+    kinds = []
+
+    async def func():
+        return unit()
+
+    async def recover(kind):
+        kinds.append(kind)
+
+    assert asyncio.run(RetryPolicy().call_async(func, recover=recover)) == 'ok'
+    assert kinds == [TIMEOUT]
@@ -0,0 +1,68 @@
+import pytest
+
+from scraper_common import scroll_progress
+from scraper_common.scroll_progress import (
+    STOP_CHECKPOINT,
+    STOP_IDLE,
+    STOP_STALLED,
+    STOP_TARGET,
+    STOP_TIME_BUDGET,
+    ScrollProgress,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {'now': 100.0}
+    monkeypatch.setattr(scroll_progress.time, 'monotonic', lambda: clock['now'])
+    return clock
+
+
+def test_stops_at_target():
+    progress = ScrollProgress(10)
+    assert progress.update(1000, 6)
+    assert not progress.update(2000, 12)
+    assert progress.stop_reason == STOP_TARGET
+    assert progress.steps == 2
+
+
+def test_stops_when_neither_height_nor_posts_grow():
+    progress = ScrollProgress(100, initial_height=1000, max_stalled_steps=3)
+    assert progress.update(1000, 5)
+    assert progress.update(1000, 5)
+    assert progress.update(1000, 5)
+    assert not progress.update(1000, 5)
+    assert progress.stop_reason == STOP_STALLED
+
+
+def test_page_growth_resets_stall_but_not_idle():
+    progress = ScrollProgress(100, initial_height=1000, max_stalled_steps=2, max_idle_steps=4)
+    assert progress.update(1000, 5)
+    assert progress.update(1000, 5)
+    # Placeholders keep the page growing without adding posts
+    assert progress.update(1500, 5)
+    assert progress.update(1500, 5)
+    assert not progress.update(2000, 5)
+    assert progress.stop_reason == STOP_IDLE
+
+
+def test_new_posts_reset_both_counters():
+    progress = ScrollProgress(100, initial_height=1000, max_stalled_steps=2, max_idle_steps=2)
+    for posts in range(1, 10):
+        assert progress.update(1000, posts)
+    assert progress.stop_reason is None
+
+
+def test_stops_after_time_budget(clock):
+    progress = ScrollProgress(100, time_budget=60)
+    assert progress.update(1000, 1)
+    clock['now'] += 61
+    assert not progress.update(2000, 2)
+    assert progress.stop_reason == STOP_TIME_BUDGET
+    assert progress.elapsed == pytest.approx(61)
+
+
+def test_caller_can_stop_for_its_own_reason():
+    progress = ScrollProgress(100)
+    assert progress.stop(STOP_CHECKPOINT) is False
+    assert progress.stop_reason == STOP_CHECKPOINT
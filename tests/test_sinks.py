@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from scraper_common.sinks import JsonlSink, create_sink
+
+
+RECORDS = [
+    {'username': 'natgeo', 'timestamp': '2024-01-01T12:00:00.000Z', 'content': 'first',
+     'likes': 1500, 'comments': 20, 'shares': 3, 'url': 'https://example.com/1'},
+    {'username': 'natgeo', 'timestamp': '2024-01-02T12:00:00.000Z', 'content': 'zweite ä',
+     'likes': 7, 'comments': 0, 'shares': 0, 'url': 'https://example.com/2'},
+]
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    with JsonlSink(str(path), batch_size=10) as sink:
+        sink.write_many(RECORDS)
+        assert sink.records_written == 2
+    assert read_jsonl(path) == RECORDS
+
+
+def test_jsonl_flushes_full_batches(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    sink = JsonlSink(str(path), batch_size=1)
+    sink.write(RECORDS[0])
+    # A crash now would still leave the first record on disk
+    assert read_jsonl(path) == RECORDS[:1]
+    sink.close()
+
+
+def test_jsonl_appends_and_reports_existing_records(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    with JsonlSink(str(path)) as sink:
+        assert not sink.appending
+        sink.write(RECORDS[0])
+    with JsonlSink(str(path)) as sink:
+        assert sink.appending
+        sink.write(RECORDS[1])
+    assert read_jsonl(path) == RECORDS
+
+
+def test_jsonl_rotation(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    with JsonlSink(str(path), batch_size=1) as sink:
+        sink.write(RECORDS[0])
+        rotated = sink.rotate()
+        sink.write(RECORDS[1])
+    assert read_jsonl(rotated) == RECORDS[:1]
+    assert read_jsonl(path) == RECORDS[1:]
+
+
+def test_create_sink_legacy_json_has_no_sink(tmp_path):
+    assert create_sink('json', str(tmp_path / 'out')) is None
+    sink = create_sink('jsonl', str(tmp_path / 'out'))
+    assert sink.path.endswith('out.jsonl')
+    sink.close()
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_columnar_round_trip(tmp_path, file_format):
+    pa = pytest.importorskip('pyarrow')
+    path = tmp_path / f'out.{file_format}'
+    with create_sink(file_format, str(tmp_path / 'out'), batch_size=1) as sink:
+        assert not sink.appending
+        sink.write_many(RECORDS)
+        sink.write({'username': 'x', 'timestamp': 'not a date', 'likes': None, 'retweets': 4})
+
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+
+    rows = table.to_pylist()
+    assert [row['url'] for row in rows] == [record['url'] for record in RECORDS] + [None]
+    assert [row['likes'] for row in rows] == [1500, 7, None]
+    # Fields the platform does not have are nulls, not zeros
+    assert [row['retweets'] for row in rows] == [None, None, 4]
+    assert rows[0]['timestamp'].isoformat() == '2024-01-01T12:00:00+00:00'
+    assert rows[2]['timestamp'] is None
+    assert rows[1]['content'] == 'zweite ä'
+
+
+def test_columnar_overwrites_existing_file(tmp_path):
+    pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    for records in (RECORDS, RECORDS[:1]):
+        with create_sink('parquet', str(tmp_path / 'out')) as sink:
+            sink.write_many(records)
+    assert pq.read_table(tmp_path / 'out.parquet').num_rows == 1
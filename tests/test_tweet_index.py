@@ -0,0 +1,42 @@
+from tweet_index import merge_tweets, tweet_key
+
+
+def tweet(status_id, likes, retweets=0, comments=0):
+    return {'username': 'nasa', 'timestamp': '2024-01-01T00:00:00.000Z', 'content': 'launch',
+            'likes': likes, 'retweets': retweets, 'comments': comments,
+            'url': f'https://twitter.com/nasa/status/{status_id}'}
+
+
+def test_key_prefers_status_id_and_falls_back_to_content():
+    assert tweet_key(tweet('123', 0)) == '123'
+    undated = dict(tweet('123', 0), url='')
+    assert tweet_key(undated).startswith('2024-01-01T00:00:00.000Z:')
+
+
+def test_seen_again_refreshes_metrics_without_duplicating():
+    tweets, exact_keys = {}, set()
+    merge_tweets(tweets, [tweet('1', 10)], exact_keys)
+    merge_tweets(tweets, [tweet('1', 12, comments=3)], exact_keys)
+
+    assert list(tweets) == ['1']
+    assert tweets['1']['likes'] == 12
+    assert tweets['1']['comments'] == 3
+
+
+def test_dom_metrics_never_replace_api_counts():
+    tweets, exact_keys = {}, set()
+    merge_tweets(tweets, [tweet('1', 1234, retweets=56)], exact_keys, exact=True)
+    # The page renders the same tweet with rounded figures
+    merge_tweets(tweets, [tweet('1', 1200, retweets=56)], exact_keys)
+
+    assert tweets['1']['likes'] == 1234
+
+
+def test_api_counts_replace_dom_metrics():
+    tweets, exact_keys = {}, set()
+    merge_tweets(tweets, [tweet('1', 1200)], exact_keys)
+    merge_tweets(tweets, [tweet('1', 1234)], exact_keys, exact=True)
+    merge_tweets(tweets, [tweet('1', 1240)], exact_keys, exact=True)
+
+    assert tweets['1']['likes'] == 1240
+    assert exact_keys == {'1'}
@@ -0,0 +1,38 @@
+import pytest
+
+from video_ids import (
+    seconds_from_video_id, timestamp_from_video_id, timestamps_from_urls, timestamps_from_video_ids,
+    video_id_from_url
+)
+
+
+# Posted 2023-03-19 19:44:46 UTC: 1679255086 in the top 32 bits
+VIDEO_ID = 7212345678901234567
+VIDEO_URL = f'https://www.tiktok.com/@natgeo/video/{VIDEO_ID}?lang=en'
+
+
+def test_video_id_from_url():
+    assert video_id_from_url(VIDEO_URL) == VIDEO_ID
+    assert video_id_from_url('https://www.tiktok.com/@natgeo') is None
+    assert video_id_from_url(None) is None
+    assert video_id_from_url(f'/video/{2 ** 64}') is None
+
+
+def test_seconds_from_video_id():
+    assert seconds_from_video_id(VIDEO_ID) == 1679255086
+    assert seconds_from_video_id((1700000000 << 32) | 0xFFFFFFFF) == 1700000000
+
+
+def test_timestamp_from_video_id():
+    assert timestamp_from_video_id(VIDEO_ID) == '2023-03-19T19:44:46.000Z'
+
+
+def test_batch_timestamps_match_scalar():
+    pytest.importorskip('numpy')
+    video_ids = [VIDEO_ID, None, 1700000000 << 32]
+    assert timestamps_from_video_ids(video_ids) == [
+        '2023-03-19T19:44:46.000Z', None, timestamp_from_video_id(1700000000 << 32)
+    ]
+    assert timestamps_from_urls([VIDEO_URL, 'https://www.tiktok.com/@natgeo']) == [
+        '2023-03-19T19:44:46.000Z', None
+    ]